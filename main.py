@@ -5,6 +5,7 @@ from page.grafik.main import GrafikContainer
 from page.files_container import FilesContainer
 from page.settings.main import SettingsContainer
 from page.ai_train.main import AITrainContainer
+from page.jobs.main import JobsContainer
 
 class VideoPlayerApp:
     def __init__(self, root):
@@ -100,7 +101,7 @@ class VideoPlayerApp:
             ('📁', 'Dosyalar'),
             ('📊', 'Grafik'),
             ('🧪', 'AI Eğitimi'),
-            ('🔔', 'Bildirim')
+            ('📋', 'İş Kuyruğu')
         ]
         
         self.panel_buttons = []
@@ -244,23 +245,14 @@ class VideoPlayerApp:
         ai_train_frame.pack_forget()  # Başlangıçta gizli
         # -----------------------------------------
 
-        # Diğer paneller için placeholder container'lar
-        other_panels = ['Bildirim']  # 'Ayarlar' artık buradan çıktı
-        for panel_name in other_panels:
-            panel_frame = tk.Frame(self.right_panel, bg=self.colors['bg_dark'])
-            placeholder = tk.Label(
-                panel_frame,
-                text=f"{panel_name} Paneli\n\nBu panel yakında eklenecek",
-                font=('Segoe UI', 18),
-                bg=self.colors['bg_dark'],
-                fg=self.colors['text']
-            )
-            placeholder.pack(expand=True)
-            self.panel_containers[panel_name] = {
-                'frame': panel_frame,
-                'container': None
-            }
-            panel_frame.pack_forget()  # Başlangıçta gizli
+        # İş kuyruğu paneli (gelen kutusu + toplu analiz durumu)
+        jobs_frame = tk.Frame(self.right_panel, bg=self.colors['bg_dark'])
+        jobs_container = JobsContainer(jobs_frame, self.colors)
+        self.panel_containers['İş Kuyruğu'] = {
+            'frame': jobs_frame,
+            'container': jobs_container
+        }
+        jobs_frame.pack_forget()  # Başlangıçta gizli
     
     def select_panel(self, panel_name):
         """Panel seçimi yap - gizle/göster sistemi"""
@@ -1,8 +1,43 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 import os
-import cv2
-from PIL import Image, ImageTk
+import queue
+import sqlite3
+from collections import OrderedDict
+from PIL import ImageTk
+from page.grafik.records import search_video_paths
+from page.video_container.proxy import ProxyBuilder
+from .thumbnails import ThumbnailCache
+from .metadata import VideoMetadataIndex, format_metadata
+
+# Grid hücre boyutu (önizleme + isim + bilgi + boşluklar)
+CELL_WIDTH = 230
+CELL_HEIGHT = 205
+# Görünür satırların üstünde/altında hazır tutulacak satır sayısı
+MARGIN_ROWS = 1
+# Bellekte tutulacak en fazla çözülmüş önizleme (PhotoImage) sayısı
+THUMB_LRU_SIZE = 300
+
+# Sıralama seçenekleri: anahtar fonksiyonu (meta -> değer), azalan mı
+# Meta verisi henüz okunmamış dosyalar sona düşer
+SORT_OPTIONS = {
+    "İsim": (None, False),
+    "En yeni": (lambda m: m.get("mtime_ns"), True),
+    "Süre": (lambda m: m.get("duration"), True),
+    "Çözünürlük": (lambda m: (m.get("width") or 0) * (m.get("height") or 0) or None, True),
+    "Boyut": (lambda m: m.get("size"), True),
+}
+
+# Filtre seçenekleri (meta henüz okunmadıysa dosya gösterilir)
+FILTER_OPTIONS = {
+    "Tümü": None,
+    "< 1 dk": lambda m: m["duration"] < 60,
+    "1-10 dk": lambda m: 60 <= m["duration"] <= 600,
+    "> 10 dk": lambda m: m["duration"] > 600,
+    "≥ 720p": lambda m: m["height"] >= 720,
+    "≥ 1080p": lambda m: m["height"] >= 1080,
+    "4K": lambda m: m["width"] >= 3840,
+}
 
 
 class FilesContainer:
@@ -21,12 +56,33 @@ class FilesContainer:
 
         # Kayıtlı videoların olduğu klasör
         self.video_dir = os.path.join("dosyalar", "video")
+        self.db_path = os.path.join("dosyalar", "database.db")
+
+        # Son kullanılan önizlemeler (video yolu -> PhotoImage veya None), LRU
+        self.thumbnails = OrderedDict()
+
+        # Sanal grid durumu: tüm dosyalar listede, widget sadece görünenler için
+        self.video_paths = []
+        self.columns = 3
+        self.visible_cells = {}  # index -> hücre
+        self.free_cells = []  # yeniden kullanılacak hücreler
+
+        # Disk önbellekli, thread havuzunda üretilen önizlemeler
+        self.thumb_width, self.thumb_height = 200, 120
+        self.thumbnail_cache = ThumbnailCache(size=(self.thumb_width, self.thumb_height))
 
-        # Tkinter Image referanslarını saklamak için
-        self.thumbnails = {}
+        # Süre/FPS/çözünürlük/codec bilgisi (veritabanında, artımlı tarama)
+        self.metadata_index = VideoMetadataIndex(self.db_path)
+        self.metadata = {}
+
+        # Video panelinde hızlı önizleme/ileri-geri sarma için proxy üretimi
+        self.proxy_builder = ProxyBuilder()
 
         self.setup_ui()
         self.load_videos()
+        self._poll_thumbnails()
+        self._poll_metadata()
+        self._poll_proxies()
 
     def setup_ui(self):
         """UI bileşenlerini oluştur."""
@@ -61,130 +117,391 @@ class FilesContainer:
         )
         refresh_btn.pack(side=tk.RIGHT, padx=15, pady=5)
 
+        self.proxy_btn = tk.Button(
+            header,
+            text="🗜️ Proxy Oluştur",
+            font=("Segoe UI", 10),
+            bg=self.colors["accent"],
+            fg="white",
+            relief=tk.FLAT,
+            padx=15,
+            pady=6,
+            cursor="hand2",
+            command=self.build_proxies,
+        )
+        self.proxy_btn.pack(side=tk.RIGHT, pady=5)
+
+        # Meta veriye göre filtre ve sıralama
+        self.filter_var = tk.StringVar(value="Tümü")
+        filter_combo = ttk.Combobox(
+            header, textvariable=self.filter_var, values=list(FILTER_OPTIONS),
+            state="readonly", width=9,
+        )
+        filter_combo.pack(side=tk.RIGHT, padx=(0, 5), pady=5)
+        filter_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_view())
+
+        self.sort_var = tk.StringVar(value="İsim")
+        sort_combo = ttk.Combobox(
+            header, textvariable=self.sort_var, values=list(SORT_OPTIONS),
+            state="readonly", width=10,
+        )
+        sort_combo.pack(side=tk.RIGHT, padx=(0, 5), pady=5)
+        sort_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_view())
+        tk.Label(
+            header,
+            text="Sırala:",
+            font=("Segoe UI", 10),
+            bg=self.colors["bg_medium"],
+            fg=self.colors["text"],
+        ).pack(side=tk.RIGHT, padx=(10, 2))
+
+        # Arama (kayıt isimleri FTS indeksinden + dosya adları)
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(header, textvariable=self.search_var, width=24)
+        search_entry.pack(side=tk.RIGHT, padx=(0, 5), pady=5)
+        search_entry.bind("<Return>", lambda e: self.load_videos())
+        tk.Label(
+            header,
+            text="🔍",
+            font=("Segoe UI", 10),
+            bg=self.colors["bg_medium"],
+            fg=self.colors["text"],
+        ).pack(side=tk.RIGHT)
+
         # Scrollable alan (canvas + scrollbar)
         list_container = tk.Frame(main_container, bg=self.colors["bg_dark"])
         list_container.pack(fill=tk.BOTH, expand=True)
 
         self.canvas = tk.Canvas(
-            list_container, bg=self.colors["bg_dark"], highlightthickness=0
+            list_container, bg=self.colors["bg_dark"], highlightthickness=0,
+            yscrollincrement=20,
         )
-        scrollbar = tk.Scrollbar(
+        self.scrollbar = tk.Scrollbar(
             list_container, orient="vertical", command=self.canvas.yview
         )
-        self.inner_frame = tk.Frame(self.canvas, bg=self.colors["bg_dark"])
 
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Görünüm her değiştiğinde görünür hücreleri güncelle
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
 
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self._bind_mousewheel(self.canvas)
 
-        self.canvas.create_window((0, 0), window=self.inner_frame, anchor="nw")
-        self.inner_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")),
+        self.empty_label = tk.Label(
+            self.canvas,
+            text="Henüz kayıtlı video bulunamadı.",
+            font=("Segoe UI", 12),
+            bg=self.colors["bg_dark"],
+            fg=self.colors["text"],
+            pady=20,
+        )
+        self.empty_window = self.canvas.create_window(
+            (20, 0), window=self.empty_label, anchor="nw", state="hidden"
         )
 
     def load_videos(self):
-        """Klasörden videoları yükle ve listeyi oluştur."""
-        # Eski öğeleri temizle
-        for widget in self.inner_frame.winfo_children():
-            widget.destroy()
-        self.thumbnails.clear()
-
+        """Klasörü artımlı olarak tara ve listeyi göster."""
         if not os.path.exists(self.video_dir):
             os.makedirs(self.video_dir, exist_ok=True)
 
-        # Sadece video uzantılarını al
-        video_files = [
-            f
-            for f in os.listdir(self.video_dir)
-            if f.lower().endswith((".mp4", ".avi", ".mov", ".mkv"))
-        ]
-
-        if not video_files:
-            no_data = tk.Label(
-                self.inner_frame,
-                text="Henüz kayıtlı video bulunamadı.",
-                font=("Segoe UI", 12),
-                bg=self.colors["bg_dark"],
-                fg=self.colors["text"],
-                pady=20,
-            )
-            no_data.pack()
+        # Değişmemiş dosyaların meta verisi veritabanından gelir, diğerleri arka planda okunur
+        self.metadata = self.metadata_index.scan(self.video_dir)
+        self.apply_view()
+
+    def apply_view(self):
+        """Arama, filtre ve sıralamayı uygula; widget'lar sadece görünen satırlar için oluşur."""
+        # Görünen hücreleri havuza geri ver
+        for index in list(self.visible_cells):
+            self._release_cell(index)
+
+        paths = list(self.metadata)
+
+        # Arama: dosya adında geçenler + kayıt ismi eşleşen kayıtların videoları
+        query = self.search_var.get().strip()
+        if query:
+            matched = self._search_record_files(query)
+            paths = [
+                p for p in paths
+                if query.lower() in os.path.basename(p).lower()
+                or os.path.basename(p) in matched
+            ]
+
+        # Meta veri filtresi
+        predicate = FILTER_OPTIONS.get(self.filter_var.get())
+        if predicate:
+            paths = [p for p in paths if self._matches(predicate, self.metadata[p])]
+
+        # Sıralama (önce isme göre; eşit değerler isim sırasında kalır)
+        paths.sort(key=lambda p: os.path.basename(p).lower())
+        key_func, descending = SORT_OPTIONS.get(self.sort_var.get(), (None, False))
+        if key_func:
+            known = [p for p in paths if key_func(self.metadata[p]) is not None]
+            unknown = [p for p in paths if key_func(self.metadata[p]) is None]
+            known.sort(key=lambda p: key_func(self.metadata[p]), reverse=descending)
+            paths = known + unknown
+
+        self.video_paths = paths
+
+        self.canvas.itemconfigure(
+            self.empty_window, state="hidden" if self.video_paths else "normal"
+        )
+        self._update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self._update_visible()
+
+    @staticmethod
+    def _matches(predicate, meta):
+        try:
+            return predicate(meta)
+        except (KeyError, TypeError):
+            # Henüz okunmamış / bilinmeyen değer: gizleme
+            return True
+
+    # ------------------------------------------------------------------
+    # Sanal grid
+    # ------------------------------------------------------------------
+    def _row_count(self):
+        return (len(self.video_paths) + self.columns - 1) // self.columns
+
+    def _update_scrollregion(self):
+        width = max(self.canvas.winfo_width(), self.columns * CELL_WIDTH)
+        height = max(self._row_count() * CELL_HEIGHT, 1)
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+
+    def _on_canvas_configure(self, event):
+        """Genişlik değişince sütun sayısını yeniden hesapla"""
+        columns = max(1, event.width // CELL_WIDTH)
+        if columns != self.columns:
+            self.columns = columns
+            # Yerleşim değişti: tüm hücreleri yeniden konumlandır
+            for index in list(self.visible_cells):
+                self._release_cell(index)
+        self._update_scrollregion()
+        self._update_visible()
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._update_visible()
+
+    def _bind_mousewheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-3, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(3, "units"))
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-event.delta / 40), "units")
+
+    def _update_visible(self):
+        """Görünür satırlar (+ pay) için hücreleri yerleştir, diğerlerini geri al"""
+        if not self.video_paths:
             return
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // CELL_HEIGHT) - MARGIN_ROWS)
+        last_row = min(self._row_count() - 1, int(bottom // CELL_HEIGHT) + MARGIN_ROWS)
 
-        # Grid şeklinde göster (3 sütun)
-        columns = 3
-        thumb_width, thumb_height = 200, 120
-
-        for idx, filename in enumerate(sorted(video_files)):
-            row = idx // columns
-            col = idx % columns
-            full_path = os.path.join(self.video_dir, filename)
-
-            item_frame = tk.Frame(
-                self.inner_frame,
-                bg=self.colors["bg_medium"],
-                bd=1,
-                relief=tk.SOLID,
-                padx=5,
-                pady=5,
-            )
-            item_frame.grid(row=row, column=col, padx=10, pady=10, sticky="n")
+        first = first_row * self.columns
+        last = min(len(self.video_paths) - 1, (last_row + 1) * self.columns - 1)
 
-            thumb = self._create_thumbnail(full_path, thumb_width, thumb_height)
-            if thumb is not None:
-                thumb_label = tk.Label(
-                    item_frame, image=thumb, bg=self.colors["bg_medium"]
-                )
-                thumb_label.pack()
-                # Referansı sakla
-                self.thumbnails[full_path] = thumb
-            else:
-                thumb_label = tk.Label(
-                    item_frame,
-                    text="Önizleme yok",
-                    font=("Segoe UI", 10),
-                    bg=self.colors["bg_medium"],
-                    fg=self.colors["text"],
-                    width=thumb_width // 10,
-                    height=thumb_height // 20,
-                )
-                thumb_label.pack()
-
-            name_label = tk.Label(
-                item_frame,
-                text=filename,
-                font=("Segoe UI", 9),
-                bg=self.colors["bg_medium"],
-                fg=self.colors["text"],
-                wraplength=thumb_width,
+        for index in list(self.visible_cells):
+            if index < first or index > last:
+                self._release_cell(index)
+
+        for index in range(first, last + 1):
+            if index not in self.visible_cells:
+                self._show_cell(index)
+
+    def _create_cell(self):
+        """Yeniden kullanılabilir bir grid hücresi (frame + önizleme + isim) oluştur"""
+        frame = tk.Frame(
+            self.canvas,
+            bg=self.colors["bg_medium"],
+            bd=1,
+            relief=tk.SOLID,
+            padx=5,
+            pady=5,
+        )
+        thumb_label = tk.Label(
+            frame,
+            font=("Segoe UI", 10),
+            bg=self.colors["bg_medium"],
+            fg=self.colors["text"],
+        )
+        thumb_label.pack()
+        name_label = tk.Label(
+            frame,
+            font=("Segoe UI", 9),
+            bg=self.colors["bg_medium"],
+            fg=self.colors["text"],
+            wraplength=self.thumb_width,
+        )
+        name_label.pack(pady=(5, 0))
+        info_label = tk.Label(
+            frame,
+            font=("Segoe UI", 8),
+            bg=self.colors["bg_medium"],
+            fg="#a0a0a0",
+        )
+        info_label.pack()
+
+        cell = {
+            "frame": frame,
+            "thumb": thumb_label,
+            "name": name_label,
+            "info": info_label,
+            "window": self.canvas.create_window(0, 0, window=frame, anchor="nw"),
+            "path": None,
+            "photo": None,
+        }
+
+        # Çift tıklama ile videoyu aç (hücre o an hangi videoyu gösteriyorsa)
+        for widget in (frame, thumb_label, name_label, info_label):
+            widget.bind(
+                "<Double-Button-1>",
+                lambda e, c=cell: c["path"] and self.open_video(c["path"]),
             )
-            name_label.pack(pady=(5, 0))
+            self._bind_mousewheel(widget)
+        return cell
 
-            # Çift tıklama ile videoyu aç
-            for widget in (item_frame, thumb_label, name_label):
-                widget.bind(
-                    "<Double-Button-1>",
-                    lambda e, p=full_path: self.open_video(p),
-                )
+    def _show_cell(self, index):
+        cell = self.free_cells.pop() if self.free_cells else self._create_cell()
+        full_path = self.video_paths[index]
+        row, col = divmod(index, self.columns)
+
+        cell["path"] = full_path
+        cell["name"].configure(text=os.path.basename(full_path))
+        cell["info"].configure(text=format_metadata(self.metadata.get(full_path)))
+        self.canvas.coords(cell["window"], col * CELL_WIDTH + 10, row * CELL_HEIGHT + 10)
+        self.canvas.itemconfigure(cell["window"], state="normal")
+
+        if full_path in self.thumbnails:
+            self.thumbnails.move_to_end(full_path)
+            self._set_cell_image(cell, self.thumbnails[full_path])
+        else:
+            # Önce yer tutucu göster; önizleme hazır olunca değiştirilir
+            self._set_cell_placeholder(cell, "⏳ Yükleniyor")
+            self.thumbnail_cache.request(full_path)
+
+        self.visible_cells[index] = cell
+
+    def _release_cell(self, index):
+        cell = self.visible_cells.pop(index)
+        # Ekrandan çıkan ve henüz başlamamış önizleme işini iptal et
+        self.thumbnail_cache.cancel(cell["path"])
+        cell["path"] = None
+        cell["photo"] = None
+        self.canvas.itemconfigure(cell["window"], state="hidden")
+        self.free_cells.append(cell)
 
-    def _create_thumbnail(self, video_path, width, height):
-        """Videonun ilk karesinden küçük bir önizleme resmi üret."""
+    def _set_cell_placeholder(self, cell, text):
+        cell["photo"] = None
+        cell["thumb"].configure(
+            image="",
+            text=text,
+            width=self.thumb_width // 10,
+            height=self.thumb_height // 20,
+        )
+
+    def _set_cell_image(self, cell, photo):
+        if photo is None:
+            self._set_cell_placeholder(cell, "Önizleme yok")
+            return
+        # Hücre referansı tutar; LRU'dan düşse de gösterim sürer
+        cell["photo"] = photo
+        cell["thumb"].configure(image=photo, text="", width=0, height=0)
+
+    def _remember_thumbnail(self, video_path, photo):
+        self.thumbnails[video_path] = photo
+        self.thumbnails.move_to_end(video_path)
+        while len(self.thumbnails) > THUMB_LRU_SIZE:
+            self.thumbnails.popitem(last=False)
+
+    def _search_record_files(self, query):
+        """Kayıt ismi aramaya uyan videoların dosya adlarını getir"""
+        if not os.path.exists(self.db_path):
+            return set()
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                paths = search_video_paths(conn, {"query": query})
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Arama hatası: {e}")
+            return set()
+        return {os.path.basename(path) for path in paths}
+
+    def _poll_thumbnails(self):
+        """Hazır olan önizlemeleri UI thread'inde görünür hücrelere yerleştir"""
+        cells_by_path = None
+        try:
+            while True:
+                video_path, image = self.thumbnail_cache.results.get_nowait()
+                self.thumbnail_cache.done(video_path)
+                if cells_by_path is None:
+                    cells_by_path = {
+                        cell["path"]: cell for cell in self.visible_cells.values()
+                    }
+                cell = cells_by_path.get(video_path)
+                if cell is None:
+                    continue  # Ekrandan çıkmış; disk önbelleğinden tekrar gelir
+                photo = ImageTk.PhotoImage(image) if image is not None else None
+                self._remember_thumbnail(video_path, photo)
+                self._set_cell_image(cell, photo)
+        except queue.Empty:
+            pass
+        try:
+            self.parent_frame.after(50, self._poll_thumbnails)
+        except tk.TclError:
+            pass
+
+    def _poll_metadata(self):
+        """Arka planda okunan meta verileri listeye ve görünür hücrelere işle"""
+        cells_by_path = None
+        try:
+            while True:
+                video_path, meta = self.metadata_index.results.get_nowait()
+                self.metadata_index.done(video_path)
+                if video_path not in self.metadata:
+                    continue
+                self.metadata[video_path] = meta
+                if cells_by_path is None:
+                    cells_by_path = {
+                        cell["path"]: cell for cell in self.visible_cells.values()
+                    }
+                cell = cells_by_path.get(video_path)
+                if cell is not None:
+                    cell["info"].configure(text=format_metadata(meta))
+        except queue.Empty:
+            pass
+        try:
+            self.parent_frame.after(200, self._poll_metadata)
+        except tk.TclError:
+            pass
+
+    def build_proxies(self):
+        """Listelenen videolar için düşük çözünürlüklü proxy'leri arka planda üret"""
+        added = self.proxy_builder.enqueue(self.video_paths)
+        if not added and not self.proxy_builder.pending():
+            messagebox.showinfo("Proxy", "Listelenen tüm videoların proxy'si hazır.")
+            return
+        self.proxy_btn.configure(text=f"🗜️ Proxy ({self.proxy_builder.pending()} kaldı)")
+
+    def _poll_proxies(self):
+        try:
+            while True:
+                _, _, remaining = self.proxy_builder.progress.get_nowait()
+                self.proxy_btn.configure(
+                    text=f"🗜️ Proxy ({remaining} kaldı)" if remaining else "🗜️ Proxy Oluştur"
+                )
+        except queue.Empty:
+            pass
         try:
-            cap = cv2.VideoCapture(video_path)
-            ret, frame = cap.read()
-            cap.release()
-            if not ret or frame is None:
-                return None
-
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            img.thumbnail((width, height))
-            photo = ImageTk.PhotoImage(img)
-            return photo
-        except Exception:
-            return None
+            self.parent_frame.after(500, self._poll_proxies)
+        except tk.TclError:
+            pass
 
     def open_video(self, video_path):
         """Seçilen videoyu Video panelinde açmak için callback'i çağır."""
@@ -196,3 +513,8 @@ class FilesContainer:
             return
         self.open_video_callback(video_path)
 
+    def cleanup(self):
+        """Arka plan işlerini (önizleme, meta veri, proxy) kapat"""
+        self.thumbnail_cache.shutdown()
+        self.metadata_index.shutdown()
+        self.proxy_builder.stop()
@@ -0,0 +1,193 @@
+import os
+import queue
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+METADATA_FIELDS = ("duration", "fps", "width", "height", "frame_count", "codec")
+
+
+def ensure_metadata_table(conn):
+    """video_metadata tablosunu oluştur (dosya başına bir satır)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS video_metadata (
+            path TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            duration REAL,
+            fps REAL,
+            width INTEGER,
+            height INTEGER,
+            frame_count INTEGER,
+            codec TEXT,
+            probed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_video_metadata_folder
+        ON video_metadata (folder)
+    ''')
+    conn.commit()
+
+
+def _fourcc_to_str(value):
+    """CAP_PROP_FOURCC değerini okunabilir koda çevir (ör. 'avc1')"""
+    code = int(value)
+    if code <= 0:
+        return None
+    text = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return text.strip("\x00 ").lower() or None
+
+
+def probe_video(video_path):
+    """Videonun özelliklerini sadece başlık bilgisinden oku (frame çözmeden)"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        return {
+            "fps": fps or None,
+            "frame_count": frame_count or None,
+            "duration": frame_count / fps if fps > 0 and frame_count > 0 else None,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0) or None,
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0) or None,
+            "codec": _fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        }
+    finally:
+        cap.release()
+
+
+class VideoMetadataIndex:
+    """Klasördeki videoların meta verisini (süre, FPS, çözünürlük, codec) tutar.
+
+    Taramalar artımlıdır: dosyanın boyutu ve değişiklik zamanı veritabanındaki
+    kayıtla aynıysa tekrar okunmaz. Yeni/değişmiş dosyalar thread havuzunda
+    probe edilir, sonuç veritabanına yazılır ve `results` kuyruğuna
+    (video_path, meta) olarak konur.
+    """
+
+    def __init__(self, db_path, max_workers=2):
+        self.db_path = db_path
+        self.results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = set()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            ensure_metadata_table(conn)
+        finally:
+            conn.close()
+
+    def scan(self, folder):
+        """Klasörü tara; bilinen meta veriyi döndür, eksikleri arka planda probe et.
+
+        Returns:
+            dict: video_path -> meta sözlüğü (size, mtime_ns ve probe edilmişse
+            duration, fps, width, height, frame_count, codec)
+        """
+        files = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(VIDEO_EXTENSIONS) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files[os.path.join(folder, entry.name)] = (stat.st_size, stat.st_mtime_ns)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute('''
+                SELECT path, size, mtime_ns, duration, fps, width, height, frame_count, codec
+                FROM video_metadata WHERE folder = ?
+            ''', (folder,)).fetchall()
+
+            known = {}
+            removed = []
+            for path, size, mtime_ns, duration, fps, width, height, frame_count, codec in rows:
+                if path not in files:
+                    removed.append((path,))
+                    continue
+                if files[path] != (size, mtime_ns):
+                    continue  # Değişmiş; tekrar probe edilecek
+                known[path] = {
+                    "size": size, "mtime_ns": mtime_ns, "duration": duration,
+                    "fps": fps, "width": width, "height": height,
+                    "frame_count": frame_count, "codec": codec,
+                }
+
+            if removed:
+                with conn:
+                    conn.executemany('DELETE FROM video_metadata WHERE path = ?', removed)
+        finally:
+            conn.close()
+
+        metadata = {}
+        for path, (size, mtime_ns) in files.items():
+            if path in known:
+                metadata[path] = known[path]
+                continue
+            metadata[path] = {"size": size, "mtime_ns": mtime_ns}
+            if path not in self._pending:
+                self._pending.add(path)
+                self._executor.submit(self._probe, folder, path, size, mtime_ns)
+        return metadata
+
+    def _probe(self, folder, video_path, size, mtime_ns):
+        """Worker: dosyayı probe et ve sonucu veritabanına yaz"""
+        meta = {"size": size, "mtime_ns": mtime_ns}
+        meta.update(dict.fromkeys(METADATA_FIELDS))
+        try:
+            meta.update(probe_video(video_path) or {})
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            try:
+                with conn:
+                    conn.execute('''
+                        INSERT OR REPLACE INTO video_metadata
+                            (path, folder, size, mtime_ns, duration, fps, width, height,
+                             frame_count, codec, probed_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        video_path, folder, size, mtime_ns,
+                        meta.get("duration"), meta.get("fps"),
+                        meta.get("width"), meta.get("height"),
+                        meta.get("frame_count"), meta.get("codec"),
+                        time.strftime("%Y-%m-%d %H:%M:%S"),
+                    ))
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Meta veri okunamadı ({video_path}): {e}")
+        self.results.put((video_path, meta))
+
+    def done(self, video_path):
+        """UI sonucu işledikten sonra çağırır"""
+        self._pending.discard(video_path)
+
+    def shutdown(self):
+        """Bekleyen işleri iptal et ve havuzu kapat"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_metadata(meta):
+    """Grid'de gösterilecek kısa özet ('01:23 • 1920x1080 • 25 fps • avc1')"""
+    if not meta or "fps" not in meta:
+        return "⏳ bilgiler okunuyor"
+    parts = []
+    duration = meta.get("duration")
+    if duration:
+        minutes, seconds = divmod(int(duration), 60)
+        hours, minutes = divmod(minutes, 60)
+        parts.append(f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}")
+    if meta.get("width") and meta.get("height"):
+        parts.append(f"{meta['width']}x{meta['height']}")
+    if meta.get("fps"):
+        parts.append(f"{meta['fps']:.0f} fps")
+    if meta.get("codec"):
+        parts.append(meta["codec"])
+    return " • ".join(parts) if parts else "Bilgi yok"
@@ -0,0 +1,87 @@
+import os
+import hashlib
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from PIL import Image
+
+
+class ThumbnailCache:
+    """Video önizlemelerini diskte önbellekleyen ve arka planda üreten sınıf.
+
+    Önbellek anahtarı dosya yolu + boyut + değişiklik zamanı + önizleme
+    boyutudur; video değişirse yeni önizleme üretilir. Üretim bir thread
+    havuzunda yapılır, sonuçlar `results` kuyruğuna (video_path, PIL.Image
+    veya None) olarak konur. PhotoImage dönüşümü UI thread'inde yapılmalıdır.
+    """
+
+    def __init__(self, cache_dir=None, size=(200, 120), max_workers=4):
+        self.cache_dir = cache_dir or os.path.join("dosyalar", "cache", "thumbs")
+        self.size = size
+        self.results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # video_path -> Future (UI thread'inden erişilir)
+        self._pending = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, video_path):
+        """Video için önbellek dosyasının yolu (dosya okunamazsa None)"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.size[0]}x{self.size[1]}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.jpg")
+
+    def request(self, video_path):
+        """Önizlemeyi arka planda yükle/üret (aynı dosya için tekrar istemez)"""
+        if video_path in self._pending:
+            return
+        self._pending[video_path] = self._executor.submit(self._load, video_path)
+
+    def cancel(self, video_path):
+        """Henüz başlamamış isteği iptal et (ör. satır ekrandan çıktıysa)"""
+        future = self._pending.get(video_path)
+        if future is not None and future.cancel():
+            del self._pending[video_path]
+
+    def _load(self, video_path):
+        """Worker: önbellekten oku, yoksa ilk kareden üret ve diske yaz"""
+        image = None
+        try:
+            path = self.cache_path(video_path)
+            if path and os.path.exists(path):
+                with Image.open(path) as cached:
+                    image = cached.copy()
+            else:
+                image = self._generate(video_path)
+                if image is not None and path:
+                    image.save(path, "JPEG", quality=85)
+        except Exception as e:
+            print(f"Önizleme hatası ({video_path}): {e}")
+        self.results.put((video_path, image))
+
+    def _generate(self, video_path):
+        """Videonun ilk karesinden küçük bir önizleme resmi üret."""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            ret, frame = cap.read()
+        finally:
+            cap.release()
+        if not ret or frame is None:
+            return None
+
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        img = Image.fromarray(frame_rgb)
+        img.thumbnail(self.size)
+        return img
+
+    def done(self, video_path):
+        """UI sonucu işledikten sonra çağırır (tekrar istenebilir)"""
+        self._pending.pop(video_path, None)
+
+    def shutdown(self):
+        """Bekleyen işleri iptal et ve havuzu kapat"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,157 @@
+import csv
+import os
+import sqlite3
+
+from .records import build_filter_clause
+
+# Kaç satırda bir ilerleme bildirilir
+PROGRESS_EVERY = 100
+
+BASE_COLUMNS = ["ID", "İsim", "Tarih", "Frame Sayısı"]
+
+
+def _prepare_selection(conn, record_ids, filters):
+    """Dışa aktarılacak kayıtlar için WHERE ifadesi ve parametreleri hazırla.
+
+    Seçili ID'ler parametre limitine takılmamak için geçici tabloya yazılır.
+    """
+    if record_ids is not None:
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS export_ids (id INTEGER PRIMARY KEY)')
+        conn.execute('DELETE FROM export_ids')
+        conn.executemany(
+            'INSERT OR IGNORE INTO export_ids (id) VALUES (?)',
+            ((int(record_id),) for record_id in record_ids)
+        )
+        return 'WHERE v.id IN (SELECT id FROM export_ids)', []
+
+    conditions, params = build_filter_clause(alias='v', **(filters or {}))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return where, params
+
+
+def export_records(db_path, file_path, record_ids=None, filters=None,
+                   progress_callback=None):
+    """Kayıtları rota sütunlu (pivot) tablo olarak XLSX/CSV'ye aktar.
+
+    Pivot SQL tarafında yapılır ve satırlar cursor'dan okunurken doğrudan
+    dosyaya yazılır (openpyxl write-only modu / csv.writer); bellek kullanımı
+    kayıt sayısından bağımsızdır.
+
+    Args:
+        db_path: Veritabanı yolu
+        file_path: Hedef dosya (.xlsx veya .csv)
+        record_ids: Aktarılacak kayıt ID'leri (None ise filters kullanılır)
+        filters: build_filter_clause için sözlük (name, date_from, date_to)
+        progress_callback: callback(done, total) - worker thread'inden çağrılır
+
+    Returns:
+        int: Yazılan kayıt sayısı
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        where, params = _prepare_selection(conn, record_ids, filters)
+
+        total = conn.execute(
+            f'SELECT COUNT(*) FROM video_records v {where}', params
+        ).fetchone()[0]
+
+        routes = conn.execute(f'''
+            SELECT DISTINCT t.from_area, t.to_area
+            FROM transition_counts t
+            JOIN video_records v ON v.id = t.video_record_id
+            {where}
+            ORDER BY t.from_area, t.to_area
+        ''', params).fetchall()
+
+        route_columns = [f"{from_area} → {to_area}" for from_area, to_area in routes]
+        columns = BASE_COLUMNS + (route_columns if route_columns else ["Geçiş Yok"])
+
+        # SQL tarafı pivot: her rota için koşullu toplam
+        if routes:
+            pivot_exprs = ',\n'.join(
+                'COALESCE(SUM(CASE WHEN t.from_area = ? AND t.to_area = ? THEN t.count END), 0)'
+                for _ in routes
+            )
+            pivot_params = [value for route in routes for value in route]
+        else:
+            pivot_exprs = '0'
+            pivot_params = []
+
+        cursor = conn.execute(f'''
+            SELECT v.id, v.name, substr(v.created_at, 1, 19), COALESCE(v.frame_count, 0),
+                   {pivot_exprs}
+            FROM video_records v
+            LEFT JOIN transition_counts t ON t.video_record_id = v.id
+            {where}
+            GROUP BY v.id
+            ORDER BY v.id
+        ''', pivot_params + params)
+
+        writer = _open_writer(file_path, columns)
+        done = 0
+        try:
+            for row in cursor:
+                writer.write(row)
+                done += 1
+                if progress_callback and done % PROGRESS_EVERY == 0:
+                    progress_callback(done, total)
+        finally:
+            writer.close()
+
+        if progress_callback:
+            progress_callback(done, total)
+        return done
+    finally:
+        conn.close()
+
+
+def _open_writer(file_path, columns):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".xlsx":
+        return _XlsxStreamWriter(file_path, columns)
+    return _CsvStreamWriter(file_path, columns)
+
+
+class _CsvStreamWriter:
+    def __init__(self, file_path, columns):
+        self._file = open(file_path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class _XlsxStreamWriter:
+    def __init__(self, file_path, columns):
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+
+        self.file_path = file_path
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Rapor")
+
+        # Write-only modda genişlikler satırlardan önce verilmeli (başlığa göre)
+        for col_idx, col_name in enumerate(columns, start=1):
+            width = min(max(10, len(str(col_name)) + 2), 50)
+            self._ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+        self._ws.append(columns)
+
+    def write(self, row):
+        self._ws.append(list(row))
+
+    def close(self):
+        self._wb.save(self.file_path)
+
+
+def xlsx_available():
+    """openpyxl kurulu mu?"""
+    try:
+        import openpyxl  # noqa: F401
+        return True
+    except Exception:
+        return False
@@ -2,14 +2,36 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import sqlite3
 import os
-import csv
+import threading
+import queue
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
+from .records import (
+    PAGE_SIZE, build_filter_clause, ensure_record_indexes, fetch_records_by_id,
+    fetch_records_page, records_version, sort_value
+)
+from .export import export_records, xlsx_available
 
 # Matplotlib dark theme ayarları
 plt.style.use('dark_background')
 
+# Seçili kayıt için görünüm seçenekleri: 'Toplam' veya zaman serisi aralığı (ms)
+TIME_SERIES_INTERVALS = {
+    '1 dk': 60_000,
+    '15 dk': 15 * 60_000,
+    '1 saat': 60 * 60_000,
+}
+
+# Bar grafikte çizilecek en fazla rota (kalanlar "Diğer" olarak toplanır)
+MAX_ROUTES = 15
+
+# Birikirse sadece en yenisi çalıştırılan sorgu türleri
+COALESCED_REQUESTS = {'detail', 'overall', 'changes'}
+
+# Veritabanı değişikliklerini kontrol aralığı (ms)
+CHANGE_POLL_MS = 2000
+
 
 class GrafikContainer:
     """Grafik sayfası - DB kayıtlarını grafik ve tablo olarak gösterir"""
@@ -18,10 +40,43 @@ class GrafikContainer:
         self.parent_frame = parent_frame
         self.colors = colors
         self.db_path = 'dosyalar/database.db'
+
+        # Keyset sayfalama durumu
+        self.sort_key = 'Tarih'
+        self.sort_descending = True
+        self.filters = {}
+        self.last_key = None  # Yüklenen son satırın (sıralama değeri, id) çifti
+        self.has_more = False
+        self.indexes_ready = False
+
+        # Sorgular worker thread'de çalışır, sonuçlar kuyruk ile UI'a döner
+        self._request_queue = queue.Queue()
+        self._result_queue = queue.Queue()
+        self._list_generation = 0
+        self._detail_token = 0
+        self._page_loading = False
+        self._export_thread = None
+
+        # Canlı güncelleme: PRAGMA data_version başka bağlantıların commit'lerinde artar;
+        # records_version yalnızca bu sayfanın gösterdiği tablolar değişince
+        self._watch_conn = None
+        self._data_version = None
+        self._records_version = None
+        self._max_record_id = 0
+
+        # Grafikte yeniden kullanılan bar artist'leri
+        self._bars = None
+        self._bar_texts = []
+        self._bar_labels = None
         
         # UI oluştur
         self.setup_ui()
+
+        self._worker_thread = threading.Thread(target=self._query_worker, daemon=True)
+        self._worker_thread.start()
+        self._poll_results()
         self.load_data()
+        self.parent_frame.after(CHANGE_POLL_MS, self._poll_data_version)
         
     def setup_ui(self):
         """UI bileşenlerini oluştur"""
@@ -73,6 +128,44 @@ class GrafikContainer:
         )
         export_btn.pack(side=tk.RIGHT, padx=(0, 10))
         self.add_hover_effect(export_btn, self.colors['accent'], self.colors['accent_hover'])
+
+        export_range_btn = tk.Button(
+            title_frame,
+            text="📦 Filtredekileri Aktar",
+            font=('Segoe UI', 10),
+            bg=self.colors['accent'],
+            fg='white',
+            relief=tk.FLAT,
+            padx=15,
+            pady=8,
+            cursor='hand2',
+            command=self.export_filtered
+        )
+        export_range_btn.pack(side=tk.RIGHT, padx=(0, 10))
+        self.add_hover_effect(export_range_btn, self.colors['accent'], self.colors['accent_hover'])
+
+        # Dışarı aktarma ilerlemesi (sadece aktarım sırasında görünür)
+        self.export_progress = ttk.Progressbar(title_frame, mode='determinate', length=150)
+
+        # Görünüm seçimi (toplam veya zaman aralığına göre seri)
+        self.view_var = tk.StringVar(value='Toplam')
+        view_combo = ttk.Combobox(
+            title_frame,
+            textvariable=self.view_var,
+            values=['Toplam'] + list(TIME_SERIES_INTERVALS.keys()),
+            state='readonly',
+            width=10
+        )
+        view_combo.pack(side=tk.RIGHT, padx=(0, 10))
+        view_combo.bind('<<ComboboxSelected>>', self.on_record_select)
+
+        tk.Label(
+            title_frame,
+            text="Görünüm:",
+            font=('Segoe UI', 10),
+            bg=self.colors['bg_medium'],
+            fg=self.colors['text']
+        ).pack(side=tk.RIGHT, padx=(0, 5))
         
         # İçerik container (yatay: sol %40 tablo, sağ %60 grafik)
         content_frame = tk.Frame(main_container, bg=self.colors['bg_dark'])
@@ -92,6 +185,54 @@ class GrafikContainer:
         )
         table_label.pack()
         
+        # Filtre satırları (tam metin arama + indeksli filtreler, SQL tarafında uygulanır)
+        filter_frame = tk.Frame(left_panel, bg=self.colors['bg_medium'])
+        filter_frame.pack(fill=tk.X, padx=10, pady=(0, 4))
+        filter_frame_2 = tk.Frame(left_panel, bg=self.colors['bg_medium'])
+        filter_frame_2.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        self.filter_query_var = tk.StringVar()
+        self.filter_from_var = tk.StringVar()
+        self.filter_to_var = tk.StringVar()
+        self.filter_min_frames_var = tk.StringVar()
+        self.filter_max_frames_var = tk.StringVar()
+        self.filter_route_from_var = tk.StringVar()
+        self.filter_route_to_var = tk.StringVar()
+
+        for frame, label_text, var, width in (
+            (filter_frame, 'Ara:', self.filter_query_var, 16),
+            (filter_frame, 'Başlangıç (YYYY-AA-GG):', self.filter_from_var, 11),
+            (filter_frame, 'Bitiş:', self.filter_to_var, 11),
+            (filter_frame_2, 'Frame ≥', self.filter_min_frames_var, 8),
+            (filter_frame_2, 'Frame ≤', self.filter_max_frames_var, 8),
+            (filter_frame_2, 'Rota:', self.filter_route_from_var, 12),
+            (filter_frame_2, '→', self.filter_route_to_var, 12),
+        ):
+            tk.Label(
+                frame,
+                text=label_text,
+                font=('Segoe UI', 9),
+                bg=self.colors['bg_medium'],
+                fg=self.colors['text']
+            ).pack(side=tk.LEFT, padx=(0, 4))
+            entry = tk.Entry(frame, textvariable=var, width=width)
+            entry.pack(side=tk.LEFT, padx=(0, 10))
+            entry.bind('<Return>', lambda e: self.apply_filters())
+
+        filter_btn = tk.Button(
+            filter_frame,
+            text="🔍 Filtrele",
+            font=('Segoe UI', 9),
+            bg=self.colors['accent'],
+            fg='white',
+            relief=tk.FLAT,
+            padx=10,
+            cursor='hand2',
+            command=self.apply_filters
+        )
+        filter_btn.pack(side=tk.LEFT)
+        self.add_hover_effect(filter_btn, self.colors['accent'], self.colors['accent_hover'])
+
         # Tablo için frame
         table_frame = tk.Frame(left_panel, bg=self.colors['bg_medium'])
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
@@ -100,11 +241,15 @@ class GrafikContainer:
         columns = ('ID', 'İsim', 'Tarih', 'Frame Sayısı')
         self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
         
-        # Sütun başlıkları
-        self.tree.heading('ID', text='ID')
-        self.tree.heading('İsim', text='Video İsmi')
-        self.tree.heading('Tarih', text='Kayıt Tarihi')
-        self.tree.heading('Frame Sayısı', text='Frame Sayısı')
+        # Sütun başlıkları (tıklayınca SQL tarafında sıralanır)
+        self.column_titles = {
+            'ID': 'ID',
+            'İsim': 'Video İsmi',
+            'Tarih': 'Kayıt Tarihi',
+            'Frame Sayısı': 'Frame Sayısı',
+        }
+        for column, title in self.column_titles.items():
+            self.tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
         
         # Sütun genişlikleri
         self.tree.column('ID', width=50, anchor=tk.CENTER)
@@ -113,11 +258,11 @@ class GrafikContainer:
         self.tree.column('Frame Sayısı', width=120, anchor=tk.CENTER)
         
         # Scrollbar
-        scrollbar_table = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar_table.set)
+        self.scrollbar_table = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar_table.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar_table.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Seçim event'i
         self.tree.bind('<<TreeviewSelect>>', self.on_record_select)
@@ -161,59 +306,336 @@ class GrafikContainer:
         widget.bind('<Leave>', lambda e: widget.configure(bg=normal_color))
     
     def load_data(self):
-        """Veritabanından verileri yükle"""
+        """İlk sayfayı arka planda yükle (sonraki sayfalar kaydırdıkça gelir)"""
         if not os.path.exists(self.db_path):
             self.show_empty_state()
             return
-        
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Tüm kayıtları getir
-            cursor.execute('''
-                SELECT id, name, created_at, frame_count
-                FROM video_records
-                ORDER BY created_at DESC
-            ''')
-            
-            records = cursor.fetchall()
-            conn.close()
-            
-            # Tabloyu temizle ve doldur
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
+
+        # Canlı güncelleme için mevcut son kaydı ve veri sürümünü işaretle
+        self._mark_data_version()
+
+        # Tabloyu temizle ve sayfalamayı sıfırla; eski sorgu sonuçları yok sayılır
+        self.tree.delete(*self.tree.get_children())
+        self._list_generation += 1
+        self.last_key = None
+        self.has_more = True
+        self._page_loading = False
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Keyset sayfalama ile bir sonraki sayfayı worker'dan iste"""
+        if not self.has_more or self._page_loading:
+            return
+
+        self._page_loading = True
+        generation = self._list_generation
+        first_page = self.last_key is None
+        self._submit(
+            'page',
+            self._query_page,
+            (dict(self.filters), self.sort_key, self.sort_descending, self.last_key),
+            lambda records: self._on_page_loaded(generation, first_page, records)
+        )
+
+    def _on_page_loaded(self, generation, first_page, records):
+        """Worker'dan gelen sayfayı tabloya ekle (UI thread)"""
+        if generation != self._list_generation:
+            return  # Filtre/sıralama değişmiş, eski sonuç
+        self._page_loading = False
+
+        if records is None:
+            self.has_more = False
+            if first_page:
+                self.show_empty_state()
+            return
+
+        for record in records:
+            record_id, name, created_at, frame_count = record
+            # Tarih formatını düzenle
+            date_str = created_at[:19] if created_at else "Bilinmiyor"
+            self.tree.insert('', tk.END, values=(record_id, name, date_str, frame_count or 0), tags=(str(record_id),))
+
+        if records:
+            self.last_key = sort_value(records[-1], self.sort_key)
+        self.has_more = len(records) == PAGE_SIZE
+
+        if first_page:
             if not records:
                 self.show_empty_state()
                 return
-            
-            for record in records:
-                record_id, name, created_at, frame_count = record
-                # Tarih formatını düzenle
-                date_str = created_at[:19] if created_at else "Bilinmiyor"
-                self.tree.insert('', tk.END, values=(record_id, name, date_str, frame_count or 0), tags=(str(record_id),))
-            
             # Genel grafik göster
-            self.show_overall_graph(records)
-            
-        except Exception as e:
-            print(f"Veri yükleme hatası: {e}")
-            self.show_empty_state()
+            self._submit('overall', self._query_overall, (), self.show_overall_graph)
+
+    def on_tree_scroll(self, first, last):
+        """Scrollbar'ı güncelle; sona yaklaşıldıysa sonraki sayfayı getir"""
+        self.scrollbar_table.set(first, last)
+        if self.has_more and float(last) >= 0.9:
+            self.load_next_page()
+
+    def read_filters(self):
+        """Filtre alanlarını build_filter_clause sözlüğüne çevir"""
+        def to_int(var):
+            text = var.get().strip()
+            return int(text) if text.isdigit() else None
+
+        route_from = self.filter_route_from_var.get().strip()
+        route_to = self.filter_route_to_var.get().strip()
+        return {
+            'query': self.filter_query_var.get().strip() or None,
+            'date_from': self.filter_from_var.get().strip() or None,
+            'date_to': self.filter_to_var.get().strip() or None,
+            'min_frames': to_int(self.filter_min_frames_var),
+            'max_frames': to_int(self.filter_max_frames_var),
+            'route': (route_from, route_to) if route_from and route_to else None,
+        }
+
+    def apply_filters(self):
+        """Filtre alanlarını oku ve listeyi yeniden yükle"""
+        self.filters = self.read_filters()
+        self.load_data()
+
+    def sort_by(self, column):
+        """Başlığa tıklanınca sıralamayı değiştir (aynı sütunda yön değişir)"""
+        if self.sort_key == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = column
+            self.sort_descending = column in ('Tarih', 'Frame Sayısı', 'ID')
+
+        for col, title in self.column_titles.items():
+            arrow = (' ▼' if self.sort_descending else ' ▲') if col == self.sort_key else ''
+            self.tree.heading(col, text=title + arrow)
+
+        self.load_data()
+
+    # ── Canlı güncelleme ───────────────────────────────────────
+
+    def _mark_data_version(self):
+        """Güncel data_version, kayıt sayacı ve en büyük kayıt ID'sini sakla"""
+        try:
+            if self._watch_conn is None:
+                self._watch_conn = sqlite3.connect(self.db_path)
+            self._data_version = self._watch_conn.execute('PRAGMA data_version').fetchone()[0]
+            self._records_version = records_version(self._watch_conn)
+            self._max_record_id = self._watch_conn.execute(
+                'SELECT COALESCE(MAX(id), 0) FROM video_records'
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Değişiklik izleme hatası: {e}")
+
+    def _poll_data_version(self):
+        """Zamanlayıcı: kayıtlar/sayımlar değiştiyse yüklü satırları ve grafiği yenile.
+
+        Analiz sırasında yazılan geçiş olayları data_version'ı artırır ama
+        kayıt sayacını değiştirmez; bu durumda sorgu yapılmaz. Devam eden
+        analiz kaydedilene kadar bu sayfada görünmez.
+        """
+        try:
+            if self._watch_conn is not None:
+                version = self._watch_conn.execute('PRAGMA data_version').fetchone()[0]
+                if version != self._data_version:
+                    self._data_version = version
+                    changes = records_version(self._watch_conn)
+                    if changes != self._records_version:
+                        self._records_version = changes
+                        self._submit(
+                            'changes',
+                            self._query_changes,
+                            (self._max_record_id, dict(self.filters), self._loaded_ids()),
+                            self._on_changes_loaded
+                        )
+            elif os.path.exists(self.db_path):
+                self.load_data()
+        except sqlite3.Error as e:
+            print(f"Değişiklik izleme hatası: {e}")
+
+        try:
+            self.parent_frame.after(CHANGE_POLL_MS, self._poll_data_version)
+        except tk.TclError:
+            pass
+
+    def _loaded_ids(self):
+        """Tabloda yüklü satırların kayıt ID'leri"""
+        return [self.tree.item(item)['values'][0] for item in self.tree.get_children()]
+
+    def _query_changes(self, conn, max_record_id, filters, loaded_ids):
+        """Yeni kayıtları, yüklü satırların güncel hallerini ve rota toplamlarını getir"""
+        conditions, params = build_filter_clause(**filters)
+        conditions.append('id > ?')
+        params.append(max_record_id)
+        new_records = conn.execute(f'''
+            SELECT id, name, created_at, frame_count
+            FROM video_records
+            WHERE {' AND '.join(conditions)}
+            ORDER BY id
+        ''', params).fetchall()
+        newest_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM video_records').fetchone()[0]
+        return {
+            'records': new_records,
+            'loaded': fetch_records_by_id(conn, loaded_ids),
+            'newest_id': newest_id,
+            'totals': self._query_overall(conn),
+        }
+
+    def _on_changes_loaded(self, changes):
+        """Yeni kayıtları listeye ekle, genel grafiği güncelle (UI thread)"""
+        if changes is None:
+            return
+        self._max_record_id = max(self._max_record_id, changes['newest_id'])
+
+        # Yüklü satırlar: düzenlenenler güncellenir, silinenler kaldırılır
+        loaded = changes['loaded']
+        for item in self.tree.get_children():
+            record_id = self.tree.item(item)['values'][0]
+            row = loaded.get(record_id)
+            if row is None:
+                self.tree.delete(item)
+                continue
+            _, name, created_at, frame_count = row
+            date_str = created_at[:19] if created_at else "Bilinmiyor"
+            self.tree.item(item, values=(record_id, name, date_str, frame_count or 0))
+
+        records = changes['records']
+        if records:
+            if self.sort_descending and self.sort_key in ('Tarih', 'ID'):
+                # En yeni kayıtlar en üstte
+                for record_id, name, created_at, frame_count in records:
+                    date_str = created_at[:19] if created_at else "Bilinmiyor"
+                    self.tree.insert('', 0, values=(record_id, name, date_str, frame_count or 0), tags=(str(record_id),))
+            elif not self.sort_descending and self.sort_key in ('Tarih', 'ID'):
+                # Artan sıralamada sona eklenir; sayfalama bitmediyse keyset zaten getirecek
+                if not self.has_more:
+                    self.has_more = True
+                    self.load_next_page()
+            # Diğer sıralamalarda yeni kayıtlar bir sonraki yenilemede yerini alır
+
+        # Seçili kayıt varsa onun grafiği, yoksa genel grafik yenilenir
+        selection = self.tree.selection()
+        if selection:
+            self.load_record_details(self.tree.item(selection[0])['values'][0])
+        else:
+            self.show_overall_graph(changes['totals'])
+
+    # ── Arka plan sorguları ────────────────────────────────────
+
+    def _submit(self, kind, query, args, callback):
+        """Sorguyu worker'a gönder; sonuç UI thread'inde callback'e verilir"""
+        self._request_queue.put((kind, query, args, callback))
+
+    def _query_worker(self):
+        """SQL sorgularını UI thread'i dışında çalıştır"""
+        while True:
+            requests = [self._request_queue.get()]
+            while True:
+                try:
+                    requests.append(self._request_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in requests:
+                return
+
+            # Aynı türden birden çok istek biriktiyse sadece sonuncusu çalışır
+            # (ör. ok tuşlarıyla hızlı kayıt gezinme)
+            latest = {}
+            for index, (kind, *_rest) in enumerate(requests):
+                if kind in COALESCED_REQUESTS:
+                    latest[kind] = index
+
+            for index, (kind, query, args, callback) in enumerate(requests):
+                if kind in COALESCED_REQUESTS and latest[kind] != index:
+                    continue
+                try:
+                    conn = sqlite3.connect(self.db_path)
+                    try:
+                        result = query(conn, *args)
+                    finally:
+                        conn.close()
+                except Exception as e:
+                    print(f"Sorgu hatası ({kind}): {e}")
+                    result = None
+                self._result_queue.put((callback, result))
+
+    def _poll_results(self):
+        """Worker sonuçlarını UI thread'inde uygula"""
+        try:
+            while True:
+                callback, result = self._result_queue.get_nowait()
+                callback(result)
+        except queue.Empty:
+            pass
+        except tk.TclError:
+            return
+        self.parent_frame.after(30, self._poll_results)
+
+    def _query_page(self, conn, filters, sort_key, descending, after):
+        if not self.indexes_ready:
+            ensure_record_indexes(conn)
+            self.indexes_ready = True
+        return fetch_records_page(
+            conn,
+            filters=filters,
+            sort_key=sort_key,
+            descending=descending,
+            after=after,
+            limit=PAGE_SIZE
+        )
+
+    def _query_overall(self, conn):
+        # Önceden hesaplanmış rota toplamlarını oku (transition_counts
+        # trigger'ları ile artımlı güncellenir, kayıt sayısından bağımsız)
+        return conn.execute('''
+            SELECT from_area, to_area, total
+            FROM route_totals
+            WHERE total > 0
+            ORDER BY total DESC
+        ''').fetchall()
+
+    def _query_record_details(self, conn, record_id, interval_ms):
+        row = conn.execute('''
+            SELECT name FROM video_records WHERE id = ?
+        ''', (record_id,)).fetchone()
+        details = {
+            'name': row[0] if row else "Bilinmeyen",
+            'interval_ms': interval_ms,
+        }
+
+        if interval_ms:
+            # Zaman serisi görünümü: 1 dakikalık kovalardan SQL ile türet
+            details['buckets'] = conn.execute('''
+                SELECT (bucket_start_ms / ?) * ? AS bucket, from_area, to_area, SUM(count)
+                FROM transition_buckets
+                WHERE video_record_id = ?
+                GROUP BY bucket, from_area, to_area
+                ORDER BY bucket
+            ''', (interval_ms, interval_ms, record_id)).fetchall()
+        else:
+            details['counts'] = conn.execute('''
+                SELECT from_area, to_area, count
+                FROM transition_counts
+                WHERE video_record_id = ?
+                ORDER BY count DESC
+            ''', (record_id,)).fetchall()
+        return details
     
     def show_empty_state(self):
         """Boş durum göster"""
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        self.ax.clear()
-        self.ax.text(0.5, 0.5, 'Henüz kayıt yok', 
-                    ha='center', va='center', 
-                    fontsize=14, color=self.colors['text'],
-                    transform=self.ax.transAxes)
-        self.canvas.draw()
+        self.show_message('Henüz kayıt yok')
         
         # Detay paneli kaldırıldı
+
+    def show_message(self, text, fontsize=14):
+        """Grafik alanında ortalanmış bir mesaj göster"""
+        self.ax.clear()
+        self._bars = None
+        self.ax.text(0.5, 0.5, text,
+                    ha='center', va='center',
+                    fontsize=fontsize, color=self.colors['text'],
+                    transform=self.ax.transAxes)
+        self.canvas.draw_idle()
     
     def on_record_select(self, event):
         """Kayıt seçildiğinde detayları göster"""
@@ -228,228 +650,231 @@ class GrafikContainer:
         self.load_record_details(record_id)
     
     def load_record_details(self, record_id):
-        """Seçili kaydın detaylarını yükle"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Geçiş sayımlarını getir
-            cursor.execute('''
-                SELECT from_area, to_area, count
-                FROM transition_counts
-                WHERE video_record_id = ?
-                ORDER BY count DESC
-            ''', (record_id,))
-            
-            counts = cursor.fetchall()
-            
-            # Video kaydı bilgisini getir
-            cursor.execute('''
-                SELECT name FROM video_records WHERE id = ?
-            ''', (record_id,))
-            record_name = cursor.fetchone()
-            record_name = record_name[0] if record_name else "Bilinmeyen"
-            
-            conn.close()
-
-            if counts:
-                # Grafik göster
-                self.show_record_graph(counts, record_name)
-            else:
-                self.ax.clear()
-                self.ax.text(0.5, 0.5, f'"{record_name}" için geçiş verisi yok', 
-                            ha='center', va='center', 
-                            fontsize=12, color=self.colors['text'],
-                            transform=self.ax.transAxes)
-                self.canvas.draw()
-                
-        except Exception as e:
-            print(f"Detay yükleme hatası: {e}")
+        """Seçili kaydın detaylarını arka planda yükle"""
+        self._detail_token += 1
+        token = self._detail_token
+        interval_ms = TIME_SERIES_INTERVALS.get(self.view_var.get())
+        self._submit(
+            'detail',
+            self._query_record_details,
+            (record_id, interval_ms),
+            lambda details: self._on_details_loaded(token, details)
+        )
+
+    def _on_details_loaded(self, token, details):
+        """Worker'dan gelen kayıt detaylarını çiz (UI thread)"""
+        if token != self._detail_token or details is None:
+            return  # Daha yeni bir seçim var
+
+        record_name = details['name']
+        if details['interval_ms']:
+            self.show_record_timeseries(details['buckets'], record_name, details['interval_ms'])
+        elif details['counts']:
+            # Grafik göster
+            self.show_record_graph(details['counts'], record_name)
+        else:
+            self.show_message(f'"{record_name}" için geçiş verisi yok', fontsize=12)
 
     def export_table(self):
-        """Seçili kaydı Excel'e (.xlsx) dışarı aktar; geçişleri (kol kol) ayrı sütun yapar.
+        """Seçili kayıtları Excel'e (.xlsx) dışarı aktar; geçişleri (kol kol) ayrı sütun yapar.
 
-        Not: openpyxl yoksa CSV olarak kaydeder.
+        Çoklu seçim desteklenir. Not: openpyxl yoksa CSV olarak kaydeder.
         """
         selection = self.tree.selection()
         if not selection:
-            messagebox.showinfo("Bilgi", "Lütfen tablodan bir kayıt seçin, sonra dışarı aktarın.")
+            messagebox.showinfo("Bilgi", "Lütfen tablodan en az bir kayıt seçin, sonra dışarı aktarın.")
             return
 
-        item = self.tree.item(selection[0])
-        values = item.get("values", [])
-        if not values:
+        record_ids = []
+        for item_id in selection:
+            values = self.tree.item(item_id).get("values", [])
+            if values:
+                record_ids.append(values[0])
+        if not record_ids:
             messagebox.showinfo("Bilgi", "Seçili kayıtta veri bulunamadı.")
             return
 
-        record_id, record_name, record_date, frame_count = values[0], values[1], values[2], values[3]
-
-        # DB'den seçili kaydın geçiş sayımlarını çek
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT from_area, to_area, count
-                FROM transition_counts
-                WHERE video_record_id = ?
-                ORDER BY from_area, to_area
-            ''', (record_id,))
-            counts = cursor.fetchall()
-            conn.close()
-        except Exception as e:
-            messagebox.showerror("Hata", f"Veritabanından geçiş verisi alınamadı:\n{e}")
-            return
-
-        # Pivot: her rota (from→to) ayrı sütun
-        route_to_count = {f"{from_area} → {to_area}": int(count) for from_area, to_area, count in counts}
-        route_columns = sorted(route_to_count.keys())
+        if len(record_ids) == 1:
+            record_name = self.tree.item(selection[0])["values"][1]
+            safe_name = "".join(c for c in str(record_name) if c.isalnum() or c in (" ", "-", "_")).strip() or "rapor"
+            initial_name = f"{safe_name}_{record_ids[0]}.xlsx"
+        else:
+            initial_name = f"rapor_{len(record_ids)}_kayit.xlsx"
 
-        base_columns = ["ID", "İsim", "Tarih", "Frame Sayısı"]
-        columns = base_columns + (route_columns if route_columns else ["Geçiş Yok"])
+        self._start_export(initial_name, record_ids=record_ids)
 
-        row = [record_id, record_name, record_date, frame_count]
-        if route_columns:
-            row.extend([route_to_count.get(rc, 0) for rc in route_columns])
-        else:
-            row.append(0)
+    def export_filtered(self):
+        """Filtredeki (tarih aralığı / isim) tüm kayıtları dışarı aktar"""
+        filters = self.read_filters()
+        date_part = "_".join(v for v in (filters['date_from'], filters['date_to']) if v) or "tum_kayitlar"
+        self._start_export(f"rapor_{date_part}.xlsx", filters=filters)
 
-        rows = [row]
+    def _start_export(self, initial_name, record_ids=None, filters=None):
+        """Dosya yolunu sor ve aktarımı arka planda başlat"""
+        if self._export_thread and self._export_thread.is_alive():
+            messagebox.showinfo("Bilgi", "Devam eden bir dışarı aktarma var.")
+            return
 
         # Kullanıcıdan dosya yolu al
-        safe_name = "".join(c for c in str(record_name) if c.isalnum() or c in (" ", "-", "_")).strip() or "rapor"
         file_path = filedialog.asksaveasfilename(
             title="Dışarıya Aktar",
             defaultextension=".xlsx",
             filetypes=[("Excel Dosyası", "*.xlsx"), ("CSV Dosyası", "*.csv")],
-            initialfile=f"{safe_name}_{record_id}.xlsx"
+            initialfile=initial_name
         )
         if not file_path:
             return
 
-        ext = os.path.splitext(file_path)[1].lower()
-
         # Excel export (openpyxl)
-        if ext == ".xlsx":
+        if os.path.splitext(file_path)[1].lower() == ".xlsx" and not xlsx_available():
+            messagebox.showwarning(
+                "Uyarı",
+                "Excel (.xlsx) için 'openpyxl' paketi gerekli. CSV olarak kaydediyorum.\n\n"
+                "Kurulum: pip install openpyxl"
+            )
+            file_path = os.path.splitext(file_path)[0] + ".csv"
+
+        self.export_progress.configure(value=0, maximum=1)
+        self.export_progress.pack(side=tk.RIGHT, padx=(0, 10))
+
+        def on_progress(done, total):
+            # Worker thread'inden UI kuyruğuna
+            self._result_queue.put((self._update_export_progress, (done, total)))
+
+        def worker():
             try:
-                from openpyxl import Workbook
-                from openpyxl.utils import get_column_letter
-            except Exception:
-                messagebox.showwarning(
-                    "Uyarı",
-                    "Excel (.xlsx) için 'openpyxl' paketi gerekli. CSV olarak kaydediyorum.\n\n"
-                    "Kurulum: pip install openpyxl"
+                exported = export_records(
+                    self.db_path,
+                    file_path,
+                    record_ids=record_ids,
+                    filters=filters,
+                    progress_callback=on_progress
                 )
-                file_path = os.path.splitext(file_path)[0] + ".csv"
-                ext = ".csv"
+                result = (file_path, exported, None)
+            except Exception as e:
+                result = (file_path, 0, e)
+            self._result_queue.put((self._on_export_finished, result))
 
-        try:
-            if ext == ".csv":
-                with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(columns)
-                    writer.writerows(rows)
-                messagebox.showinfo("Başarılı", f"CSV kaydedildi:\n{file_path}")
-                return
+        self._export_thread = threading.Thread(target=worker, daemon=True)
+        self._export_thread.start()
 
-            # .xlsx
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Seçili Rapor"
-            ws.append(columns)
-            for r in rows:
-                ws.append(list(r))
-
-            # Basit sütun genişliği ayarı
-            for col_idx, col_name in enumerate(columns, start=1):
-                max_len = max(len(str(col_name)), *(len(str(r[col_idx - 1])) for r in rows if len(r) >= col_idx))
-                ws.column_dimensions[get_column_letter(col_idx)].width = min(max(10, max_len + 2), 50)
-
-            wb.save(file_path)
-            messagebox.showinfo("Başarılı", f"Excel kaydedildi:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Dışarı aktarma sırasında hata oluştu:\n{e}")
-    
-    def show_overall_graph(self, records):
-        """Genel grafik göster (tüm kayıtlar)"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Tüm geçiş sayımlarını topla
-            cursor.execute('''
-                SELECT from_area, to_area, SUM(count) as total_count
-                FROM transition_counts
-                GROUP BY from_area, to_area
-                ORDER BY total_count DESC
-            ''')
-            
-            all_counts = cursor.fetchall()
-            conn.close()
-            
-            if not all_counts:
-                self.ax.clear()
-                self.ax.text(0.5, 0.5, 'Genel geçiş verisi yok', 
-                            ha='center', va='center', 
-                            fontsize=14, color=self.colors['text'],
-                            transform=self.ax.transAxes)
-                self.canvas.draw()
-                return
-            
-            # Grafik oluştur
-            self.ax.clear()
-            
-            labels = [f"{from_area} → {to_area}" for from_area, to_area, _ in all_counts]
-            values = [count for _, _, count in all_counts]
-            
-            # Bar grafik
-            bars = self.ax.bar(range(len(labels)), values, color=self.colors['accent'], alpha=0.7)
-            
-            # Değerleri üstte göster
-            for i, (bar, value) in enumerate(zip(bars, values)):
-                height = bar.get_height()
-                self.ax.text(bar.get_x() + bar.get_width()/2., height,
-                            f'{int(value)}',
-                            ha='center', va='bottom', color=self.colors['text'], fontsize=9)
-            
-            self.ax.set_xlabel('Geçiş Yolları', color=self.colors['text'], fontsize=11)
-            self.ax.set_ylabel('Toplam Geçiş Sayısı', color=self.colors['text'], fontsize=11)
-            self.ax.set_title('Tüm Kayıtlar - Toplam Geçiş Sayımları', 
-                            color=self.colors['text'], fontsize=12, fontweight='bold')
-            self.ax.set_xticks(range(len(labels)))
-            self.ax.set_xticklabels(labels, rotation=45, ha='right', color=self.colors['text'], fontsize=9)
-            self.ax.grid(True, alpha=0.3, color=self.colors['text'])
-            
-            self.fig.tight_layout()
-            self.canvas.draw()
-            
-        except Exception as e:
-            print(f"Grafik oluşturma hatası: {e}")
+    def _update_export_progress(self, progress):
+        done, total = progress
+        self.export_progress.configure(maximum=max(total, 1), value=done)
+
+    def _on_export_finished(self, result):
+        file_path, exported, error = result
+        self.export_progress.pack_forget()
+        if error is not None:
+            messagebox.showerror("Hata", f"Dışarı aktarma sırasında hata oluştu:\n{error}")
+            return
+        kind = "Excel" if file_path.lower().endswith(".xlsx") else "CSV"
+        messagebox.showinfo("Başarılı", f"{kind} kaydedildi ({exported} kayıt):\n{file_path}")
+
+    def show_overall_graph(self, all_counts):
+        """Genel grafik göster (tüm kayıtlar, önceden hesaplanmış toplamlar)"""
+        if not all_counts:
+            self.show_message('Genel geçiş verisi yok')
+            return
+
+        labels = [f"{from_area} → {to_area}" for from_area, to_area, _ in all_counts]
+        values = [count for _, _, count in all_counts]
+        self._render_bars(labels, values, 'Tüm Kayıtlar - Toplam Geçiş Sayımları', 'Toplam Geçiş Sayısı')
     
     def show_record_graph(self, counts, record_name):
         """Seçili kayıt için grafik göster"""
-        self.ax.clear()
-        
         labels = [f"{from_area} → {to_area}" for from_area, to_area, _ in counts]
         values = [count for _, _, count in counts]
+        self._render_bars(labels, values, f'"{record_name}" - Geçiş Sayımları', 'Geçiş Sayısı')
+
+    def _render_bars(self, labels, values, title, ylabel):
+        """Bar grafiği çiz; rotalar aynıysa mevcut bar artist'lerini güncelle.
+
+        En fazla MAX_ROUTES rota çizilir, kalanlar "Diğer" altında toplanır.
+        """
+        if len(labels) > MAX_ROUTES:
+            ranked = sorted(zip(values, labels), reverse=True)
+            kept = ranked[:MAX_ROUTES - 1]
+            other = sum(value for value, _ in ranked[MAX_ROUTES - 1:])
+            values = [value for value, _ in kept] + [other]
+            labels = [label for _, label in kept] + ['Diğer']
+
+        if self._bars is not None and labels == self._bar_labels:
+            # Aynı rotalar: sadece yükseklikleri ve etiketleri güncelle
+            for bar, text, value in zip(self._bars, self._bar_texts, values):
+                bar.set_height(value)
+                text.set_y(value)
+                text.set_text(f'{int(value)}')
+            self.ax.set_ylim(0, max(max(values), 1) * 1.1)
+            self.ax.set_ylabel(ylabel, color=self.colors['text'], fontsize=11)
+            self.ax.set_title(title, color=self.colors['text'], fontsize=12, fontweight='bold')
+            self.canvas.draw_idle()
+            return
+
+        self.ax.clear()
         
         # Bar grafik
         bars = self.ax.bar(range(len(labels)), values, color=self.colors['accent'], alpha=0.7)
         
         # Değerleri üstte göster
-        for i, (bar, value) in enumerate(zip(bars, values)):
-            height = bar.get_height()
-            self.ax.text(bar.get_x() + bar.get_width()/2., height,
+        texts = []
+        for bar, value in zip(bars, values):
+            texts.append(self.ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
                         f'{int(value)}',
-                        ha='center', va='bottom', color=self.colors['text'], fontsize=9)
+                        ha='center', va='bottom', color=self.colors['text'], fontsize=9))
         
         self.ax.set_xlabel('Geçiş Yolları', color=self.colors['text'], fontsize=11)
-        self.ax.set_ylabel('Geçiş Sayısı', color=self.colors['text'], fontsize=11)
-        self.ax.set_title(f'"{record_name}" - Geçiş Sayımları', 
-                        color=self.colors['text'], fontsize=12, fontweight='bold')
+        self.ax.set_ylabel(ylabel, color=self.colors['text'], fontsize=11)
+        self.ax.set_title(title, color=self.colors['text'], fontsize=12, fontweight='bold')
         self.ax.set_xticks(range(len(labels)))
         self.ax.set_xticklabels(labels, rotation=45, ha='right', color=self.colors['text'], fontsize=9)
+        self.ax.set_ylim(0, max(max(values), 1) * 1.1)
         self.ax.grid(True, alpha=0.3, color=self.colors['text'])
+
+        self._bars = list(bars)
+        self._bar_texts = texts
+        self._bar_labels = labels
         
         self.fig.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
+
+    def show_record_timeseries(self, bucket_rows, record_name, interval_ms):
+        """Seçili kayıt için zaman aralıklarına göre geçiş serisi göster"""
+        if not bucket_rows:
+            self.show_message(f'"{record_name}" için zaman serisi verisi yok', fontsize=12)
+            return
+
+        self.ax.clear()
+        self._bars = None
+
+        # Rota bazında seriler (eksik aralıklar 0)
+        buckets = sorted({bucket for bucket, _, _, _ in bucket_rows})
+        series = {}
+        for bucket, from_area, to_area, count in bucket_rows:
+            label = f"{from_area} → {to_area}"
+            series.setdefault(label, {})[bucket] = count
+
+        x_minutes = [bucket / 60_000 for bucket in buckets]
+        for label, values in sorted(series.items()):
+            self.ax.plot(x_minutes, [values.get(b, 0) for b in buckets],
+                         marker='o', markersize=3, label=label)
+
+        interval_label = next(
+            (name for name, ms in TIME_SERIES_INTERVALS.items() if ms == interval_ms), ''
+        )
+        self.ax.set_xlabel('Video Zamanı (dk)', color=self.colors['text'], fontsize=11)
+        self.ax.set_ylabel(f'Geçiş Sayısı / {interval_label}', color=self.colors['text'], fontsize=11)
+        self.ax.set_title(f'"{record_name}" - Zaman Serisi ({interval_label})',
+                        color=self.colors['text'], fontsize=12, fontweight='bold')
+        self.ax.grid(True, alpha=0.3, color=self.colors['text'])
+        self.ax.legend(fontsize=8, loc='upper right')
+
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
 
+    def cleanup(self):
+        """Worker thread'ini ve değişiklik izleme bağlantısını kapat"""
+        self._request_queue.put(None)
+        if self._watch_conn is not None:
+            self._watch_conn.close()
+            self._watch_conn = None
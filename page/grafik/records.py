@@ -0,0 +1,275 @@
+import re
+import sqlite3
+
+# Treeview'a tek seferde yüklenecek satır sayısı
+PAGE_SIZE = 200
+
+# Treeview sütunu -> SQL sıralama ifadesi (her biri için (ifade, id) indeksi var)
+SORT_COLUMNS = {
+    'ID': 'id',
+    'İsim': 'name COLLATE NOCASE',
+    'Tarih': 'created_at',
+    'Frame Sayısı': 'frame_count',
+}
+
+
+# FTS5 mevcutsa isim araması tam metin indeksiyle, değilse LIKE ile yapılır
+_fts_available = False
+
+
+def ensure_record_indexes(conn):
+    """Sayfalama, sıralama, filtreleme ve arama için gerekli indeksleri oluştur.
+
+    `video_records.name` için FTS5 tablosu (video_records_fts) trigger'larla
+    senkron tutulur. SQLite FTS5 desteği yoksa arama LIKE'a düşer.
+    """
+    global _fts_available
+
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_video_records_created
+        ON video_records (created_at, id)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_video_records_name
+        ON video_records (name COLLATE NOCASE, id)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_video_records_frames
+        ON video_records (frame_count, id)
+    ''')
+
+    ensure_change_counter(conn)
+
+    # Rota filtresi ("X→Y geçişi olan kayıtlar") ve kayıt detayları için
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transition_counts_route
+        ON transition_counts (from_area, to_area, video_record_id)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transition_counts_record
+        ON transition_counts (video_record_id)
+    ''')
+
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'video_records_fts'"
+        ).fetchone()
+        if not exists:
+            conn.execute('''
+                CREATE VIRTUAL TABLE video_records_fts USING fts5(
+                    name,
+                    content='video_records',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            # Mevcut kayıtları indeksle
+            conn.execute("INSERT INTO video_records_fts (video_records_fts) VALUES ('rebuild')")
+
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_video_records_fts_insert
+            AFTER INSERT ON video_records BEGIN
+                INSERT INTO video_records_fts (rowid, name) VALUES (NEW.id, NEW.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_video_records_fts_delete
+            AFTER DELETE ON video_records BEGIN
+                INSERT INTO video_records_fts (video_records_fts, rowid, name)
+                VALUES ('delete', OLD.id, OLD.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_video_records_fts_update
+            AFTER UPDATE OF name ON video_records BEGIN
+                INSERT INTO video_records_fts (video_records_fts, rowid, name)
+                VALUES ('delete', OLD.id, OLD.name);
+                INSERT INTO video_records_fts (rowid, name) VALUES (NEW.id, NEW.name);
+            END
+        ''')
+        _fts_available = True
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 kullanılamıyor, arama LIKE ile yapılacak: {e}")
+        _fts_available = False
+
+    conn.commit()
+
+
+def ensure_change_counter(conn):
+    """Grafik sayfasının gösterdiği tablolar için değişiklik sayacı.
+
+    `record_changes.version` yalnızca `video_records` ve `transition_counts`
+    değişince trigger'larla artar. PRAGMA data_version her commit'te
+    (ör. analiz sırasında yazılan geçiş olaylarında) arttığı için canlı
+    güncelleme önce bu sayaca bakar; sayaç değişmediyse sorgu yapılmaz.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS record_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO record_changes (id, version) VALUES (1, 0)")
+    bump = "UPDATE record_changes SET version = version + 1 WHERE id = 1;"
+    for table in ('video_records', 'transition_counts'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN {bump} END
+            ''')
+
+
+def records_version(conn):
+    """record_changes sayacının değeri (tablo yoksa 0)"""
+    try:
+        row = conn.execute("SELECT version FROM record_changes WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+
+def fetch_records_by_id(conn, record_ids, chunk=500):
+    """Verilen ID'lerin güncel satırları: {id: (id, name, created_at, frame_count)}"""
+    record_ids = list(record_ids)
+    rows = {}
+    for start in range(0, len(record_ids), chunk):
+        part = record_ids[start:start + chunk]
+        placeholders = ','.join('?' * len(part))
+        for row in conn.execute(f'''
+            SELECT id, name, created_at, frame_count
+            FROM video_records WHERE id IN ({placeholders})
+        ''', part):
+            rows[row[0]] = row
+    return rows
+
+
+def _escape_like(text):
+    """LIKE özel karakterlerini kaçış karakteriyle koru"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _fts_query(text):
+    """Kullanıcı metnini FTS5 önek sorgusuna çevir ('ana lis' -> '"ana"* "lis"*')"""
+    tokens = re.findall(r'\w+', text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def build_filter_clause(name=None, date_from=None, date_to=None, query=None,
+                        min_frames=None, max_frames=None, route=None, alias=None):
+    """Filtrelerden WHERE parçaları ve parametreleri üret.
+
+    Args:
+        name: İsim öneki (büyük/küçük harf duyarsız, indeks kullanır)
+        date_from: 'YYYY-MM-DD' (dahil)
+        date_to: 'YYYY-MM-DD' (dahil)
+        query: İsimde tam metin arama (FTS5, kelime önekleri)
+        min_frames / max_frames: Frame sayısı aralığı (dahil)
+        route: (from_area, to_area) - bu rotada geçişi olan kayıtlar
+        alias: video_records için sorgudaki tablo takma adı (ör. 'v')
+
+    Returns:
+        (list[str], list): koşullar ve parametreler
+    """
+    def col(column):
+        return f'{alias}.{column}' if alias else column
+
+    conditions = []
+    params = []
+    if name:
+        conditions.append(f"{col('name')} LIKE ? ESCAPE '\\'")
+        params.append(_escape_like(name) + '%')
+    if query:
+        fts_query = _fts_query(query)
+        if _fts_available and fts_query:
+            conditions.append(
+                f"{col('id')} IN (SELECT rowid FROM video_records_fts WHERE video_records_fts MATCH ?)"
+            )
+            params.append(fts_query)
+        else:
+            conditions.append(f"{col('name')} LIKE ? ESCAPE '\\'")
+            params.append('%' + _escape_like(query) + '%')
+    if date_from:
+        conditions.append(f"{col('created_at')} >= ?")
+        params.append(date_from)
+    if date_to:
+        # Bitiş günü dahil: ertesi günün başına kadar
+        conditions.append(f"{col('created_at')} < date(?, '+1 day')")
+        params.append(date_to)
+    if min_frames is not None:
+        conditions.append(f"{col('frame_count')} >= ?")
+        params.append(min_frames)
+    if max_frames is not None:
+        conditions.append(f"{col('frame_count')} <= ?")
+        params.append(max_frames)
+    if route:
+        conditions.append(f'''{col('id')} IN (
+            SELECT video_record_id FROM transition_counts
+            WHERE from_area = ? AND to_area = ? AND count > 0
+        )''')
+        params.extend(route)
+    return conditions, params
+
+
+def fetch_records_page(conn, filters=None, sort_key='Tarih', descending=True,
+                       after=None, limit=PAGE_SIZE):
+    """Keyset sayfalama ile bir sayfa kayıt getir.
+
+    Args:
+        conn: sqlite3 bağlantısı
+        filters: build_filter_clause için sözlük (name, date_from, date_to)
+        sort_key: SORT_COLUMNS anahtarı
+        descending: Azalan sıralama
+        after: Önceki sayfanın son satırının (sıralama değeri, id) çifti
+        limit: Sayfa boyutu
+
+    Returns:
+        list: (id, name, created_at, frame_count) satırları
+    """
+    sort_expr = SORT_COLUMNS.get(sort_key, 'created_at')
+    conditions, params = build_filter_clause(**(filters or {}))
+
+    if after is not None:
+        op = '<' if descending else '>'
+        if sort_expr == 'id':
+            conditions.append(f'id {op} ?')
+            params.append(after[1])
+        else:
+            conditions.append(f'({sort_expr}, id) {op} (?, ?)')
+            params.extend(after)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    direction = 'DESC' if descending else 'ASC'
+    order = f'id {direction}' if sort_expr == 'id' else f'{sort_expr} {direction}, id {direction}'
+
+    cursor = conn.execute(f'''
+        SELECT id, name, created_at, frame_count
+        FROM video_records
+        {where}
+        ORDER BY {order}
+        LIMIT ?
+    ''', (*params, limit))
+    return cursor.fetchall()
+
+
+def sort_value(row, sort_key):
+    """Satırdan keyset için (sıralama değeri, id) çiftini çıkar"""
+    record_id, name, created_at, frame_count = row
+    value = {
+        'ID': record_id,
+        'İsim': name,
+        'Tarih': created_at,
+        'Frame Sayısı': frame_count,
+    }.get(sort_key, created_at)
+    return (value, record_id)
+
+
+def search_video_paths(conn, filters):
+    """Filtrelere uyan kayıtların video dosya yollarını getir (Dosyalar paneli için)"""
+    conditions, params = build_filter_clause(**filters)
+    conditions.append("video_path != ''")
+    cursor = conn.execute(f'''
+        SELECT video_path FROM video_records
+        WHERE {' AND '.join(conditions)}
+    ''', params)
+    return [row[0] for row in cursor]
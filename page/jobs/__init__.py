@@ -0,0 +1 @@
+# İş kuyruğu (toplu analiz) modülü
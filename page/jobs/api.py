@@ -0,0 +1,453 @@
+"""Yerel HTTP servisi: analiz işi gönderme, iş durumu ve geçiş sayımları (JSON).
+
+Raporlama betikleri veritabanı dosyasını kopyalamak yerine bu servisi
+kullanır. Sadece 127.0.0.1'e bağlanır.
+
+Örnek:
+    python -m page.jobs.api --port 8765 --workers 2
+
+    curl -X POST localhost:8765/jobs -d '{"path": "/video/k1.mp4", "preset": "Kavşak 1"}'
+    curl -X POST localhost:8765/jobs -d '{"path": "/video/k1.mp4", "preset_id": 3}'
+    curl -X POST localhost:8765/jobs -d '{"path": "/video/k1.mp4",
+        "zones": [{"name": "A", "points": [[0, 0], [100, 0], [100, 100]]}]}'
+    curl localhost:8765/jobs/12
+    curl localhost:8765/records?limit=50
+    curl localhost:8765/records/7
+    curl localhost:8765/records/7/buckets?interval_ms=900000
+    curl localhost:8765/totals?day=2026-10-18
+    curl "localhost:8765/totals/daily?date_from=2026-10-01&date_to=2026-10-31"
+
+Uç noktalar:
+    GET  /health
+    GET  /jobs[?limit=]            POST /jobs
+    GET  /jobs/<id>
+    GET  /records[?limit=&after_id=&name=&q=&date_from=&date_to=]
+    GET  /records/<id>
+    GET  /records/<id>/buckets[?interval_ms=]
+    GET  /totals[?day=]            GET  /totals/daily[?date_from=&date_to=]
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from page.grafik.records import fetch_records_page
+from page.main_container.analyzer import parse_zones
+from page.main_container.presets import get_zone_preset, save_zone_preset
+from page.main_container.save import BUCKET_MS, VideoRecorder
+from .store import JobStore
+from .worker import JobRunner
+
+DEFAULT_PORT = 8765
+READ_POOL_SIZE = 4
+CACHE_ENTRIES = 128
+MAX_BODY_BYTES = 1024 * 1024
+MAX_LIMIT = 500
+
+
+class ReadPool:
+    """Salt okunur SQLite bağlantı havuzu.
+
+    Bağlantılar bir kez açılır ve istekler arasında paylaşılır; analiz
+    yazarken okuyucular kilit için en fazla `timeout` kadar bekler.
+    """
+
+    def __init__(self, db_path, size=READ_POOL_SIZE):
+        uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+        self._pool = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=10)
+            self._pool.put(conn)
+        self._size = size
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        for _ in range(self._size):
+            self._pool.get().close()
+
+
+class AggregateCache:
+    """Toplam sorguları için önbellek; veritabanı değişince geçersizleşir.
+
+    `PRAGMA data_version`, bağlantının kendisi dışındaki bir bağlantı commit
+    ettiğinde değişir. Önbellek hiç yazmayan ayrı bir bağlantıda bu değeri
+    okur; değer değişmediyse önceki yanıt aynen döndürülür.
+    """
+
+    def __init__(self, db_path, max_entries=CACHE_ENTRIES):
+        uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # anahtar -> (data_version, yanıt)
+        self.max_entries = max_entries
+
+    def _version(self):
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get(self, key, compute):
+        version = self._version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def close(self):
+        self._conn.close()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisApi:
+    """İstekleri veritabanı sorgularına çeviren uygulama katmanı (HTTP'den bağımsız)"""
+
+    def __init__(self, db_path, pool_size=READ_POOL_SIZE):
+        self.db_path = db_path
+        self.store = JobStore(db_path)
+        self.pool = ReadPool(db_path, pool_size)
+        self.cache = AggregateCache(db_path)
+
+    def close(self):
+        self.pool.close()
+        self.cache.close()
+
+    # --- İşler -------------------------------------------------------
+
+    def submit_job(self, body):
+        path = body.get('path')
+        if not path or not os.path.isfile(path):
+            raise ApiError(400, f"Video bulunamadı: {path}")
+
+        preset = body.get('preset')
+        zones = body.get('zones')
+        if body.get('preset_id') is not None:
+            found = get_zone_preset(self.db_path, preset_id=body['preset_id'])
+            if found is None:
+                raise ApiError(400, f"Alan ön ayarı bulunamadı: id {body['preset_id']}")
+            preset = found['name']
+        elif zones:
+            try:
+                area_list = parse_zones(zones)
+            except (KeyError, TypeError, ValueError, IndexError) as e:
+                raise ApiError(400, f"Geçersiz alan tanımı: {e}")
+            if not preset:
+                # Aynı alan seti aynı ön ayar ismine düşer
+                digest = hashlib.sha1(
+                    json.dumps(zones, sort_keys=True).encode("utf-8")).hexdigest()
+                preset = f"api-{digest[:10]}"
+            save_zone_preset(self.db_path, preset, area_list)
+        elif not preset or get_zone_preset(self.db_path, name=preset) is None:
+            raise ApiError(400, f"Alan ön ayarı bulunamadı: {preset}")
+
+        preset_id = get_zone_preset(self.db_path, name=preset)['id']
+        job_id = self.store.add(path, preset, name=body.get('name'), preset_id=preset_id)
+        if job_id is None:
+            raise ApiError(409, "Bu dosya zaten kuyrukta")
+        return self.job(job_id)
+
+    def job(self, job_id):
+        job = self.store.get(job_id)
+        if job is None:
+            raise ApiError(404, f"İş bulunamadı: {job_id}")
+        total = job['frame_count']
+        job['progress'] = round(job['frames_done'] / total, 4) if total else None
+        return job
+
+    def jobs(self, params):
+        return {'jobs': self.store.list_jobs(limit=_int(params, 'limit', 50, MAX_LIMIT, minimum=1))}
+
+    # --- Kayıtlar ----------------------------------------------------
+
+    def records(self, params):
+        filters = {
+            'name': _str(params, 'name'),
+            'query': _str(params, 'q'),
+            'date_from': _str(params, 'date_from'),
+            'date_to': _str(params, 'date_to'),
+        }
+        limit = _int(params, 'limit', 100, MAX_LIMIT, minimum=1)
+        after_id = _int(params, 'after_id', None)
+        after = (after_id, after_id) if after_id is not None else None
+        with self.pool.connection() as conn:
+            rows = fetch_records_page(conn, filters, sort_key='ID', descending=True,
+                                      after=after, limit=limit)
+        records = [
+            {'id': r[0], 'name': r[1], 'created_at': r[2], 'frame_count': r[3]}
+            for r in rows
+        ]
+        return {
+            'records': records,
+            # Sonraki sayfa için ?after_id=
+            'next_after_id': records[-1]['id'] if len(records) == limit else None,
+        }
+
+    def record(self, record_id):
+        with self.pool.connection() as conn:
+            row = conn.execute('''
+                SELECT id, name, video_path, created_at, frame_count, duration
+                FROM video_records WHERE id = ?
+            ''', (record_id,)).fetchone()
+            if row is None:
+                raise ApiError(404, f"Kayıt bulunamadı: {record_id}")
+            transitions = conn.execute('''
+                SELECT from_area, to_area, count
+                FROM transition_counts
+                WHERE video_record_id = ?
+                ORDER BY count DESC
+            ''', (record_id,)).fetchall()
+            class_rows = conn.execute('''
+                SELECT from_area, to_area, class_name, count
+                FROM transition_class_counts
+                WHERE video_record_id = ?
+            ''', (record_id,)).fetchall()
+            crossing_rows = conn.execute('''
+                SELECT line, direction, class_name, count
+                FROM line_crossing_counts
+                WHERE video_record_id = ?
+            ''', (record_id,)).fetchall()
+        by_class = {}
+        for f, t, class_name, c in class_rows:
+            by_class.setdefault((f, t), {})[class_name or '?'] = c
+        keys = ('id', 'name', 'video_path', 'created_at', 'frame_count', 'duration')
+        result = dict(zip(keys, row))
+        result['transitions'] = [
+            {'from': f, 'to': t, 'count': c, 'classes': by_class.get((f, t), {})}
+            for f, t, c in transitions
+        ]
+        # Sayım çizgileri: çizgi ve yön (+1 / -1) başına toplam ve sınıf dağılımı
+        crossings = {}
+        for line, direction, class_name, c in crossing_rows:
+            entry = crossings.setdefault((line, direction), {'count': 0, 'classes': {}})
+            entry['count'] += c
+            entry['classes'][class_name or '?'] = c
+        result['crossings'] = [
+            {'line': line, 'direction': direction, **entry}
+            for (line, direction), entry in sorted(crossings.items())
+        ]
+        return result
+
+    def record_buckets(self, record_id, params):
+        interval_ms = _int(params, 'interval_ms', BUCKET_MS)
+        if interval_ms < BUCKET_MS or interval_ms % BUCKET_MS:
+            raise ApiError(400, f"interval_ms {BUCKET_MS}'in katı olmalı")
+        with self.pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT (bucket_start_ms / ?) * ? AS bucket, from_area, to_area, SUM(count)
+                FROM transition_buckets
+                WHERE video_record_id = ?
+                GROUP BY bucket, from_area, to_area
+                ORDER BY bucket
+            ''', (interval_ms, interval_ms, record_id)).fetchall()
+        return {
+            'record_id': record_id,
+            'interval_ms': interval_ms,
+            'buckets': [
+                {'start_ms': b, 'from': f, 'to': t, 'count': c} for b, f, t, c in rows
+            ],
+        }
+
+    # --- Toplamlar (önbellekli) ---------------------------------------
+
+    def totals(self, params):
+        day = _str(params, 'day')
+
+        def compute():
+            with self.pool.connection() as conn:
+                if day:
+                    rows = conn.execute('''
+                        SELECT from_area, to_area, total FROM route_daily_totals
+                        WHERE day = ? AND total > 0 ORDER BY total DESC
+                    ''', (day,)).fetchall()
+                else:
+                    rows = conn.execute('''
+                        SELECT from_area, to_area, total FROM route_totals
+                        WHERE total > 0 ORDER BY total DESC
+                    ''').fetchall()
+            return {
+                'day': day,
+                'routes': [{'from': f, 'to': t, 'count': c} for f, t, c in rows],
+            }
+
+        return self.cache.get(('totals', day), compute)
+
+    def daily_totals(self, params):
+        date_from = _str(params, 'date_from') or '0000-00-00'
+        date_to = _str(params, 'date_to') or '9999-99-99'
+
+        def compute():
+            with self.pool.connection() as conn:
+                rows = conn.execute('''
+                    SELECT day, from_area, to_area, total FROM route_daily_totals
+                    WHERE day BETWEEN ? AND ? AND total > 0
+                    ORDER BY day, from_area, to_area
+                ''', (date_from, date_to)).fetchall()
+            return {
+                'days': [
+                    {'day': d, 'from': f, 'to': t, 'count': c} for d, f, t, c in rows
+                ],
+            }
+
+        return self.cache.get(('daily', date_from, date_to), compute)
+
+
+def _str(params, key):
+    values = params.get(key)
+    return values[0] if values and values[0] else None
+
+
+def _int(params, key, default, maximum=None, minimum=None):
+    value = _str(params, key)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(400, f"{key} sayı olmalı")
+    if maximum is not None:
+        number = min(number, maximum)
+    if minimum is not None:
+        number = max(number, minimum)
+    return number
+
+
+# (yöntem, desen) -> AnalysisApi çağrısı
+ROUTES = [
+    ('GET', re.compile(r'^/health$'), lambda api, m, q, b: {'status': 'ok'}),
+    ('GET', re.compile(r'^/jobs$'), lambda api, m, q, b: api.jobs(q)),
+    ('POST', re.compile(r'^/jobs$'), lambda api, m, q, b: api.submit_job(b)),
+    ('GET', re.compile(r'^/jobs/(\d+)$'), lambda api, m, q, b: api.job(int(m[1]))),
+    ('GET', re.compile(r'^/records$'), lambda api, m, q, b: api.records(q)),
+    ('GET', re.compile(r'^/records/(\d+)$'), lambda api, m, q, b: api.record(int(m[1]))),
+    ('GET', re.compile(r'^/records/(\d+)/buckets$'),
+     lambda api, m, q, b: api.record_buckets(int(m[1]), q)),
+    ('GET', re.compile(r'^/totals$'), lambda api, m, q, b: api.totals(q)),
+    ('GET', re.compile(r'^/totals/daily$'), lambda api, m, q, b: api.daily_totals(q)),
+]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """JSON istek/yanıt işleyicisi; `server.api` üzerinden AnalysisApi'yi çağırır"""
+
+    server_version = "GoruntuIslemeAPI/1.0"
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            body = self._read_body() if method == 'POST' else None
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    status = 201 if method == 'POST' else 200
+                    self._send(status, handler(self.server.api, match, params, body))
+                    return
+            raise ApiError(404, f"Bilinmeyen adres: {method} {url.path}")
+        except ApiError as e:
+            self._send(e.status, {'error': str(e)})
+        except sqlite3.Error as e:
+            self._send(503, {'error': f"Veritabanı hatası: {e}"})
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise ApiError(400, "Geçersiz Content-Length")
+        if length < 0:
+            # rfile.read(-1) bağlantı kapanana kadar bekler
+            raise ApiError(400, "Geçersiz Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "İstek çok büyük")
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ApiError(400, "Geçersiz JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "JSON nesnesi bekleniyor")
+        return body
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"[api] {self.address_string()} {format % args}", file=sys.stderr)
+
+
+def create_server(db_path, port=DEFAULT_PORT, pool_size=READ_POOL_SIZE):
+    """127.0.0.1:port üzerinde servis oluştur (serve_forever ile çalıştırılır)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), ApiHandler)
+    server.daemon_threads = True
+    server.api = AnalysisApi(db_path, pool_size)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yerel analiz API servisi")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Gönderilen işleri bu süreçte çalıştıracak worker sayısı "
+                             "(0: işleri uygulamanın İş Kuyruğu paneli çalıştırır)")
+    parser.add_argument("--model", help="Worker'lar için model dosyası (.pt)")
+    args = parser.parse_args(argv)
+
+    # Şema ve indeksler salt okunur havuz açılmadan önce oluşturulur
+    db_path = VideoRecorder().db_path
+    server = create_server(db_path, args.port)
+    runner = None
+    if args.workers > 0:
+        runner = JobRunner(server.api.store, workers=args.workers,
+                           model_path=args.model).start()
+
+    print(f"API: http://127.0.0.1:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if runner is not None:
+            runner.stop()
+        server.api.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from page.main_container.presets import list_zone_presets
+from page.settings.main import DB_PATH, db_get, db_set
+from .store import JobStore, STATUSES
+from .worker import CAMERA_PRESET, INBOX_DIR, InboxWatcher, JobRunner, resolve_preset
+
+# Panelin jobs tablosunu yeniden okuma aralığı (ms)
+REFRESH_MS = 1000
+
+STATUS_LABELS = {
+    'queued': 'Sırada',
+    'running': 'Çalışıyor',
+    'done': 'Bitti',
+    'failed': 'Hata',
+}
+
+
+class JobsContainer:
+    """İş kuyruğu paneli: gelen kutusu izleme, worker'lar ve iş durumu.
+
+    Gelen kutusuna bırakılan videolar seçili alan ön ayarıyla kuyruğa girer
+    ve worker'lar tarafından arayüzden bağımsız analiz edilir. Tablo
+    jobs tablosundan periyodik okunur; worker'lar arayüze doğrudan dokunmaz.
+    """
+
+    def __init__(self, parent_frame, colors):
+        self.parent_frame = parent_frame
+        self.colors = colors
+        self.store = JobStore(DB_PATH)
+        self.watcher = None
+        self.runner = None
+
+        self.inbox_var = tk.StringVar(value=db_get('jobs_inbox') or INBOX_DIR)
+        self.preset_var = tk.StringVar(value=db_get('jobs_preset') or '')
+        self.workers_var = tk.StringVar(value=db_get('jobs_workers') or '1')
+
+        self._build_ui()
+        self._refresh()
+
+    def _build_ui(self):
+        main_container = tk.Frame(self.parent_frame, bg=self.colors['bg_dark'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        title = tk.Label(
+            main_container,
+            text="📋 İş Kuyruğu",
+            font=('Segoe UI', 16, 'bold'),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text']
+        )
+        title.pack(anchor=tk.W, pady=(0, 10))
+
+        # Ayarlar satırı: gelen kutusu, ön ayar, worker sayısı
+        settings_frame = tk.Frame(main_container, bg=self.colors['bg_medium'])
+        settings_frame.pack(fill=tk.X, pady=(0, 10))
+        row = tk.Frame(settings_frame, bg=self.colors['bg_medium'])
+        row.pack(fill=tk.X, padx=15, pady=12)
+
+        self._label(row, "Gelen kutusu:").pack(side=tk.LEFT, padx=(0, 4))
+        tk.Entry(row, textvariable=self.inbox_var, width=36).pack(side=tk.LEFT)
+        self._button(row, "📂", self._choose_inbox).pack(side=tk.LEFT, padx=(4, 15))
+
+        self._label(row, "Alan ön ayarı:").pack(side=tk.LEFT, padx=(0, 4))
+        self.preset_combo = ttk.Combobox(
+            row, textvariable=self.preset_var, state='readonly', width=18,
+            postcommand=self._load_presets
+        )
+        self.preset_combo.pack(side=tk.LEFT, padx=(0, 15))
+
+        self._label(row, "Worker:").pack(side=tk.LEFT, padx=(0, 4))
+        tk.Spinbox(row, from_=1, to=16, textvariable=self.workers_var, width=4).pack(
+            side=tk.LEFT, padx=(0, 15))
+
+        self.toggle_button = self._button(row, "▶️ Başlat", self.toggle)
+        self.toggle_button.pack(side=tk.LEFT)
+
+        # İşlem butonları
+        action_frame = tk.Frame(main_container, bg=self.colors['bg_dark'])
+        action_frame.pack(fill=tk.X, pady=(0, 10))
+        self._button(action_frame, "➕ Dosya Ekle", self.add_files).pack(side=tk.LEFT, padx=(0, 5))
+        self._button(action_frame, "🔁 Yeniden Dene", self.retry_selected).pack(side=tk.LEFT)
+
+        self.summary_label = tk.Label(
+            action_frame,
+            text="",
+            font=('Segoe UI', 10),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text']
+        )
+        self.summary_label.pack(side=tk.RIGHT)
+
+        # İş tablosu
+        table_frame = tk.Frame(main_container, bg=self.colors['bg_medium'])
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ('ID', 'Dosya', 'Ön Ayar', 'Durum', 'Deneme', 'İlerleme', 'Kayıt', 'Hata')
+        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        widths = (50, 260, 120, 90, 70, 100, 60, 260)
+        for column, width in zip(columns, widths):
+            self.tree.heading(column, text=column)
+            anchor = tk.W if column in ('Dosya', 'Hata') else tk.CENTER
+            self.tree.column(column, width=width, anchor=anchor)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0), pady=10)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+
+    def _label(self, parent, text):
+        return tk.Label(
+            parent, text=text, font=('Segoe UI', 10),
+            bg=parent['bg'], fg=self.colors['text']
+        )
+
+    def _button(self, parent, text, command):
+        btn = tk.Button(
+            parent,
+            text=text,
+            font=('Segoe UI', 10),
+            bg=self.colors['accent'],
+            fg='white',
+            relief=tk.FLAT,
+            padx=12,
+            pady=4,
+            cursor='hand2',
+            command=command
+        )
+        btn.bind('<Enter>', lambda e: btn.configure(bg=self.colors['accent_hover']))
+        btn.bind('<Leave>', lambda e: btn.configure(bg=self.colors['accent']))
+        return btn
+
+    def _load_presets(self):
+        self.preset_combo['values'] = [CAMERA_PRESET] + list_zone_presets(DB_PATH)
+
+    def _choose_inbox(self):
+        directory = filedialog.askdirectory(title="Gelen Kutusu Klasörü Seç")
+        if directory:
+            self.inbox_var.set(directory)
+
+    def _check_preset(self):
+        preset = self.preset_var.get()
+        if not preset:
+            messagebox.showwarning(
+                "Uyarı",
+                "Önce bir alan ön ayarı seçin.\n"
+                "(Ana Sayfa'da alanları çizip '💾 Ön Ayar Kaydet' ile kaydedin)"
+            )
+            return None
+        return preset
+
+    def toggle(self):
+        """İzleyici ve worker'ları başlat / durdur"""
+        if self.runner is not None:
+            self.stop()
+            return
+
+        preset = self._check_preset()
+        if preset is None:
+            return
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except ValueError:
+            workers = 1
+        inbox = self.inbox_var.get().strip() or INBOX_DIR
+
+        db_set('jobs_inbox', inbox)
+        db_set('jobs_preset', preset)
+        db_set('jobs_workers', str(workers))
+
+        self.watcher = InboxWatcher(self.store, inbox, preset).start()
+        self.runner = JobRunner(self.store, workers=workers).start()
+        self.toggle_button.configure(text="⏹️ Durdur")
+
+    def stop(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.runner is not None:
+            self.runner.stop()
+            self.runner = None
+        self.toggle_button.configure(text="▶️ Başlat")
+
+    def add_files(self):
+        """Seçilen videoları elle kuyruğa ekle"""
+        preset = self._check_preset()
+        if preset is None:
+            return
+        paths = filedialog.askopenfilenames(
+            title="Kuyruğa Eklenecek Videolar",
+            filetypes=[("Video Dosyaları", "*.mp4 *.avi *.mkv *.mov"), ("Tüm Dosyalar", "*.*")]
+        )
+        missing = []
+        for path in paths:
+            found = resolve_preset(DB_PATH, preset, path)
+            if found is None:
+                missing.append(os.path.basename(path))
+                continue
+            self.store.add(path, found['name'], preset_id=found['id'])
+        if missing:
+            messagebox.showwarning(
+                "Uyarı", "Alan ön ayarı bulunamadı:\n" + "\n".join(missing[:20])
+            )
+        self._refresh()
+
+    def retry_selected(self):
+        for item in self.tree.selection():
+            self.store.retry(int(item))
+        self._refresh()
+
+    def _refresh(self):
+        try:
+            jobs = self.store.list_jobs()
+            counts = self.store.status_counts()
+        except Exception as e:
+            print(f"İş listesi okunamadı: {e}")
+            jobs, counts = [], dict.fromkeys(STATUSES, 0)
+
+        selection = set(self.tree.selection())
+        existing = set(self.tree.get_children())
+        for job in jobs:
+            item = str(job['id'])
+            if job['frame_count']:
+                progress = f"%{100 * job['frames_done'] // job['frame_count']}"
+            else:
+                progress = str(job['frames_done']) if job['frames_done'] else '-'
+            values = (
+                job['id'],
+                os.path.basename(job['source_path']),
+                job['preset'],
+                STATUS_LABELS.get(job['status'], job['status']),
+                f"{job['attempts']}/{job['max_attempts']}",
+                progress,
+                job['video_record_id'] or '-',
+                (job['error'] or '').splitlines()[0] if job['error'] else '',
+            )
+            if item in existing:
+                self.tree.item(item, values=values)
+                existing.discard(item)
+            else:
+                self.tree.insert('', tk.END, iid=item, values=values)
+        for item in existing:
+            self.tree.delete(item)
+        # Yeni işler üstte
+        for index, job in enumerate(jobs):
+            self.tree.move(str(job['id']), '', index)
+        self.tree.selection_set([i for i in selection if self.tree.exists(i)])
+
+        running = "çalışıyor" if self.runner is not None else "durdu"
+        self.summary_label.configure(text=(
+            f"Sırada: {counts['queued']}   Çalışıyor: {counts['running']}   "
+            f"Bitti: {counts['done']}   Hata: {counts['failed']}   ({running})"
+        ))
+        try:
+            self.parent_frame.after(REFRESH_MS, self._refresh)
+        except tk.TclError:
+            pass
+
+    def cleanup(self):
+        self.stop()
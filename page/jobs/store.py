@@ -0,0 +1,213 @@
+import os
+import sqlite3
+
+# İş durumları
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+STATUSES = (QUEUED, RUNNING, DONE, FAILED)
+
+# Bir işin hata ile kuyruğa geri dönebileceği toplam deneme sayısı
+MAX_ATTEMPTS = 3
+
+# list_jobs / get ile dönen alanlar
+JOB_FIELDS = ('id', 'source_path', 'preset', 'preset_id', 'name', 'status', 'attempts',
+              'max_attempts', 'frames_done', 'frame_count', 'video_record_id', 'error',
+              'created_at')
+
+
+class JobStore:
+    """SQLite'ta tutulan analiz iş kuyruğu.
+
+    Her iş bir video dosyası + isimli alan ön ayarıdır. Durumlar:
+    queued → running → done / failed. Hata alan iş `max_attempts` dolana
+    kadar tekrar kuyruğa girer. Aynı dosya (yol, boyut, mtime) ikinci kez
+    eklenmez; böylece klasör izleyici yeniden başladığında iş tekrarlanmaz.
+
+    Metotlar her çağrıda kendi bağlantısını açar; farklı thread'lerden
+    güvenle çağrılabilir. İş alma (claim) `BEGIN IMMEDIATE` ile yapılır,
+    aynı işi iki worker alamaz.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    preset TEXT NOT NULL,
+                    preset_id INTEGER,
+                    name TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    frames_done INTEGER NOT NULL DEFAULT 0,
+                    frame_count INTEGER NOT NULL DEFAULT 0,
+                    video_record_id INTEGER,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    UNIQUE (source_path, size, mtime_ns),
+                    FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_status
+                ON jobs (status, id)
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def add(self, source_path, preset, name=None, max_attempts=MAX_ATTEMPTS, preset_id=None):
+        """Dosyayı kuyruğa ekle; zaten ekliyse None döndür.
+
+        preset_id verilirse worker alanları bu kararlı id ile yükler
+        (ön ayarın adı sonradan değişse de iş etkilenmez).
+        """
+        stat = os.stat(source_path)
+        if name is None:
+            name = os.path.splitext(os.path.basename(source_path))[0]
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute('''
+                    INSERT OR IGNORE INTO jobs (
+                        source_path, size, mtime_ns, preset, preset_id, name, max_attempts
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns,
+                      preset, preset_id, name, max_attempts))
+            return cursor.lastrowid if cursor.rowcount else None
+        finally:
+            conn.close()
+
+    def claim(self):
+        """Sıradaki kuyruktaki işi 'running' yapıp döndür (yoksa None)"""
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute('''
+                SELECT id, source_path, preset, preset_id, name, attempts
+                FROM jobs WHERE status = ?
+                ORDER BY id LIMIT 1
+            ''', (QUEUED,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute('''
+                UPDATE jobs
+                SET status = ?, attempts = attempts + 1, frames_done = 0,
+                    error = NULL, started_at = CURRENT_TIMESTAMP, finished_at = NULL
+                WHERE id = ?
+            ''', (RUNNING, row[0]))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        job_id, source_path, preset, preset_id, name, attempts = row
+        return {
+            'id': job_id, 'source_path': source_path, 'preset': preset,
+            'preset_id': preset_id, 'name': name, 'attempts': attempts + 1,
+        }
+
+    def _execute(self, sql, params):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def set_progress(self, job_id, frames_done, frame_count):
+        self._execute('''
+            UPDATE jobs SET frames_done = ?, frame_count = ? WHERE id = ?
+        ''', (frames_done, frame_count, job_id))
+
+    def finish(self, job_id, video_record_id):
+        self._execute('''
+            UPDATE jobs
+            SET status = ?, video_record_id = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (DONE, video_record_id, job_id))
+
+    def fail(self, job_id, error):
+        """Hata: deneme hakkı varsa kuyruğa geri koy, yoksa 'failed'"""
+        self._execute('''
+            UPDATE jobs
+            SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END,
+                error = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (QUEUED, FAILED, str(error), job_id))
+
+    def release(self, job_id):
+        """Yarıda kesilen işi (uygulama kapanırken) denemesini saymadan geri koy"""
+        self._execute('''
+            UPDATE jobs
+            SET status = ?, attempts = MAX(0, attempts - 1), started_at = NULL
+            WHERE id = ? AND status = ?
+        ''', (QUEUED, job_id, RUNNING))
+
+    def retry(self, job_id):
+        """Başarısız işi deneme sayacını sıfırlayarak yeniden kuyruğa al"""
+        self._execute('''
+            UPDATE jobs SET status = ?, attempts = 0, error = NULL
+            WHERE id = ? AND status = ?
+        ''', (QUEUED, job_id, FAILED))
+
+    def requeue_interrupted(self):
+        """Uygulama çökerken 'running' kalmış işleri kuyruğa geri koy"""
+        self._execute('''
+            UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?
+        ''', (QUEUED, RUNNING))
+
+    def list_jobs(self, limit=200):
+        """Son işler (yeniden eskiye)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT {', '.join(JOB_FIELDS)}
+                FROM jobs ORDER BY id DESC LIMIT ?
+            ''', (limit,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(JOB_FIELDS, row)) for row in rows]
+
+    def get(self, job_id):
+        """Tek iş (yoksa None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(f'''
+                SELECT {', '.join(JOB_FIELDS)}
+                FROM jobs WHERE id = ?
+            ''', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return dict(zip(JOB_FIELDS, row))
+
+    def status_counts(self):
+        """{durum: iş sayısı}"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        finally:
+            conn.close()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
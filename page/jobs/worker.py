@@ -0,0 +1,213 @@
+import os
+import threading
+
+from page.files_container.metadata import VIDEO_EXTENSIONS
+from page.main_container.presets import camera_key, get_zone_preset
+
+INBOX_DIR = os.path.join("dosyalar", "inbox")
+# Ön ayar yerine bu seçilirse her video kendi kamerasının ön ayarıyla kuyruğa girer
+CAMERA_PRESET = "(kameraya göre)"
+# Klasör izleme aralığı (saniye); dosya iki tarama boyunca değişmezse kuyruğa girer
+POLL_INTERVAL_S = 5.0
+# Boş kuyrukta worker'ların yeni iş için bekleme süresi
+IDLE_WAIT_S = 2.0
+
+
+def resolve_preset(db_path, preset, path):
+    """İş için ön ayar: isimle veya CAMERA_PRESET ise videonun kamerasına göre"""
+    if preset == CAMERA_PRESET:
+        return get_zone_preset(db_path, camera=camera_key(path))
+    return get_zone_preset(db_path, name=preset)
+
+
+class InboxWatcher:
+    """Gelen kutusu klasörünü mtime/boyut taramasıyla izler (inotify gerekmez).
+
+    Kopyalanmakta olan dosya iş olmasın diye, boyutu ve mtime'ı iki ardışık
+    taramada aynı kalan video kuyruğa eklenir. Aynı dosya JobStore'da
+    tekilleştirildiği için yeniden başlatmada tekrar eklenmez. İş, ön ayarın
+    kararlı id'siyle eklenir; CAMERA_PRESET seçiliyse ön ayar videonun
+    kamerasına (klasörüne) göre bulunur.
+    """
+
+    def __init__(self, store, inbox_dir, preset, interval=POLL_INTERVAL_S, on_added=None):
+        self.store = store
+        self.inbox_dir = inbox_dir
+        self.preset = preset
+        self.interval = interval
+        self.on_added = on_added
+        self._seen = {}  # yol -> (boyut, mtime_ns)
+        self._warned = set()  # ön ayarı bulunamayan kameralar
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        os.makedirs(self.inbox_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.scan()
+            except OSError as e:
+                print(f"Gelen kutusu taranamadı: {e}")
+            self._stop.wait(self.interval)
+
+    def scan(self):
+        """Klasörü bir kez tara; eklenen iş sayısını döndür"""
+        current = {}
+        with os.scandir(self.inbox_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                    continue
+                stat = entry.stat()
+                current[entry.path] = (stat.st_size, stat.st_mtime_ns)
+
+        added = 0
+        for path, signature in current.items():
+            if self._seen.get(path) != signature:
+                continue  # Yeni veya hâlâ yazılıyor; bir sonraki taramada bakılır
+            preset = resolve_preset(self.store.db_path, self.preset, path)
+            if preset is None:
+                camera = camera_key(path)
+                if camera not in self._warned:
+                    self._warned.add(camera)
+                    if camera is None:
+                        print(f"Video paylaşılan bir klasörde, kamerası belirsiz; atlanıyor: {path}")
+                    else:
+                        print(f"Alan ön ayarı bulunamadı, atlanıyor: {path}")
+                continue
+            try:
+                job_id = self.store.add(path, preset['name'], preset_id=preset['id'])
+            except OSError:
+                continue
+            if job_id is not None:
+                added += 1
+                if self.on_added:
+                    self.on_added(job_id, path)
+        self._seen = current
+        return added
+
+
+class JobRunner:
+    """Kuyruktaki işleri `workers` thread'de çalıştırır.
+
+    Her iş için model yeniden yüklenir (tracker durumu videolar arasında
+    taşınmasın). Sonuç `video_records` / `transition_counts` tablolarına
+    yazılır ve iş kaydına bağlanır; ilerleme jobs tablosuna yazılır.
+    """
+
+    def __init__(self, store, workers=1, model_path=None):
+        self.store = store
+        self.workers = max(1, int(workers))
+        self.model_path = model_path
+        self._stop = threading.Event()
+        self._threads = []
+        self._active = {}  # thread adı -> (job_id, analyzer)
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.store.requeue_interrupted()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Worker'ları durdur; yarıda kalan işler kuyruğa geri döner"""
+        self._stop.set()
+        with self._lock:
+            for _, analyzer in self._active.values():
+                if analyzer is not None:
+                    analyzer.stop()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads = []
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _run(self):
+        name = threading.current_thread().name
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim()
+            except Exception as e:
+                print(f"İş alınamadı: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(IDLE_WAIT_S)
+                continue
+            try:
+                completed, record_id = self._process(name, job)
+            except Exception as e:
+                print(f"İş {job['id']} başarısız: {e}")
+                self.store.fail(job['id'], e)
+            else:
+                if completed:
+                    self.store.finish(job['id'], record_id)
+                else:
+                    self.store.release(job['id'])
+            finally:
+                with self._lock:
+                    self._active.pop(name, None)
+
+    def _process(self, name, job):
+        """Bir işi analiz et: (tamamlandı mı, kayıt ID'si / geçiş yoksa None)"""
+        import cv2
+        from page.main_container.analyzer import HeadlessAnalyzer, load_model
+        from page.main_container.save import VideoRecorder
+        from page.settings.main import SettingsContainer
+        from page.video_container.sources import open_source
+
+        settings = SettingsContainer.get_capture_settings()
+        source = open_source(job['source_path'], backend=settings['backend'],
+                             scale_width=settings['scale_width'], threads=settings['threads'])
+        try:
+            if not source.isOpened():
+                raise IOError(f"Video açılamadı: {job['source_path']}")
+            frame_count = int(source.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+            frame_size = (int(source.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                          int(source.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+            # Kararlı id öncelikli; derlenmiş maske önbellekten gelir
+            preset = get_zone_preset(self.store.db_path, preset_id=job['preset_id'],
+                                     frame_size=frame_size) if job['preset_id'] else None
+            if preset is None:
+                preset = get_zone_preset(self.store.db_path, name=job['preset'],
+                                         frame_size=frame_size)
+            if preset is None or not preset['area_list']:
+                raise ValueError(f"Alan ön ayarı bulunamadı: {job['preset']}")
+
+            analyzer = HeadlessAnalyzer(
+                source, load_model(self.model_path), preset['area_list'],
+                progress_callback=lambda done, _: self.store.set_progress(
+                    job['id'], done, frame_count),
+                compiled=preset['compiled']
+            )
+            with self._lock:
+                self._active[name] = (job['id'], analyzer)
+            if self._stop.is_set():
+                return False, None
+            frames = analyzer.run()
+        finally:
+            source.release()
+
+        if self._stop.is_set():
+            return False, None  # Yarıda kesildi; sonuç yazılmaz
+        self.store.set_progress(job['id'], frames, frame_count or frames)
+        counter = analyzer.counter
+        return True, VideoRecorder().save_transition_counts_only(
+            job['name'], counter.transition_counts, counter.bucket_counts,
+            counter.class_counts(), crossing_counts=counter.crossing_counts()
+        )
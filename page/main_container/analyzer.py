@@ -0,0 +1,501 @@
+"""Arayüzden bağımsız analiz çekirdeği ve komut satırı (headless) çalıştırıcı.
+
+Örnek:
+    python -m page.main_container.analyzer video.mp4 --zones alanlar.json --name "Kavşak 1"
+    python -m page.main_container.analyzer video.mp4 --zones alanlar.json --workers 4
+    python -m page.main_container.analyzer kareler/ --zones alanlar.json --fps 25
+    ffmpeg ... -f rawvideo -pix_fmt bgr24 - | \\
+        python -m page.main_container.analyzer - --width 1920 --height 1080 --zones alanlar.json
+
+alanlar.json: [{"name": "A", "points": [[x1, y1], [x2, y2], ...]}, ...]
+    Sayım çizgisi: {"name": "L1", "type": "line", "points": [[x1, y1], [x2, y2]]}
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .save import BUCKET_MS
+from .zones import AREA_LINE, is_line, line_segments, segment_crossings
+
+# Tespit eşikleri (arayüzle aynı)
+TRACK_CONF = 0.3
+MIN_CONFIDENCE = 0.5
+DEFAULT_CLASSES = ("Araba", "Kamyon", "Otobus")
+# Çizgi geçiş yönleri (crossings dizisinin ikinci ekseni bu sırada)
+CROSSING_DIRECTIONS = (1, -1)
+
+
+def point_in_polygon(point, polygon):
+    """Ray casting algoritması ile nokta polygon içinde mi kontrol et"""
+    x, y = point
+    n = len(polygon)
+    inside = False
+    p1x, p1y = polygon[0]
+    for i in range(n+1):
+        p2x, p2y = polygon[i % n]
+        if y > min(p1y, p2y):
+            if y <= max(p1y, p2y):
+                if x <= max(p1x, p2x):
+                    if p1y != p2y:
+                        xinters = (y-p1y)*(p2x-p1x)/(p2y-p1y)+p1x
+                    if p1x == p2x or x <= xinters:
+                        inside = not inside
+        p1x, p1y = p2x, p2y
+    return inside
+
+
+def iter_tracks(model, frame, allowed_classes):
+    """model.track sonuçlarından (id, (x1, y1, x2, y2), conf, sınıf) üret.
+
+    Track ID'si olmayan, izin verilmeyen sınıftaki veya güveni düşük kutular atlanır.
+    """
+    results = model.track(
+        frame,
+        conf=TRACK_CONF,
+        tracker="bytetrack.yaml",
+        persist=True,
+        verbose=False
+    )
+    for result in results:
+        boxes = result.boxes
+        if boxes is None:
+            continue
+        for box in boxes:
+            if box.id is None:
+                continue
+            class_name = model.names[int(box.cls[0].cpu().numpy())]
+            confidence = float(box.conf[0].cpu().numpy())
+            if class_name not in allowed_classes or confidence < MIN_CONFIDENCE:
+                continue
+            object_id = int(box.id[0].cpu().numpy())
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
+            yield object_id, (int(x1), int(y1), int(x2), int(y2)), confidence, class_name
+
+
+class TransitionCounter:
+    """Alanlar arası geçiş sayımı (nesnenin son alanı + rota ve zaman kovası sayaçları).
+
+    Sayım çizgileri ('type': 'line') ayrı sayılır: track'in son hareket
+    parçası çizgiyi kestiğinde çizgi ve yön (+1 / -1, bkz. segment_crossings)
+    için sayaç artar; nesnenin son alanı değişmez, rota sayımları yalnızca
+    polygon alanlar arasındadır. Böylece hızlı araçlar veya frame atlama ile
+    dar bir polygon hiç örneklenmese de çizgi geçişi kaçmaz.
+
+    Sayımlar `counts[from_id, to_id, sınıf]` dizisinde tutulur; indeksler
+    alanların kararlı `id`'leridir, son sınıf sütunu bilinmeyen sınıf
+    içindir. Çizgi geçişleri aynı şekilde `crossings[çizgi_id, yön, sınıf]`
+    dizisindedir (yön indeksi 0: +1, 1: -1). Artış O(1), snapshot tek dizi
+    kopyasıdır. Silinen bir alanın satır/sütunu sıfırlanır (aynı id yeniden
+    kullanılırsa sayım taşınmaz).
+    """
+
+    def __init__(self, area_list=None, bucket_ms=BUCKET_MS, compiled=None,
+                 classes=DEFAULT_CLASSES):
+        self.classes = tuple(classes)
+        self._class_index = {name: i for i, name in enumerate(self.classes)}
+        self.counts = np.zeros((1, 1, len(self.classes) + 1), np.int64)
+        self.crossings = np.zeros((1, len(CROSSING_DIRECTIONS), len(self.classes) + 1), np.int64)
+        self._zone_ids = {}  # alan adı -> id
+        self.area_list = area_list if area_list is not None else []
+        # Derlenmiş alanlar (etiket maskesi); area_list atanınca sıfırlanır,
+        # yerinde değişiklikten sonra compile() çağrılmalı
+        self.compiled = compiled
+        self.bucket_ms = bucket_ms
+        self.bucket_counts = {}  # {(bucket_start_ms, from, to): count}
+        self.last_area_per_object = {}
+        self.last_point_per_object = {}  # Çizgi kesişimi için son merkez noktası
+
+    @property
+    def area_list(self):
+        return self._area_list
+
+    @area_list.setter
+    def area_list(self, value):
+        # Yeni alan listesi: eski maske artık geçersiz
+        self._area_list = value
+        self.compiled = None
+        self._index_zones()
+
+    def _index_zones(self):
+        """Alan adı → id eşlemesini kur, sayım dizisini id'lere göre boyutlandır"""
+        # Aynı isimde iki alan varsa area_of gibi listedeki ilki kazanır
+        self._zone_ids = {a['name']: a['id'] for a in reversed(self.area_list)}
+        size = max((a['id'] for a in self.area_list), default=0) + 1
+        grow = size - self.counts.shape[0]
+        if grow > 0:
+            self.counts = np.pad(self.counts, ((0, grow), (0, grow), (0, 0)))
+        grow = size - self.crossings.shape[0]
+        if grow > 0:
+            self.crossings = np.pad(self.crossings, ((0, grow), (0, 0), (0, 0)))
+        dead = np.ones(self.counts.shape[0], bool)
+        dead[[a['id'] for a in self.area_list]] = False
+        self.counts[dead] = 0
+        self.counts[:, dead] = 0
+        self.crossings[dead[:self.crossings.shape[0]]] = 0
+
+    def _zone_names(self):
+        return {a['id']: a['name'] for a in self.area_list}
+
+    @property
+    def transition_counts(self):
+        """{(from, to): sayı} — sıfır olmayan rotalar, sınıflar toplanmış"""
+        names = self._zone_names()
+        totals = self.counts.sum(axis=2)
+        counts = {}
+        for from_id, to_id in zip(*np.nonzero(totals)):
+            key = (names[from_id], names[to_id])
+            counts[key] = counts.get(key, 0) + int(totals[from_id, to_id])
+        return counts
+
+    def class_counts(self):
+        """{(from, to, sınıf): sayı} — sınıfı bilinmeyenler için sınıf None"""
+        names = self._zone_names()
+        labels = self.classes + (None,)
+        counts = {}
+        for from_id, to_id, class_index in zip(*np.nonzero(self.counts)):
+            key = (names[from_id], names[to_id], labels[class_index])
+            counts[key] = counts.get(key, 0) + int(self.counts[from_id, to_id, class_index])
+        return counts
+
+    def crossing_counts(self):
+        """{(çizgi, yön, sınıf): sayı} — yön +1 / -1, sınıfı bilinmeyende sınıf None"""
+        names = self._zone_names()
+        labels = self.classes + (None,)
+        counts = {}
+        for line_id, direction_index, class_index in zip(*np.nonzero(self.crossings)):
+            key = (names[line_id], CROSSING_DIRECTIONS[direction_index], labels[class_index])
+            counts[key] = counts.get(key, 0) + int(
+                self.crossings[line_id, direction_index, class_index])
+        return counts
+
+    @property
+    def crossing_totals(self):
+        """{(çizgi, yön): sayı} — sınıflar toplanmış"""
+        totals = {}
+        for (line, direction, _), count in self.crossing_counts().items():
+            totals[(line, direction)] = totals.get((line, direction), 0) + count
+        return totals
+
+    def area_of(self, point):
+        """Noktanın içinde olduğu ilk alanın adı (yoksa None)"""
+        if self.compiled is not None:
+            return self.compiled.lookup(point)
+        for area in self.area_list:
+            if not is_line(area) and point_in_polygon(point, area['points']):
+                return area['name']
+        return None
+
+    def locate_frame(self, observations):
+        """Bir frame'deki tüm gözlemlerin ziyaret ettiği alanlar (sayım yapmaz).
+
+        observations: [(object_id, (x, y)), ...]
+        Her gözlem için (kesilen çizgiler [(çizgi, yön), ...], içinde
+        bulunduğu alan veya None) döner. Çizgi kesişimleri tüm track'ler için
+        tek vektörel işlemle bulunur; son noktalar güncellenir.
+        """
+        if self.compiled is not None:
+            names, segments = self.compiled.line_names, self.compiled.lines
+        else:
+            names, segments = line_segments(self.area_list)
+
+        crossed = [[] for _ in observations]
+        if len(segments):
+            moving = [i for i, (object_id, _) in enumerate(observations)
+                      if object_id in self.last_point_per_object]
+            track_index, line_index, _, directions = segment_crossings(
+                [self.last_point_per_object[observations[i][0]] for i in moving],
+                [observations[i][1] for i in moving],
+                segments
+            )
+            for i, j, direction in zip(track_index, line_index, directions):
+                crossed[moving[i]].append((names[j], int(direction)))
+
+        visited = []
+        for i, (object_id, point) in enumerate(observations):
+            visited.append((crossed[i], self.area_of(point)))
+            self.last_point_per_object[object_id] = (int(point[0]), int(point[1]))
+        return visited
+
+    def update_frame(self, observations, timestamp_ms):
+        """Bir frame'in gözlemlerini işle; (geçişler, çizgi geçişleri) döndür
+
+        observations: [(object_id, (x, y), sınıf), ...]
+        """
+        visited = self.locate_frame([(object_id, point) for object_id, point, _ in observations])
+        return self.count_visits(observations, visited, timestamp_ms)
+
+    def count_visits(self, observations, visited, timestamp_ms):
+        """locate_frame sonucunu say (sonucu başka amaçla da kullanan çağıranlar için).
+
+        Returns:
+            ([(object_id, (from, to)), ...], [(object_id, (çizgi, yön)), ...])
+        """
+        transitions, crossings = [], []
+        for (object_id, _, class_name), (crossed, area) in zip(observations, visited):
+            for line, direction in crossed:
+                if self.count_crossing(line, direction, class_name):
+                    crossings.append((object_id, (line, direction)))
+            transition = self.update_area(object_id, area, timestamp_ms, class_name)
+            if transition is not None:
+                transitions.append((object_id, transition))
+        return transitions, crossings
+
+    def count_crossing(self, line, direction, class_name=None):
+        """Bir çizgi geçişini say; çizgi artık yoksa False"""
+        if line not in self._zone_ids:
+            self._index_zones()
+        line_id = self._zone_ids.get(line)
+        if line_id is None:
+            return False
+        class_index = self._class_index.get(class_name, len(self.classes))
+        self.crossings[line_id, CROSSING_DIRECTIONS.index(direction), class_index] += 1
+        return True
+
+    def update_area(self, object_id, current_area, timestamp_ms, class_name=None):
+        """Alanı önceden bulunmuş bir gözlemi işle; geçiş olduysa (from, to) döndür.
+
+        Alanlardan biri artık yoksa (silinmiş) geçiş hiçbir yerde sayılmaz:
+        toplamlar, zaman kovaları ve döndürülen olay birlikte atlanır.
+        """
+        prev_area = self.last_area_per_object.get(object_id)
+        transition = None
+        if prev_area is not None and current_area is not None and prev_area != current_area:
+            if prev_area not in self._zone_ids or current_area not in self._zone_ids:
+                # Alan yerinde yeniden adlandırılmış olabilir
+                self._index_zones()
+            from_id = self._zone_ids.get(prev_area)
+            to_id = self._zone_ids.get(current_area)
+            if from_id is not None and to_id is not None:
+                transition = (prev_area, current_area)
+                class_index = self._class_index.get(class_name, len(self.classes))
+                self.counts[from_id, to_id, class_index] += 1
+
+                # Video zamanına göre sabit aralıklı kovaya ekle
+                bucket_start = int(timestamp_ms // self.bucket_ms) * self.bucket_ms
+                bucket_key = (bucket_start, prev_area, current_area)
+                self.bucket_counts[bucket_key] = self.bucket_counts.get(bucket_key, 0) + 1
+
+        if current_area is not None:
+            self.last_area_per_object[object_id] = current_area
+        return transition
+
+    def compile(self, frame_width, frame_height):
+        """Alanları verilen frame boyutu için maskeye derle (alan yoksa kapat)"""
+        from .zones import CompiledZones
+
+        self._index_zones()
+        if self.area_list and frame_width > 0 and frame_height > 0:
+            self.compiled = CompiledZones(self.area_list, frame_width, frame_height)
+        else:
+            self.compiled = None
+
+    def snapshot(self):
+        """Kontrol noktası için sayaçların sığ kopyası (ucuz; JSON'a çevrilmez)"""
+        return {
+            'counts': self.counts.copy(),
+            'crossings': self.crossings.copy(),
+            'bucket_counts': dict(self.bucket_counts),
+            'last_area_per_object': dict(self.last_area_per_object),
+            'last_point_per_object': dict(self.last_point_per_object),
+        }
+
+    def restore(self, state):
+        """snapshot() ile alınmış durumu geri yükle"""
+        self.counts = np.array(state['counts'], np.int64)
+        self.crossings = np.array(state['crossings'], np.int64)
+        self._index_zones()
+        self.bucket_counts = dict(state['bucket_counts'])
+        self.last_area_per_object = dict(state['last_area_per_object'])
+        self.last_point_per_object = dict(state['last_point_per_object'])
+
+    def reset(self):
+        self.counts[:] = 0
+        self.crossings[:] = 0
+        self.bucket_counts = {}
+        self.last_area_per_object = {}
+        self.last_point_per_object = {}
+
+
+def resolve_model_path(model_path=None):
+    """Model dosyasının yolu (verilmezse Ayarlar'daki aktif model)"""
+    if model_path is None:
+        from page.settings.main import SettingsContainer
+        model_name = SettingsContainer.get_active_model()
+        if not model_name:
+            raise RuntimeError("Aktif model yok (Ayarlar > Model Seçimi)")
+        model_path = os.path.join("dosyalar", model_name)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model dosyası bulunamadı: {model_path}")
+    return model_path
+
+
+def load_model(model_path=None):
+    """YOLO modelini yükle (yol verilmezse Ayarlar'daki aktif model)"""
+    from ultralytics import YOLO
+
+    return YOLO(resolve_model_path(model_path))
+
+
+class HeadlessAnalyzer:
+    """Bir FrameSource'u arayüz olmadan baştan sona analiz eder"""
+
+    def __init__(self, source, model, area_list, allowed_classes=DEFAULT_CLASSES,
+                 progress_callback=None, compiled=None, stride=1):
+        self.source = source
+        self.model = model
+        self.counter = TransitionCounter(area_list, compiled=compiled)
+        self.allowed_classes = set(allowed_classes)
+        self.progress_callback = progress_callback
+        # Her `stride` frame'den biri analiz edilir (çizgi geçişleri yine sayılır)
+        self.stride = max(1, int(stride))
+        self.frames = 0
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        """Kaynağı sonuna kadar işle; işlenen frame sayısını döndür"""
+        from page.video_container.reader import PrefetchReader
+
+        reader = PrefetchReader(self.source).start()
+        try:
+            while not self._stop:
+                ret, frame = reader.read()
+                if not ret:
+                    break
+                if reader.frame_index % self.stride == 0:
+                    observations = [
+                        (object_id, ((x1 + x2) // 2, (y1 + y2) // 2), class_name)
+                        for object_id, (x1, y1, x2, y2), _, class_name in iter_tracks(
+                            self.model, frame, self.allowed_classes)
+                    ]
+                    self.counter.update_frame(observations, reader.timestamp_ms)
+                self.frames += 1
+                if self.progress_callback and self.frames % 100 == 0:
+                    self.progress_callback(self.frames, reader.frame_index)
+        finally:
+            reader.stop()
+        return self.frames
+
+
+def parse_zones(zones):
+    """[{"name", "points", "type"?}] listesini alan listesine çevir (id'ler sırayla)"""
+    area_list = []
+    for i, zone in enumerate(zones):
+        area = {'id': i + 1, 'name': str(zone['name']),
+                'points': [(int(p[0]), int(p[1])) for p in zone['points']]}
+        if zone.get('type') == AREA_LINE:
+            if len(area['points']) != 2:
+                raise ValueError(f"Sayım çizgisi iki noktalı olmalı: {area['name']}")
+            area['type'] = AREA_LINE
+        area_list.append(area)
+    return area_list
+
+
+def load_zones(path):
+    """Alan tanımlarını JSON dosyasından oku"""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_zones(json.load(f))
+
+
+def main(argv=None):
+    from page.video_container.sources import open_source
+
+    parser = argparse.ArgumentParser(description="Arayüzsüz geçiş sayımı")
+    parser.add_argument("source", help="Video dosyası, kare klasörü, FIFO veya '-' (stdin)")
+    parser.add_argument("--zones", required=True, help="Alan tanımları (JSON)")
+    parser.add_argument("--name", help="Kayıt ismi (verilmezse veritabanına yazılmaz)")
+    parser.add_argument("--model", help="Model dosyası (.pt); varsayılan aktif model")
+    parser.add_argument("--width", type=int, help="Ham pipe frame genişliği")
+    parser.add_argument("--height", type=int, help="Ham pipe frame yüksekliği")
+    parser.add_argument("--fps", type=float, help="Kare klasörü / pipe için FPS")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Video dosyasını bu kadar süreçte parçalayarak analiz et")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="Her N frame'den birini analiz et (sayım çizgileriyle güvenli)")
+    args = parser.parse_args(argv)
+
+    if args.workers > 1 and os.path.isfile(args.source):
+        result = _main_parallel(args)
+        if result is not None:
+            return result
+
+    source = open_source(args.source, width=args.width, height=args.height, fps=args.fps)
+    if not source.isOpened():
+        print(f"Kaynak açılamadı: {args.source}", file=sys.stderr)
+        return 1
+
+    started = time.time()
+    analyzer = HeadlessAnalyzer(
+        source, load_model(args.model), load_zones(args.zones),
+        progress_callback=lambda done, _: print(f"{done} frame işlendi", file=sys.stderr),
+        stride=args.stride
+    )
+    try:
+        frames = analyzer.run()
+    finally:
+        source.release()
+
+    _report(args, analyzer.counter, frames, started)
+    return 0
+
+
+def _main_parallel(args):
+    """Paralel analiz; video bölünemiyorsa None (çağıran sıralı analize döner)"""
+    from .parallel import analyze_parallel, probe_video
+
+    try:
+        probe_video(args.source)
+    except ValueError as e:
+        print(f"{e}; sıralı analiz yapılıyor", file=sys.stderr)
+        return None
+
+    started = time.time()
+    counter, frames = analyze_parallel(
+        args.source, load_zones(args.zones), model_path=resolve_model_path(args.model),
+        workers=args.workers, stride=args.stride,
+        progress_callback=lambda done, total: print(f"{done}/{total} parça bitti",
+                                                    file=sys.stderr)
+    )
+    _report(args, counter, frames, started)
+    return 0
+
+
+def _report(args, counter, frames, started):
+    """Sonucu JSON olarak yazdır; isim verildiyse veritabanına kaydet"""
+    from .save import VideoRecorder
+
+    counts = counter.transition_counts
+    class_counts = counter.class_counts()
+    by_class = {}
+    for (f, t, class_name), c in class_counts.items():
+        by_class.setdefault((f, t), {})[class_name or "?"] = c
+    print(json.dumps({
+        "frames": frames,
+        "seconds": round(time.time() - started, 1),
+        "transitions": [
+            {"from": f, "to": t, "count": c, "classes": by_class.get((f, t), {})}
+            for (f, t), c in sorted(counts.items())
+        ],
+        "crossings": [
+            {"line": line, "direction": direction, "count": c}
+            for (line, direction), c in sorted(counter.crossing_totals.items())
+        ],
+    }, ensure_ascii=False, indent=2))
+
+    crossing_counts = counter.crossing_counts()
+    if args.name and (counts or crossing_counts):
+        record_id = VideoRecorder().save_transition_counts_only(
+            args.name, counts, counter.bucket_counts, class_counts,
+            crossing_counts=crossing_counts
+        )
+        print(f"Kayıt ID: {record_id}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
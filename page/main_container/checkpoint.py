@@ -0,0 +1,154 @@
+import json
+import sqlite3
+
+import numpy as np
+
+from .zones import area_from_dict, area_to_dict
+
+# Analiz sırasında iki kontrol noktası arasındaki süre (saniye)
+CHECKPOINT_INTERVAL_S = 5.0
+
+
+def ensure_checkpoint_table(conn):
+    """Kontrol noktası tablosunu oluştur (oturum başına tek satır)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_checkpoints (
+            session_id TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            frame_index INTEGER NOT NULL,
+            timestamp_ms REAL NOT NULL,
+            state TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def encode_state(counter_state, area_list):
+    """Sayaç durumu ve alanları JSON'a çevir (yazıcı thread'inde çağrılır).
+
+    Boyutu analiz süresiyle büyüyen veriler yazılmaz: zaman kovaları
+    oturumun geçiş olaylarından (session_bucket_counts), doluluk örnekleri
+    occupancy_samples tablosundan okunur.
+    """
+    counts = counter_state['counts']
+    crossings = counter_state['crossings']
+    return json.dumps({
+        # Seyrek: [from_id, to_id, sınıf indeksi, sayı]
+        'counts_shape': list(counts.shape),
+        'counts': [[*map(int, index), int(counts[index])] for index in zip(*np.nonzero(counts))],
+        # Seyrek: [çizgi_id, yön indeksi, sınıf indeksi, sayı]
+        'crossings_shape': list(crossings.shape),
+        'crossings': [[*map(int, index), int(crossings[index])]
+                      for index in zip(*np.nonzero(crossings))],
+        'last_area_per_object': {
+            str(object_id): area
+            for object_id, area in counter_state['last_area_per_object'].items()
+        },
+        'last_point_per_object': {
+            str(object_id): list(point)
+            for object_id, point in counter_state['last_point_per_object'].items()
+        },
+        'areas': [area_to_dict(a) for a in area_list],
+        # Alan koordinatlarının ait olduğu frame boyutu (devamda ölçek değiştiyse orantılanır)
+        'frame_size': counter_state.get('frame_size'),
+        # Doluluk çalışan durumu (OccupancyTracker.snapshot, zaten JSON uyumlu)
+        'occupancy': counter_state.get('occupancy'),
+    }, ensure_ascii=False)
+
+
+def decode_state(text):
+    """encode_state'in tersi: (sayaç durumu, alan listesi)"""
+    data = json.loads(text)
+    counts = np.zeros(data['counts_shape'], np.int64)
+    for from_id, to_id, class_index, count in data['counts']:
+        counts[from_id, to_id, class_index] = count
+    crossings = np.zeros(data['crossings_shape'], np.int64)
+    for line_id, direction_index, class_index, count in data['crossings']:
+        crossings[line_id, direction_index, class_index] = count
+    counter_state = {
+        'counts': counts,
+        'crossings': crossings,
+        'last_area_per_object': {
+            int(object_id): area for object_id, area in data['last_area_per_object'].items()
+        },
+        'last_point_per_object': {
+            int(object_id): tuple(point)
+            for object_id, point in data['last_point_per_object'].items()
+        },
+        'occupancy': data['occupancy'],
+        'frame_size': data['frame_size'],
+    }
+    area_list = [area_from_dict(a) for a in data['areas']]
+    return counter_state, area_list
+
+
+def write_checkpoint(conn, session_id, source, frame_index, timestamp_ms, state):
+    """Oturumun kontrol noktasını yaz (varsa üzerine)"""
+    conn.execute('''
+        INSERT INTO analysis_checkpoints (
+            session_id, source, frame_index, timestamp_ms, state, updated_at
+        ) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(session_id) DO UPDATE SET
+            source = excluded.source,
+            frame_index = excluded.frame_index,
+            timestamp_ms = excluded.timestamp_ms,
+            state = excluded.state,
+            updated_at = excluded.updated_at
+    ''', (session_id, source, frame_index, timestamp_ms, state))
+
+
+def write_occupancy_samples(conn, session_id, samples):
+    """Oturumun doluluk örneklerini ekle (kayıt kaydedilince bağlanır)"""
+    conn.executemany('''
+        INSERT INTO occupancy_samples (session_id, timestamp_ms, area, occupancy)
+        VALUES (?, ?, ?, ?)
+    ''', [(session_id, int(ts), area, value) for ts, area, value in samples])
+
+
+def session_bucket_counts(db_path, session_id, frame_index, bucket_ms):
+    """Oturumun frame_index'e kadarki geçiş olaylarından zaman kovalı sayımlar"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute('''
+            SELECT CAST(timestamp_ms / ? AS INTEGER) * ?, from_area, to_area, COUNT(*)
+            FROM transition_events
+            WHERE session_id = ? AND frame_index <= ?
+            GROUP BY 1, 2, 3
+        ''', (bucket_ms, bucket_ms, session_id, frame_index)).fetchall()
+    finally:
+        conn.close()
+    return {(bucket_start, from_area, to_area): count
+            for bucket_start, from_area, to_area, count in rows}
+
+
+def latest_checkpoint(db_path):
+    """En son güncellenen kontrol noktası (yoksa None).
+
+    Returns:
+        dict: session_id, source, frame_index, timestamp_ms, updated_at,
+              counter_state, area_list
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_checkpoint_table(conn)
+        row = conn.execute('''
+            SELECT session_id, source, frame_index, timestamp_ms, state, updated_at
+            FROM analysis_checkpoints
+            ORDER BY updated_at DESC
+            LIMIT 1
+        ''').fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    session_id, source, frame_index, timestamp_ms, state, updated_at = row
+    counter_state, area_list = decode_state(state)
+    return {
+        'session_id': session_id,
+        'source': source,
+        'frame_index': frame_index,
+        'timestamp_ms': timestamp_ms,
+        'updated_at': updated_at,
+        'counter_state': counter_state,
+        'area_list': area_list,
+    }
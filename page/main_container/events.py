@@ -0,0 +1,178 @@
+import sqlite3
+import threading
+import queue
+
+from .checkpoint import encode_state, write_checkpoint, write_occupancy_samples
+
+
+class TransitionEventWriter:
+    """Geçiş olaylarını arka planda toplu (batch) olarak veritabanına yazar.
+
+    Analiz döngüsü olayları sadece kuyruğa ekler, diske hiç beklemez.
+    Yazma işlemi ayrı bir thread'de; her `batch_size` olayda veya
+    `flush_interval_ms` sürede bir, tek transaction içinde `executemany`
+    ile yapılır.
+
+    Olaylar önce bir analiz oturumuna (`session_id`) bağlı yazılır; kayıt
+    kaydedildiğinde `link_session` ile ilgili `video_records` satırına bağlanır.
+
+    Aynı thread oturumun kontrol noktasını da yazar: analiz döngüsü sadece
+    sayaçların sığ kopyasını kuyruğa koyar, JSON'a çevirme ve yazma burada
+    yapılır. Kontrol noktası, kendisinden önce kuyruğa eklenen olaylardan
+    sonra yazılır; oturum kaydedilince veya silinince kaldırılır. Son kontrol
+    noktasından beri biriken doluluk örnekleri de aynı transaction'da
+    `occupancy_samples` tablosuna oturumla birlikte eklenir.
+    """
+
+    def __init__(self, db_path, batch_size=200, flush_interval_ms=500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """Yazıcı thread'ini başlat (zaten çalışıyorsa bir şey yapma)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add_event(self, session_id, frame_index, timestamp_ms, track_id,
+                  class_name, from_area, to_area):
+        """Tek bir geçiş olayını kuyruğa ekle (bloklamaz)"""
+        self._queue.put(('event', (
+            session_id, frame_index, timestamp_ms, track_id,
+            class_name, from_area, to_area
+        )))
+
+    def link_session(self, session_id, video_record_id):
+        """Oturumun olaylarını kaydedilen video kaydına bağla"""
+        self._queue.put(('link', session_id, video_record_id))
+
+    def discard_session(self, session_id):
+        """Kaydedilmeyen oturumun olaylarını sil"""
+        self._queue.put(('discard', session_id))
+
+    def save_checkpoint(self, session_id, source, frame_index, timestamp_ms,
+                        counter_state, area_list, occupancy_samples=()):
+        """Oturumun kontrol noktasını ve yeni doluluk örneklerini kuyruğa ekle (bloklamaz)"""
+        self._queue.put(('checkpoint', session_id, source, frame_index, timestamp_ms,
+                         counter_state, area_list, occupancy_samples))
+
+    def rewind_session(self, session_id, frame_index):
+        """Kontrol noktasından devam ederken sonrasında yazılmış olayları sil"""
+        self._queue.put(('rewind', session_id, frame_index))
+
+    def flush(self, timeout=5.0):
+        """Kuyruktaki her şey yazılana kadar bekle"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        done.wait(timeout)
+
+    def stop(self):
+        """Bekleyen olayları yaz ve thread'i durdur"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(('stop',))
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def _run(self):
+        """Yazıcı döngüsü"""
+        conn = sqlite3.connect(self.db_path)
+        batch = []
+        running = True
+        try:
+            while running:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    # Süre doldu - biriken olayları yaz
+                    self._write_batch(conn, batch)
+                    continue
+
+                kind = item[0]
+                if kind == 'event':
+                    batch.append(item[1])
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(conn, batch)
+                    continue
+
+                # Kontrol komutlarından önce sıra bozulmasın diye batch'i yaz
+                self._write_batch(conn, batch)
+
+                if kind == 'link':
+                    _, session_id, video_record_id = item
+                    self._execute(conn, '''
+                        UPDATE transition_events SET video_record_id = ?
+                        WHERE session_id = ?
+                    ''', (video_record_id, session_id))
+                    self._execute(conn, '''
+                        UPDATE occupancy_samples SET video_record_id = ?
+                        WHERE session_id = ?
+                    ''', (video_record_id, session_id))
+                    self._delete_checkpoint(conn, session_id)
+                elif kind == 'discard':
+                    self._execute(conn, '''
+                        DELETE FROM transition_events
+                        WHERE session_id = ? AND video_record_id IS NULL
+                    ''', (item[1],))
+                    self._execute(conn, '''
+                        DELETE FROM occupancy_samples
+                        WHERE session_id = ? AND video_record_id IS NULL
+                    ''', (item[1],))
+                    self._delete_checkpoint(conn, item[1])
+                elif kind == 'checkpoint':
+                    self._write_checkpoint(conn, *item[1:])
+                elif kind == 'rewind':
+                    self._execute(conn, '''
+                        DELETE FROM transition_events
+                        WHERE session_id = ? AND frame_index > ?
+                    ''', (item[1], item[2]))
+                elif kind == 'flush':
+                    item[1].set()
+                elif kind == 'stop':
+                    running = False
+        finally:
+            self._write_batch(conn, batch)
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        """Biriken olayları tek transaction içinde yaz"""
+        if not batch:
+            return
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO transition_events (
+                        session_id, frame_index, timestamp_ms, track_id,
+                        class_name, from_area, to_area
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', batch)
+        except sqlite3.Error as e:
+            print(f"Geçiş olayı yazma hatası: {e}")
+        batch.clear()
+
+    def _execute(self, conn, sql, params):
+        try:
+            with conn:
+                conn.execute(sql, params)
+        except sqlite3.Error as e:
+            print(f"Geçiş olayı güncelleme hatası: {e}")
+
+    def _write_checkpoint(self, conn, session_id, source, frame_index, timestamp_ms,
+                          counter_state, area_list, occupancy_samples):
+        try:
+            state = encode_state(counter_state, area_list)
+            with conn:
+                write_occupancy_samples(conn, session_id, occupancy_samples)
+                write_checkpoint(conn, session_id, source, frame_index, timestamp_ms, state)
+        except sqlite3.Error as e:
+            print(f"Kontrol noktası yazma hatası: {e}")
+
+    def _delete_checkpoint(self, conn, session_id):
+        self._execute(conn, '''
+            DELETE FROM analysis_checkpoints WHERE session_id = ?
+        ''', (session_id,))
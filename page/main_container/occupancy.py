@@ -0,0 +1,136 @@
+import numpy as np
+
+# Bekleme süresi histogramının kova sınırları (saniye); son kova üstü açık
+DWELL_BINS_S = (0, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+# Doluluk zaman serisinin örnekleme aralığı (video zamanı, ms)
+OCCUPANCY_SAMPLE_MS = 1000
+# Bu kadar süre görülmeyen track alandan çıkmış sayılır (son görüldüğü anda)
+TRACK_LOST_MS = 1500
+
+
+class OccupancyTracker:
+    """Alan doluluğu ve bekleme süreleri için artımlı sayaçlar.
+
+    Her frame'de alan sorgusunun sonucuyla (track → içinde olduğu polygon)
+    güncellenir: alandaki araç sayısı ve her track'in giriş zamanı tutulur.
+    Track alandan çıkınca (başka alana geçince, alan dışına çıkınca veya
+    TRACK_LOST_MS boyunca görülmeyince) bekleme süresi sabit kovalı
+    histograma eklenir. Doluluk her OCCUPANCY_SAMPLE_MS'de örneklenir ve
+    yalnızca değişen değerler saklanır (okurken ileri doldurulur). Uzun
+    analizlerde örnekler `take_samples` ile parça parça alınıp yazılır;
+    kontrol noktası yalnızca çalışan durumu (snapshot) içerir.
+    Video bittiğinde hâlâ alanda olan track'lerin süresi eksik olduğu için
+    histograma girmez.
+    """
+
+    def __init__(self, bins_s=DWELL_BINS_S, sample_ms=OCCUPANCY_SAMPLE_MS,
+                 lost_ms=TRACK_LOST_MS):
+        self.bins_s = tuple(bins_s)
+        self._edges_ms = np.array(self.bins_s, np.float64) * 1000.0
+        self.sample_ms = sample_ms
+        self.lost_ms = lost_ms
+        self.reset()
+
+    def reset(self):
+        self.dwell = {}  # alan -> kova sayıları (np.int64)
+        self.samples = []  # [(timestamp_ms, alan, doluluk)] - henüz alınmamış olanlar
+        self._sampled = {}  # alan -> son örneklenen doluluk
+        self._next_sample_ms = 0.0
+        self.clear_tracks()
+
+    def clear_tracks(self):
+        """Canlı durumu bırak (konum atlaması / devam); histogramlar korunur"""
+        self.occupancy = {}  # alan -> içerideki araç sayısı
+        self.entries = {}  # object_id -> (alan, giriş ms)
+        self.last_seen = {}  # object_id -> son görüldüğü ms (alandakiler)
+
+    def update(self, located, timestamp_ms):
+        """Bir frame'in alan sorgusu sonucunu işle.
+
+        located: [(object_id, alan adı veya None), ...]
+        """
+        for object_id, area in located:
+            entry = self.entries.get(object_id)
+            if entry is not None and entry[0] == area:
+                self.last_seen[object_id] = timestamp_ms
+                continue
+            if entry is not None:
+                self._exit(object_id, timestamp_ms)
+            if area is not None:
+                self.entries[object_id] = (area, timestamp_ms)
+                self.last_seen[object_id] = timestamp_ms
+                self.occupancy[area] = self.occupancy.get(area, 0) + 1
+
+        lost = [object_id for object_id, seen in self.last_seen.items()
+                if timestamp_ms - seen > self.lost_ms]
+        for object_id in lost:
+            self._exit(object_id, self.last_seen[object_id])
+
+        if timestamp_ms >= self._next_sample_ms:
+            self._sample(timestamp_ms)
+
+    def _exit(self, object_id, timestamp_ms):
+        area, entered_ms = self.entries.pop(object_id)
+        self.last_seen.pop(object_id, None)
+        self.occupancy[area] -= 1
+        dwell_ms = max(0.0, timestamp_ms - entered_ms)
+        index = max(0, int(np.searchsorted(self._edges_ms, dwell_ms, side='right')) - 1)
+        histogram = self.dwell.get(area)
+        if histogram is None:
+            histogram = self.dwell[area] = np.zeros(len(self.bins_s), np.int64)
+        histogram[index] += 1
+
+    def _sample(self, timestamp_ms):
+        sample_start = int(timestamp_ms // self.sample_ms) * self.sample_ms
+        for area in set(self.occupancy) | set(self._sampled):
+            value = self.occupancy.get(area, 0)
+            if self._sampled.get(area) != value:
+                self.samples.append((sample_start, area, value))
+                self._sampled[area] = value
+        self._next_sample_ms = sample_start + self.sample_ms
+
+    def take_samples(self):
+        """Biriken doluluk örneklerini döndür ve bırak (artımlı yazım için)"""
+        samples, self.samples = self.samples, []
+        return samples
+
+    def result(self):
+        """Kayda yazılacak özet: kova sınırları, histogramlar ve alınmamış doluluk örnekleri"""
+        return {
+            'bins_s': list(self.bins_s),
+            'dwell': {area: [int(c) for c in counts] for area, counts in self.dwell.items()},
+            'samples': list(self.samples),
+        }
+
+    def snapshot(self):
+        """Kontrol noktası için JSON'a yazılabilir çalışan durum.
+
+        Alandaki track'ler, son örneklenen değerler ve histogramlar; boyutu
+        video uzunluğundan bağımsızdır. Örnekler dahil değildir (take_samples).
+        """
+        return {
+            'bins_s': list(self.bins_s),
+            'dwell': {area: [int(c) for c in counts] for area, counts in self.dwell.items()},
+            'sampled': dict(self._sampled),
+            'next_sample_ms': self._next_sample_ms,
+            'entries': {str(object_id): [area, entered_ms]
+                        for object_id, (area, entered_ms) in self.entries.items()},
+            'last_seen': {str(object_id): seen for object_id, seen in self.last_seen.items()},
+        }
+
+    def restore(self, state):
+        """snapshot() ile alınmış durumu geri yükle.
+
+        Alandaki eski track'ler yeniden görülmezse TRACK_LOST_MS sonra son
+        görüldükleri anda çıkmış sayılır.
+        """
+        self.reset()
+        if not state or tuple(state['bins_s']) != self.bins_s:
+            return
+        self.dwell = {area: np.array(counts, np.int64) for area, counts in state['dwell'].items()}
+        self._sampled = dict(state['sampled'])
+        self._next_sample_ms = state['next_sample_ms']
+        for object_id, (area, entered_ms) in state['entries'].items():
+            self.entries[int(object_id)] = (area, entered_ms)
+            self.occupancy[area] = self.occupancy.get(area, 0) + 1
+        self.last_seen = {int(object_id): seen for object_id, seen in state['last_seen'].items()}
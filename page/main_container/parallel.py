@@ -0,0 +1,264 @@
+"""Tek bir uzun videonun bölünüp paralel analiz edilmesi (split-and-stitch).
+
+Video, örtüşen zaman parçalarına bölünür; her parça kendi modeli ve
+tracker'ı olan ayrı bir süreçte işlenir. Süreçler geçiş saymaz, her track
+için alan değişimlerini (frame, alan) ve örtüşme penceresindeki kutuları
+döndürür. Birleştirmede komşu parçaların track'leri örtüşmedeki kutuların
+IoU'suna göre eşlenir; her alan değişimi yalnızca o frame'in ait olduğu
+(çekirdek) parçadan alınır ve zincirin tamamı tek bir TransitionCounter'dan
+geçirilir. Böylece sınırı geçen bir aracın geçişi bir kez sayılır.
+
+Parça düzeni (N = overlap):
+
+    parça k:   [start_k - N, ..., start_k | çekirdek | end_k, ..., end_k + N)
+                 ısınma (tracker oturur)              eşleme penceresi
+
+Parça k'nın eşleme penceresi [end_k, end_k + N), parça k+1'in çekirdeğinin
+ilk N frame'idir; parça k+1'in tracker'ı bu frame'lere gelmeden N frame
+ısınmış olur.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .analyzer import (
+    DEFAULT_CLASSES, TransitionCounter, iter_tracks, load_model, resolve_model_path
+)
+
+# Parçalar arası örtüşme (saniye) ve eşleme eşikleri
+OVERLAP_SECONDS = 2.0
+MATCH_IOU = 0.5
+MIN_MATCH_FRAMES = 3
+
+
+def plan_segments(frame_count, workers, overlap):
+    """Videoyu çekirdek parçalara böl: [(core_start, core_end, read_start, read_end)]"""
+    workers = max(1, min(workers, frame_count // max(1, 4 * overlap) or 1))
+    bounds = [int(i * frame_count / workers) for i in range(workers + 1)]
+    return [
+        (start, end, max(0, start - overlap), min(frame_count, end + overlap))
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+def analyze_segment(video_path, model_path, area_list, segment, overlap,
+                    allowed_classes=DEFAULT_CLASSES, stride=1):
+    """Bir parçayı işle (ayrı süreçte çalışır).
+
+    stride > 1 ise yalnızca mutlak indeksi stride'ın katı olan frame'ler
+    analiz edilir; komşu parçalar aynı frame'leri gördüğü için eşleme bozulmaz.
+
+    Returns:
+        dict: {'segment': (...), 'tracks': {id: {'entries': [(frame, alan)],
+               'crossings': [(frame, çizgi, yön)], 'classes': {sınıf: frame sayısı},
+               'boxes': {frame: (x1, y1, x2, y2)}}}}
+               'boxes' yalnızca baş (start, start+N) ve son (end, end+N)
+               eşleme pencerelerindeki frame'leri içerir.
+    """
+    import cv2
+    from page.video_container.seek import FrameSeeker, load_keyframe_index
+
+    core_start, core_end, read_start, read_end = segment
+    stride = max(1, int(stride))
+    head_window = range(core_start, min(core_end, core_start + overlap)) if core_start else range(0)
+    tail_window = range(core_end, read_end)
+
+    model = load_model(model_path)
+    counter = TransitionCounter(area_list)
+    allowed_classes = set(allowed_classes)
+    tracks = {}
+
+    capture = cv2.VideoCapture(video_path)
+    try:
+        # Anahtar kare indeksiyle tam frame'e konumlan, sonra sırayla oku.
+        # Başlangıç stride'ın katına yuvarlanır; böylece her parça aynı
+        # mutlak frame'leri analiz eder
+        seeker = FrameSeeker(capture, load_keyframe_index(video_path), cache_size=1)
+        frame_index = read_start - read_start % stride
+        frame = seeker.seek(frame_index)
+        while frame is not None and frame_index < read_end:
+            detections = list(iter_tracks(model, frame, allowed_classes))
+            visited = counter.locate_frame([
+                (object_id, ((x1 + x2) // 2, (y1 + y2) // 2))
+                for object_id, (x1, y1, x2, y2), _, _ in detections
+            ])
+            for (object_id, box, _, class_name), (crossed, area) in zip(detections, visited):
+                track = tracks.setdefault(object_id, {'entries': [], 'crossings': [],
+                                                      'classes': {}, 'boxes': {}})
+                track['classes'][class_name] = track['classes'].get(class_name, 0) + 1
+                track['crossings'].extend((frame_index, line, direction)
+                                          for line, direction in crossed)
+                last = track['entries'][-1][1] if track['entries'] else None
+                if area is not None and area != last:
+                    track['entries'].append((frame_index, area))
+                if frame_index in head_window or frame_index in tail_window:
+                    track['boxes'][frame_index] = box
+            frame_index += 1
+            # Atlanan frame'ler çözülmeden geçilir
+            while frame_index % stride and frame_index < read_end:
+                if not capture.grab():
+                    break
+                frame_index += 1
+            ret, frame = capture.read()
+            if not ret:
+                frame = None
+    finally:
+        capture.release()
+    return {'segment': segment, 'tracks': tracks}
+
+
+def _iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if not inter:
+        return 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match_tracks(left, right, window):
+    """Örtüşme penceresinde komşu parçaların track'lerini eşle: {sol_id: sağ_id}
+
+    Skor, iki track'in de görüldüğü frame'lerdeki ortalama IoU'dur; eşleme
+    skora göre açgözlü yapılır (her track en fazla bir kez).
+    """
+    candidates = []
+    for left_id, left_track in left.items():
+        left_boxes = left_track['boxes']
+        if not left_boxes:
+            continue
+        for right_id, right_track in right.items():
+            shared = [f for f in window if f in left_boxes and f in right_track['boxes']]
+            if len(shared) < min(MIN_MATCH_FRAMES, len(window)):
+                continue
+            score = sum(_iou(left_boxes[f], right_track['boxes'][f]) for f in shared) / len(shared)
+            if score >= MATCH_IOU:
+                candidates.append((score, left_id, right_id))
+
+    matches, used_right = {}, set()
+    for score, left_id, right_id in sorted(candidates, reverse=True):
+        if left_id in matches or right_id in used_right:
+            continue
+        matches[left_id] = right_id
+        used_right.add(right_id)
+    return matches
+
+
+def stitch(results, area_list, fps):
+    """Parça sonuçlarını birleştirip tek sayımda topla.
+
+    Returns:
+        TransitionCounter: transition_counts / bucket_counts dolu sayaç
+    """
+    results = sorted(results, key=lambda r: r['segment'][0])
+    counter = TransitionCounter(area_list)
+
+    # Her parçanın track'ini bir sonraki parçadaki devamına bağla
+    successors = {}
+    has_predecessor = set()
+    for k in range(len(results) - 1):
+        core_end, read_end = results[k]['segment'][1], results[k]['segment'][3]
+        matches = match_tracks(results[k]['tracks'], results[k + 1]['tracks'],
+                               range(core_end, read_end))
+        for left_id, right_id in matches.items():
+            successors[(k, left_id)] = (k + 1, right_id)
+            has_predecessor.add((k + 1, right_id))
+
+    next_id = 0
+    for k, result in enumerate(results):
+        for track_id, track in result['tracks'].items():
+            if (k, track_id) in has_predecessor:
+                continue
+            # Zinciri baştan sona yürüt; her alan değişimi kendi çekirdek parçasından
+            entries = []
+            crossings = []
+            votes = Counter()
+            core_start = result['segment'][0]
+            seed = [e for e in track['entries'] if e[0] < core_start]
+            if seed:
+                # Öncülü olmayan track: ısınmada görülen son alan başlangıç durumu
+                entries.append(seed[-1])
+            node = (k, track_id)
+            while node is not None:
+                seg_k, seg_id = node
+                seg_start, seg_end = results[seg_k]['segment'][:2]
+                seg_track = results[seg_k]['tracks'][seg_id]
+                entries.extend(e for e in seg_track['entries'] if seg_start <= e[0] < seg_end)
+                crossings.extend(c for c in seg_track['crossings'] if seg_start <= c[0] < seg_end)
+                votes.update(seg_track['classes'])
+                node = successors.get(node)
+
+            # Sınıf, birleşik track'in en çok görüldüğü sınıftır (çoğunluk oyu)
+            class_name = votes.most_common(1)[0][0] if votes else None
+            object_id = next_id
+            next_id += 1
+            for frame_index, area in entries:
+                counter.update_area(object_id, area, frame_index * 1000.0 / fps, class_name)
+            for _, line, direction in crossings:
+                counter.count_crossing(line, direction, class_name)
+    return counter
+
+
+def probe_video(video_path):
+    """Paralel analiz için fps ve frame sayısını oku, anahtar kare indeksini hazırla.
+
+    Parçalar anahtar kare indeksiyle tam frame'e konumlanır; frame sayısı
+    bilinmiyorsa veya indeks yoksa (ör. ffprobe kurulu değil) bölme güvenilir
+    olmaz ve ValueError fırlatılır (çağıran sıralı analize dönebilir).
+
+    Returns:
+        (fps, frame_count)
+    """
+    import cv2
+    from page.video_container.seek import load_keyframe_index
+
+    capture = cv2.VideoCapture(video_path)
+    try:
+        if not capture.isOpened():
+            raise IOError(f"Video açılamadı: {video_path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    finally:
+        capture.release()
+    if frame_count <= 0:
+        raise ValueError(f"Frame sayısı bilinmiyor, paralel analiz yapılamaz: {video_path}")
+
+    # İndeks süreçlerden önce bir kez oluşturulur (hepsi önbellekten okur)
+    index = load_keyframe_index(video_path)
+    if index.get("keyframes") == []:
+        raise ValueError(f"Anahtar kare indeksi yok (ffprobe gerekli), "
+                         f"paralel analiz yapılamaz: {video_path}")
+    return fps, frame_count
+
+
+def analyze_parallel(video_path, area_list, model_path=None, workers=None,
+                     overlap_seconds=OVERLAP_SECONDS, allowed_classes=DEFAULT_CLASSES,
+                     progress_callback=None, stride=1):
+    """Videoyu `workers` süreçte parça parça analiz et.
+
+    Frame sayısı veya anahtar kare indeksi yoksa ValueError (bkz. probe_video).
+
+    Returns:
+        (TransitionCounter, frame_count)
+    """
+    model_path = resolve_model_path(model_path)
+    fps, frame_count = probe_video(video_path)
+
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    overlap = max(MIN_MATCH_FRAMES * max(1, stride), int(round(overlap_seconds * fps)))
+    segments = plan_segments(frame_count, workers, overlap)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=len(segments)) as executor:
+        futures = [
+            executor.submit(analyze_segment, video_path, model_path, area_list,
+                            segment, overlap, tuple(allowed_classes), stride)
+            for segment in segments
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress_callback:
+                progress_callback(len(results), len(segments))
+
+    return stitch(results, area_list, fps), frame_count
@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+
+from .zones import CompiledZones, area_from_dict, area_to_dict, scale_areas, zones_hash
+
+
+def areas_to_json(area_list):
+    """Alan listesini JSON metnine çevir"""
+    return json.dumps([area_to_dict(a) for a in area_list], ensure_ascii=False)
+
+
+def areas_from_json(text):
+    """areas_to_json'ın tersi"""
+    return [area_from_dict(a) for a in json.loads(text)]
+
+
+# Farklı kameraların videolarının bir arada durduğu klasörler; buradaki
+# videolar klasöre göre bir kameraya bağlanmaz (ön ayar otomatik uygulanmaz)
+SHARED_SOURCE_DIRS = (
+    "dosyalar",
+    os.path.join("dosyalar", "video"),
+    os.path.join("dosyalar", "inbox"),
+)
+
+
+def _is_shared_dir(path):
+    shared = {os.path.abspath(d) for d in SHARED_SOURCE_DIRS}
+    shared.add(os.path.abspath(os.path.expanduser("~")))
+    return path in shared or os.path.dirname(path) == path
+
+
+def camera_key(spec):
+    """Kaynağın kamera anahtarı: video dosyasının / kare klasörünün tam yolu.
+
+    Kamera başına klasörlenmiş kayıtlarda (ör. /kayit/kamera1/2024-05-01.mp4)
+    aynı kameranın videoları aynı ön ayarı kullanır. Tam yol kullanıldığı için
+    farklı yerlerdeki aynı adlı klasörler (ör. iki ayrı "video") karışmaz.
+    Paylaşılan klasörlerde (SHARED_SOURCE_DIRS, ev dizini, kök) None döner.
+    """
+    if not spec:
+        return None
+    path = os.path.normpath(os.path.abspath(spec))
+    if not os.path.isdir(path):
+        path = os.path.dirname(path)
+    if _is_shared_dir(path):
+        return None
+    return path
+
+
+def ensure_preset_table(conn):
+    """İsimli alan ön ayarları tablosunu oluştur.
+
+    Her ön ayarın kararlı bir `id`'si vardır (güncellemede değişmez).
+    Derlenmiş hal (etiket maskesi, sınır kutuları, özet) frame boyutuyla
+    birlikte saklanır; özet tutmazsa yüklemede yeniden derlenir.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS zone_presets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            camera TEXT,
+            zones TEXT NOT NULL,
+            frame_width INTEGER,
+            frame_height INTEGER,
+            zones_hash TEXT,
+            mask BLOB,
+            bboxes TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_zone_presets_camera
+        ON zone_presets (camera, updated_at)
+    ''')
+    conn.commit()
+
+
+def _compiled_columns(area_list, frame_size):
+    if not frame_size or not area_list:
+        return None, None, None, None, None
+    width, height = frame_size
+    compiled = CompiledZones(area_list, width, height)
+    return width, height, compiled.hash, compiled.mask_blob(), json.dumps(compiled.bboxes)
+
+
+def save_zone_preset(db_path, name, area_list, camera=None, frame_size=None):
+    """Alanları verilen isimle kaydet (varsa üzerine yazar); ön ayar id'sini döndür.
+
+    frame_size (genişlik, yükseklik) verilirse derlenmiş hal de yazılır.
+    """
+    width, height, digest, mask, bboxes = _compiled_columns(area_list, frame_size)
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_preset_table(conn)
+        with conn:
+            conn.execute('''
+                INSERT INTO zone_presets (
+                    name, camera, zones, frame_width, frame_height, zones_hash, mask, bboxes,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET
+                    camera = COALESCE(excluded.camera, zone_presets.camera),
+                    zones = excluded.zones,
+                    frame_width = excluded.frame_width,
+                    frame_height = excluded.frame_height,
+                    zones_hash = excluded.zones_hash,
+                    mask = excluded.mask,
+                    bboxes = excluded.bboxes,
+                    updated_at = excluded.updated_at
+            ''', (name, camera, areas_to_json(area_list), width, height, digest, mask, bboxes))
+        return conn.execute(
+            "SELECT id FROM zone_presets WHERE name = ?", (name,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def get_zone_preset(db_path, name=None, preset_id=None, camera=None, frame_size=None):
+    """Ön ayarı isim, id veya kamera (en son güncellenen) ile getir.
+
+    Saklanan frame_width/frame_height alan koordinatlarının ait olduğu
+    boyuttur. frame_size verilirse alanlar ve derlenmiş hal o boyut için
+    döndürülür: boyut farklıysa (ör. ölçekli okuma, farklı çözünürlük)
+    noktalar orantılanıp derlenir, saklanan hal değişmez; aynıysa ve özet
+    tutuyorsa maske diskten okunur, tutmuyorsa derlenip kaydedilir.
+
+    Returns:
+        dict: id, name, camera, area_list, compiled (CompiledZones veya None);
+              bulunamazsa None
+    """
+    if preset_id is not None:
+        where, params = "id = ?", (preset_id,)
+    elif name is not None:
+        where, params = "name = ?", (name,)
+    elif camera is not None:
+        where, params = "camera = ?", (camera,)
+    else:
+        return None
+
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_preset_table(conn)
+        row = conn.execute(f'''
+            SELECT id, name, camera, zones, frame_width, frame_height, zones_hash, mask, bboxes
+            FROM zone_presets WHERE {where}
+            ORDER BY updated_at DESC, id DESC LIMIT 1
+        ''', params).fetchone()
+        if row is None:
+            return None
+        preset_id, name, camera, zones, width, height, digest, mask, bboxes = row
+        area_list = areas_from_json(zones)
+
+        compiled = None
+        if frame_size and area_list:
+            frame_size = tuple(frame_size)
+            if width and height and (width, height) != frame_size:
+                area_list = scale_areas(area_list, (width, height), frame_size)
+                compiled = CompiledZones(area_list, *frame_size)
+            elif mask is not None and digest == zones_hash(area_list, width, height):
+                compiled = CompiledZones.from_blob(
+                    area_list, width, height, mask, json.loads(bboxes), digest
+                )
+            else:
+                compiled = CompiledZones(area_list, *frame_size)
+                with conn:
+                    conn.execute('''
+                        UPDATE zone_presets
+                        SET frame_width = ?, frame_height = ?, zones_hash = ?, mask = ?,
+                            bboxes = ?
+                        WHERE id = ?
+                    ''', (compiled.width, compiled.height, compiled.hash,
+                          compiled.mask_blob(), json.dumps(compiled.bboxes), preset_id))
+    finally:
+        conn.close()
+    return {
+        'id': preset_id,
+        'name': name,
+        'camera': camera,
+        'area_list': area_list,
+        'compiled': compiled,
+    }
+
+
+def load_zone_preset(db_path, name):
+    """Ön ayarın alan listesi (yoksa None)"""
+    preset = get_zone_preset(db_path, name=name)
+    return preset['area_list'] if preset else None
+
+
+def list_zone_presets(db_path):
+    """Kayıtlı ön ayar isimleri (alfabetik)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_preset_table(conn)
+        rows = conn.execute("SELECT name FROM zone_presets ORDER BY name").fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
@@ -2,6 +2,12 @@ import sqlite3
 import os
 import cv2
 from datetime import datetime
+from page.grafik.records import ensure_record_indexes
+from .checkpoint import ensure_checkpoint_table
+
+# Zaman kovası genişliği (video zamanı, ms). Daha kaba aralıklar (15 dk, 1 saat)
+# kayıt sonrası SQL ile bu kovalardan türetilir.
+BUCKET_MS = 60_000
 
 
 class VideoRecorder:
@@ -52,10 +58,247 @@ class VideoRecorder:
         
         # Not: Sadece sayım kayıtları da mevcut şema üzerinden (video_records + transition_counts)
         # tutulur. Bu yüzden ayrı bir tabloya ihtiyaç yoktur.
-        
+
+        # Geçiş olayları tablosu (her geçiş ayrı satır - zaman çözünürlüklü veri)
+        # Olaylar analiz sırasında session_id ile yazılır, kayıt kaydedilince
+        # video_record_id doldurulur.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transition_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER,
+                session_id TEXT NOT NULL,
+                frame_index INTEGER NOT NULL,
+                timestamp_ms REAL NOT NULL,
+                track_id INTEGER NOT NULL,
+                class_name TEXT,
+                from_area TEXT NOT NULL,
+                to_area TEXT NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_transition_events_record
+            ON transition_events (video_record_id, timestamp_ms)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_transition_events_session
+            ON transition_events (session_id)
+        ''')
+
+        # Araç sınıfı bazında geçiş sayımları (transition_counts'un sınıf dağılımı;
+        # sınıfı bilinmeyen geçişlerde class_name NULL)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transition_class_counts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER NOT NULL,
+                from_area TEXT NOT NULL,
+                to_area TEXT NOT NULL,
+                class_name TEXT,
+                count INTEGER NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_transition_class_counts_record
+            ON transition_class_counts (video_record_id)
+        ''')
+
+        # Sayım çizgisi geçişleri (çizgi, yön +1/-1 ve sınıf bazında;
+        # çizgiler rota sayımlarına girmez)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS line_crossing_counts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER NOT NULL,
+                line TEXT NOT NULL,
+                direction INTEGER NOT NULL,
+                class_name TEXT,
+                count INTEGER NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_line_crossing_counts_record
+            ON line_crossing_counts (video_record_id)
+        ''')
+
+        # Alan doluluğu zaman serisi (yalnızca değişen örnekler) ve
+        # alan bazında bekleme süresi histogramı (sabit kovalar, saniye).
+        # Arayüzdeki analizde örnekler kontrol noktalarıyla session_id ile
+        # yazılır, kayıt kaydedilince video_record_id doldurulur.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS occupancy_samples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER,
+                session_id TEXT,
+                timestamp_ms INTEGER NOT NULL,
+                area TEXT NOT NULL,
+                occupancy INTEGER NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_occupancy_samples_record
+            ON occupancy_samples (video_record_id, area, timestamp_ms)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_occupancy_samples_session
+            ON occupancy_samples (session_id)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dwell_histograms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER NOT NULL,
+                area TEXT NOT NULL,
+                bin_start_s REAL NOT NULL,
+                bin_end_s REAL,
+                count INTEGER NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_dwell_histograms_record
+            ON dwell_histograms (video_record_id)
+        ''')
+
+        # Zaman kovalı geçiş sayımları (video zamanına göre sabit aralıklar)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transition_buckets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_record_id INTEGER NOT NULL,
+                bucket_start_ms INTEGER NOT NULL,
+                bucket_ms INTEGER NOT NULL,
+                from_area TEXT NOT NULL,
+                to_area TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                FOREIGN KEY (video_record_id) REFERENCES video_records(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_transition_buckets_record
+            ON transition_buckets (video_record_id, bucket_start_ms)
+        ''')
+
+        # Grafik genel görünümü için artımlı özet tablolar
+        self._init_summary_tables(cursor)
+
+        # Uzun analizlerde çökme sonrası devam için kontrol noktaları
+        ensure_checkpoint_table(conn)
+
         conn.commit()
+
+        # Arama (FTS5) ve filtre indeksleri
+        ensure_record_indexes(conn)
         conn.close()
-    
+
+    def _init_summary_tables(self, cursor):
+        """Rota bazlı özet tablolarını ve onları güncel tutan trigger'ları oluştur.
+
+        `route_totals` tüm kayıtların rota toplamlarını, `route_daily_totals`
+        ise gün bazlı toplamları tutar. Her iki tablo da `transition_counts`
+        üzerindeki trigger'lar ile artımlı güncellenir; Grafik paneli toplamları
+        kayıt sayısından bağımsız olarak doğrudan okur.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS route_totals (
+                from_area TEXT NOT NULL,
+                to_area TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (from_area, to_area)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS route_daily_totals (
+                day TEXT NOT NULL,
+                from_area TEXT NOT NULL,
+                to_area TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, from_area, to_area)
+            )
+        ''')
+
+        # Kaydın günü (created_at yoksa bugünün tarihi)
+        record_day = '''COALESCE(
+            (SELECT date(created_at) FROM video_records WHERE id = {row}.video_record_id),
+            date('now')
+        )'''
+
+        add_rows = f'''
+            INSERT INTO route_totals (from_area, to_area, total)
+            VALUES (NEW.from_area, NEW.to_area, NEW.count)
+            ON CONFLICT(from_area, to_area) DO UPDATE SET total = total + excluded.total;
+            INSERT INTO route_daily_totals (day, from_area, to_area, total)
+            VALUES ({record_day.format(row='NEW')}, NEW.from_area, NEW.to_area, NEW.count)
+            ON CONFLICT(day, from_area, to_area) DO UPDATE SET total = total + excluded.total;
+        '''
+        remove_rows = f'''
+            UPDATE route_totals SET total = total - OLD.count
+            WHERE from_area = OLD.from_area AND to_area = OLD.to_area;
+            UPDATE route_daily_totals SET total = total - OLD.count
+            WHERE day = {record_day.format(row='OLD')}
+              AND from_area = OLD.from_area AND to_area = OLD.to_area;
+        '''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_transition_counts_insert
+            AFTER INSERT ON transition_counts
+            BEGIN {add_rows} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_transition_counts_delete
+            AFTER DELETE ON transition_counts
+            BEGIN {remove_rows} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_transition_counts_update
+            AFTER UPDATE OF from_area, to_area, count ON transition_counts
+            BEGIN {remove_rows} {add_rows} END
+        ''')
+
+        # Özet tablolar sonradan eklendiyse mevcut verilerden bir kez doldur
+        cursor.execute('SELECT EXISTS(SELECT 1 FROM route_totals)')
+        has_totals = cursor.fetchone()[0]
+        cursor.execute('SELECT EXISTS(SELECT 1 FROM transition_counts)')
+        has_counts = cursor.fetchone()[0]
+        if has_counts and not has_totals:
+            cursor.execute('''
+                INSERT INTO route_totals (from_area, to_area, total)
+                SELECT from_area, to_area, SUM(count)
+                FROM transition_counts
+                GROUP BY from_area, to_area
+            ''')
+            cursor.execute('''
+                INSERT INTO route_daily_totals (day, from_area, to_area, total)
+                SELECT COALESCE(date(v.created_at), date('now')), t.from_area, t.to_area, SUM(t.count)
+                FROM transition_counts t
+                LEFT JOIN video_records v ON v.id = t.video_record_id
+                GROUP BY 1, t.from_area, t.to_area
+            ''')
+
+    def get_route_totals(self, day=None):
+        """Önceden hesaplanmış rota toplamlarını getir (day verilirse o günün)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        if day:
+            cursor.execute('''
+                SELECT from_area, to_area, total
+                FROM route_daily_totals
+                WHERE day = ? AND total > 0
+                ORDER BY total DESC
+            ''', (day,))
+        else:
+            cursor.execute('''
+                SELECT from_area, to_area, total
+                FROM route_totals
+                WHERE total > 0
+                ORDER BY total DESC
+            ''')
+
+        totals = cursor.fetchall()
+        conn.close()
+
+        return totals
+
     def start_recording(self, frame_width, frame_height, fps=30):
         """Video kaydını başlat"""
         if self.recording:
@@ -90,12 +333,17 @@ class VideoRecorder:
             self.video_writer.write(frame)
             self.frame_count += 1
     
-    def stop_recording(self, name=None, transition_counts=None):
+    def stop_recording(self, name=None, transition_counts=None, bucket_counts=None,
+                       class_counts=None, occupancy=None, crossing_counts=None):
         """Video kaydını durdur ve kaydet
         
         Args:
             name: Video kaydı için isim (None ise geçici dosya silinir)
             transition_counts: Geçiş sayımları dictionary'si
+            bucket_counts: {(bucket_start_ms, from_area, to_area): count} sözlüğü
+            class_counts: {(from_area, to_area, class_name): count} sözlüğü
+            occupancy: OccupancyTracker.result() (doluluk ve bekleme süreleri)
+            crossing_counts: {(line, direction, class_name): count} sözlüğü
         
         Returns:
             dict: Kayıt bilgileri veya None
@@ -134,7 +382,11 @@ class VideoRecorder:
                 name,
                 video_path,
                 self.frame_count,
-                transition_counts
+                transition_counts,
+                bucket_counts,
+                class_counts,
+                occupancy,
+                crossing_counts
             )
             
             return {
@@ -147,7 +399,9 @@ class VideoRecorder:
         except Exception as e:
             raise Exception(f"Kayıt sırasında hata oluştu: {str(e)}")
     
-    def _save_to_database(self, name, video_path, frame_count, transition_counts=None):
+    def _save_to_database(self, name, video_path, frame_count, transition_counts=None,
+                          bucket_counts=None, class_counts=None, occupancy=None,
+                          crossing_counts=None):
         """Veritabanına kaydet"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -169,6 +423,11 @@ class VideoRecorder:
                             INSERT INTO transition_counts (video_record_id, from_area, to_area, count)
                             VALUES (?, ?, ?, ?)
                         ''', (record_id, from_area, to_area, count))
+
+            self._save_buckets(cursor, record_id, bucket_counts)
+            self._save_class_counts(cursor, record_id, class_counts)
+            self._save_occupancy(cursor, record_id, occupancy)
+            self._save_crossing_counts(cursor, record_id, crossing_counts)
             
             conn.commit()
             return record_id
@@ -218,18 +477,23 @@ class VideoRecorder:
             self.video_writer = None
         self.recording = False
 
-    def save_transition_counts_only(self, name, transition_counts):
+    def save_transition_counts_only(self, name, transition_counts, bucket_counts=None,
+                                    class_counts=None, occupancy=None, crossing_counts=None):
         """Video dosyası oluşturmadan sadece geçiş sayımlarını veritabanına kaydet.
         Kayıtlar `video_records` + `transition_counts` tablolarına yazılır.
         
         Args:
             name: Kayıt ismi
             transition_counts: {(from_area, to_area): count} sözlüğü
+            bucket_counts: {(bucket_start_ms, from_area, to_area): count} sözlüğü
+            class_counts: {(from_area, to_area, class_name): count} sözlüğü
+            occupancy: OccupancyTracker.result() (doluluk ve bekleme süreleri)
+            crossing_counts: {(line, direction, class_name): count} sözlüğü
         
         Returns:
             int: Oluşturulan oturum ID'si veya None
         """
-        if not transition_counts:
+        if not transition_counts and not crossing_counts:
             return None
         
         conn = sqlite3.connect(self.db_path)
@@ -245,12 +509,17 @@ class VideoRecorder:
             record_id = cursor.lastrowid
             
             # Geçiş sayımlarını ekle
-            for (from_area, to_area), count in transition_counts.items():
+            for (from_area, to_area), count in (transition_counts or {}).items():
                 if count > 0:
                     cursor.execute('''
                         INSERT INTO transition_counts (video_record_id, from_area, to_area, count)
                         VALUES (?, ?, ?, ?)
                     ''', (record_id, from_area, to_area, count))
+
+            self._save_buckets(cursor, record_id, bucket_counts)
+            self._save_class_counts(cursor, record_id, class_counts)
+            self._save_occupancy(cursor, record_id, occupancy)
+            self._save_crossing_counts(cursor, record_id, crossing_counts)
             
             conn.commit()
             return record_id
@@ -260,3 +529,160 @@ class VideoRecorder:
             raise e
         finally:
             conn.close()
+
+    def _save_buckets(self, cursor, record_id, bucket_counts, bucket_ms=BUCKET_MS):
+        """Zaman kovalı sayımları kompakt satırlar olarak ekle"""
+        if not bucket_counts:
+            return
+        rows = [
+            (record_id, bucket_start, bucket_ms, from_area, to_area, count)
+            for (bucket_start, from_area, to_area), count in sorted(bucket_counts.items())
+            if count > 0
+        ]
+        cursor.executemany('''
+            INSERT INTO transition_buckets
+                (video_record_id, bucket_start_ms, bucket_ms, from_area, to_area, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+    def _save_class_counts(self, cursor, record_id, class_counts):
+        """Sınıf bazlı sayımları ekle"""
+        if not class_counts:
+            return
+        rows = [
+            (record_id, from_area, to_area, class_name, count)
+            for (from_area, to_area, class_name), count in class_counts.items()
+            if count > 0
+        ]
+        cursor.executemany('''
+            INSERT INTO transition_class_counts
+                (video_record_id, from_area, to_area, class_name, count)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+
+    def _save_crossing_counts(self, cursor, record_id, crossing_counts):
+        """Çizgi geçiş sayımlarını ekle"""
+        if not crossing_counts:
+            return
+        cursor.executemany('''
+            INSERT INTO line_crossing_counts
+                (video_record_id, line, direction, class_name, count)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (record_id, line, direction, class_name, count)
+            for (line, direction, class_name), count in crossing_counts.items()
+            if count > 0
+        ])
+
+    def _save_occupancy(self, cursor, record_id, occupancy):
+        """Doluluk örneklerini ve bekleme süresi histogramlarını ekle"""
+        if not occupancy:
+            return
+        cursor.executemany('''
+            INSERT INTO occupancy_samples (video_record_id, timestamp_ms, area, occupancy)
+            VALUES (?, ?, ?, ?)
+        ''', [(record_id, int(ts), area, value) for ts, area, value in occupancy['samples']])
+
+        bins = occupancy['bins_s']
+        ends = list(bins[1:]) + [None]
+        cursor.executemany('''
+            INSERT INTO dwell_histograms (video_record_id, area, bin_start_s, bin_end_s, count)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (record_id, area, start, end, count)
+            for area, counts in sorted(occupancy['dwell'].items())
+            for start, end, count in zip(bins, ends, counts)
+            if count > 0
+        ])
+
+    def get_dwell_histograms(self, video_record_id):
+        """Kaydın bekleme süresi histogramları: [(area, bin_start_s, bin_end_s, count)]"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT area, bin_start_s, bin_end_s, count
+            FROM dwell_histograms
+            WHERE video_record_id = ?
+            ORDER BY area, bin_start_s
+        ''', (video_record_id,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
+
+    def get_occupancy_series(self, video_record_id):
+        """Kaydın doluluk değişimleri: [(timestamp_ms, area, occupancy)]
+
+        Yalnızca değişen örnekler saklanır; aradaki değerler bir öncekiyle aynıdır.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT timestamp_ms, area, occupancy
+            FROM occupancy_samples
+            WHERE video_record_id = ?
+            ORDER BY timestamp_ms, area
+        ''', (video_record_id,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
+
+    def get_crossing_counts(self, video_record_id):
+        """Kaydın çizgi geçiş sayımları: [(line, direction, class_name, count)]"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT line, direction, class_name, count
+            FROM line_crossing_counts
+            WHERE video_record_id = ?
+            ORDER BY line, direction DESC, class_name
+        ''', (video_record_id,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
+
+    def get_class_counts(self, video_record_id):
+        """Kaydın sınıf bazlı geçiş sayımları: [(from_area, to_area, class_name, count)]"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT from_area, to_area, class_name, count
+            FROM transition_class_counts
+            WHERE video_record_id = ?
+            ORDER BY from_area, to_area, class_name
+        ''', (video_record_id,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
+
+    def get_bucket_counts(self, video_record_id, interval_ms=BUCKET_MS):
+        """Kayıt için zaman serisini istenen aralıkta getir.
+
+        Kaba aralıklar (15 dk, 1 saat) 1 dakikalık kovalardan SQL'de türetilir.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT (bucket_start_ms / ?) * ? AS bucket, from_area, to_area, SUM(count)
+            FROM transition_buckets
+            WHERE video_record_id = ?
+            GROUP BY bucket, from_area, to_area
+            ORDER BY bucket
+        ''', (interval_ms, interval_ms, video_record_id))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
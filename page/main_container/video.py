@@ -6,7 +6,17 @@ import threading
 import time
 import numpy as np
 import os
+import uuid
 from .save import VideoRecorder
+from .events import TransitionEventWriter
+from .checkpoint import CHECKPOINT_INTERVAL_S, latest_checkpoint, session_bucket_counts
+from .occupancy import OccupancyTracker
+from .presets import camera_key, get_zone_preset, list_zone_presets, save_zone_preset
+from .analyzer import TransitionCounter, iter_tracks
+from .zones import AREA_LINE, is_line, scale_areas
+from page.video_container.filmstrip import Filmstrip
+from page.video_container.reader import PrefetchReader
+from page.video_container.sources import open_source
 
 # YOLO ve torch import'ları (opsiyonel - yoksa hata vermesin)
 try:
@@ -18,27 +28,23 @@ except ImportError:
     print("YOLO kütüphanesi bulunamadı. Tespit özellikleri devre dışı.")
 
 
-def point_in_polygon(point, polygon):
-    """Ray casting algoritması ile nokta polygon içinde mi kontrol et"""
-    x, y = point
-    n = len(polygon)
-    inside = False
-    p1x, p1y = polygon[0]
-    for i in range(n+1):
-        p2x, p2y = polygon[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y-p1y)*(p2x-p1x)/(p2y-p1y)+p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-    return inside
+def _counter_attribute(name):
+    """Sayım durumunu TransitionCounter'da tutan, container üzerinden erişilen özellik"""
+    return property(
+        lambda self: getattr(self.counter, name),
+        lambda self, value: setattr(self.counter, name, value)
+    )
 
 
 class MainVideoContainer:
     """Ana Sayfa için video container bileşeni - Görüntü işleme ile"""
+
+    # Alanlar ve sayım durumu arayüzsüz analizle ortak çekirdekte (analyzer.py)
+    area_list = _counter_attribute('area_list')
+    transition_counts = property(lambda self: self.counter.transition_counts)
+    bucket_counts = _counter_attribute('bucket_counts')
+    last_area_per_object = _counter_attribute('last_area_per_object')
+    last_point_per_object = _counter_attribute('last_point_per_object')
     
     def __init__(self, parent_frame, colors):
         self.parent_frame = parent_frame
@@ -46,10 +52,12 @@ class MainVideoContainer:
         
         # Video değişkenleri
         self.video_capture = None
+        self.source_spec = None  # Açık kaynağın yolu (kontrol noktası için)
         self.video_thread = None
+        self.frame_reader = None  # Oynatma sırasında önden okuyan okuyucu
         self.is_playing = False
         self.current_frame = None
-        self.original_frame = None  # Orijinal frame (ölçeklenmemiş)
+        self.original_frame = None  # Orijinal frame (ölçeklenmemiş, sadece çizimde güncellenir)
         self.frame_width = 0
         self.frame_height = 0
         self.scale_x = 1.0
@@ -62,17 +70,31 @@ class MainVideoContainer:
         # Her nesnenin geçmiş konumlarını saklamak için (ID -> deque)
         self.track_histories = {}
         
+        # Geçiş sayım çekirdeği (alanlar, sayımlar, nesnelerin son alanı)
+        self.counter = TransitionCounter()
+        # Alan doluluğu ve bekleme süresi histogramları (her frame artımlı)
+        self.occupancy = OccupancyTracker()
+
         # Alan yönetimi
-        self.area_list = []  # [{'name': str, 'points': [(x1,y1), ...], 'id': int}]
+        self.area_list = []  # [{'name': str, 'points': [(x1,y1), ...], 'id': int, 'type'?: 'line'}]
         self.current_polygon = []
         self.drawing_mode = False
+        self.drawing_line = False  # Çizim modunda sayım çizgisi mi çiziliyor
         self.editing_area_id = None
         self.selected_area_id = None
         
-        # Geçiş sayımları
-        self.transition_counts = {}  # {(from, to): count}
-        self.last_area_per_object = {}
-        
+        # Geçiş olay kaydı (her geçiş ayrı satır, arka planda toplu yazılır)
+        self.session_id = None  # Aktif analiz oturumu
+        self.current_frame_index = 0
+        self.current_timestamp_ms = 0.0
+
+        # Kontrol noktası (çökme sonrası devam)
+        self._last_checkpoint = 0.0
+        # Duraklatınca kontrol noktası video thread'inde, döngüden çıkarken yazılır
+        self._checkpoint_on_stop = False
+        # Devam edilen oturumda yeni tracker ID'leri eskileriyle çakışmasın
+        self.track_id_offset = 0
+
         # Renk kodları
         self.colors_detection = {
             'Araba': (0, 255, 0),    # Yeşil
@@ -84,7 +106,9 @@ class MainVideoContainer:
         # Video kayıt sistemi
         self.video_recorder = VideoRecorder()
         self.should_save_on_stop = False  # Kayıt yapılacak mı kontrolü
-        
+        self.event_writer = TransitionEventWriter(self.video_recorder.db_path)
+        self.event_writer.start()
+
         # UI oluştur
         self.setup_ui()
         
@@ -107,9 +131,12 @@ class MainVideoContainer:
         
         area_buttons = [
             ('➕ Ekle', self.add_area),
+            ('📏 Çizgi Ekle', self.add_line),
             ('✏️ Düzenle', self.edit_area),
             ('🗑️ Sil', self.delete_area),
-            ('✓ Tamamla', self.finish_area)
+            ('✓ Tamamla', self.finish_area),
+            ('💾 Ön Ayar Kaydet', self.save_preset),
+            ('📥 Ön Ayar Yükle', self.load_preset),
         ]
         
         for text, command in area_buttons:
@@ -128,6 +155,10 @@ class MainVideoContainer:
             btn.pack(side=tk.LEFT, padx=5)
             self.add_hover_effect(btn, self.colors['accent'], self.colors['accent_hover'])
         
+        # Zaman şeridi (canvas'ın altında, karoya tıklayınca o konuma gider)
+        self.filmstrip = Filmstrip(video_container, self.colors, self.seek_to_frame)
+        self.filmstrip.pack(side=tk.BOTTOM, fill=tk.X, pady=(8, 0))
+
         # Video frame (Canvas)
         self.video_frame = tk.Canvas(
             video_container,
@@ -196,10 +227,12 @@ class MainVideoContainer:
         # Kontrol butonları - İstenen sırayla: Dosya Seç, Oynat, Duraklat, Durdur, Bitir, Sıfırla, Video Kaydı Aç/Kapa
         buttons = [
             ('📂 Dosya Seç', self.load_video),
+            ('🖼️ Kare Klasörü', self.load_image_sequence),
             ('▶️ Oynat', self.play_video),
             ('⏸️ Duraklat', self.pause_video),
             ('🛑 Bitir', self.finish_video),  # Yeni Bitir butonu
             ('🔄 Sıfırla', self.reset_video),
+            ('⏯️ Devam Et', self.resume_from_checkpoint),
             ('🎥 Video Kaydı Aç/Kapa', self.toggle_video_recording),
         ]
 
@@ -301,21 +334,74 @@ class MainVideoContainer:
         )
         
         if file_path:
-            self.video_capture = cv2.VideoCapture(file_path)
-            
-            if self.video_capture.isOpened():
-                self.frame_width = int(self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
-                self.frame_height = int(self.video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                self.video_frame.delete(self.placeholder_text)
-                self.show_notification(f'Video yüklendi: {os.path.basename(file_path)}')
-                self.display_first_frame()
-
-                # Sadece YOLO mevcutsa ve model henüz yüklü değilse DB'den yükle
-                if YOLO_AVAILABLE and self.model is None:
-                    self._load_model_from_settings()
+            self.load_source(file_path)
+
+    def load_image_sequence(self):
+        """JPEG/PNG kare klasörü yükle (video kodlamadan analiz)"""
+        directory = filedialog.askdirectory(title="Kare Klasörü Seç")
+        if directory:
+            self.load_source(directory)
+
+    def load_source(self, spec):
+        """Video dosyası veya kare klasörünü FrameSource olarak aç"""
+        # FFmpeg / kare klasörü kaynakları alt süreç ve thread tutar; eskisini kapat
+        if self.video_capture and not self.is_playing:
+            self.video_capture.release()
+        try:
+            self.video_capture = self._open_source(spec)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Hata", f"Kaynak açılamadı:\n{e}")
+            self.video_capture = None
+            self.source_spec = None
+            return
+        # Sadece konumlanabilen kaynaklardan (dosya, kare klasörü) devam edilebilir
+        self.source_spec = spec if os.path.isfile(spec) or os.path.isdir(spec) else None
+
+        if self.video_capture.isOpened():
+            self.frame_width = int(self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self.frame_height = int(self.video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.video_frame.delete(self.placeholder_text)
+            self.show_notification(f'Video yüklendi: {self.video_capture.name}')
+
+            # Alan yoksa bu kameranın ön ayarı otomatik yüklenir
+            preset = None
+            if not self.area_list:
+                preset = get_zone_preset(self.video_recorder.db_path, camera=camera_key(spec),
+                                         frame_size=self._frame_size())
+            if preset is not None:
+                self._apply_preset(preset)
+                self.show_notification(f"Video yüklendi, ön ayar: {preset['name']}")
             else:
-                messagebox.showerror("Hata", "Video dosyası açılamadı!")
+                self._compile_zones()
+            self.display_first_frame()
+            # Zaman şeridi sadece video dosyaları için
+            if os.path.isfile(spec):
+                self.filmstrip.set_video(
+                    spec, int(self.video_capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+                )
+            else:
+                self.filmstrip.clear()
+
+            # Sadece YOLO mevcutsa ve model henüz yüklü değilse DB'den yükle
+            if YOLO_AVAILABLE and self.model is None:
+                self._load_model_from_settings()
+        else:
+            messagebox.showerror("Hata", "Video dosyası açılamadı!")
                 
+    def _open_source(self, spec):
+        """Ayarlardaki okuma yöntemine göre (OpenCV / FFmpeg) kaynağı aç"""
+        try:
+            from page.settings.main import SettingsContainer
+            settings = SettingsContainer.get_capture_settings()
+        except Exception:
+            settings = {'backend': 'opencv', 'scale_width': None, 'threads': 0}
+        return open_source(
+            spec,
+            backend=settings['backend'],
+            scale_width=settings['scale_width'],
+            threads=settings['threads'],
+        )
+
     def display_first_frame(self):
         """İlk kareyi göster"""
         if self.video_capture and self.video_capture.isOpened():
@@ -326,10 +412,41 @@ class MainVideoContainer:
                 self.update_video_frame(frame)
                 self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
                 
+    def seek_to_frame(self, frame_index):
+        """Duraklatılmışken verilen frame'e git (zaman şeridinden)"""
+        if not self.video_capture or not self.video_capture.isOpened():
+            return
+        if self.is_playing:
+            self.show_notification("Konum değiştirmek için önce videoyu duraklatın")
+            return
+
+        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        ret, frame = self.video_capture.read()
+        if not ret:
+            return
+        # Oynatma bu frame'den devam etsin
+        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+
+        # Atlanan aralıkta nesneler izlenmedi; sahte geçiş sayılmasın
+        self.last_area_per_object = {}
+        self.last_point_per_object = {}
+        self.track_histories = {}
+        self.occupancy.clear_tracks()
+
+        self.original_frame = frame.copy()
+        self.current_frame = self.draw_areas_on_frame(frame)
+        self.update_video_frame(self.current_frame)
+        self.filmstrip.set_position(frame_index)
+
     def play_video(self):
         """Video oynatmayı başlat"""
         if self.video_capture and self.video_capture.isOpened() and not self.is_playing:
             self.is_playing = True
+            self._checkpoint_on_stop = False
+
+            # Yeni analiz oturumu (duraklat/devam aynı oturumda kalır)
+            if self.session_id is None:
+                self.session_id = uuid.uuid4().hex
             
             # Video kaydı kullanıcı tercihi açıksa başlat
             if self.should_save_on_stop and self.frame_width > 0 and self.frame_height > 0:
@@ -340,16 +457,24 @@ class MainVideoContainer:
                     fps
                 )
             
+            # Decode ayrı thread'de, önceden ayrılmış tamponlara yapılır
+            self.frame_reader = PrefetchReader(self.video_capture).start()
             self.video_thread = threading.Thread(target=self.video_loop, daemon=True)
             self.video_thread.start()
             self.show_notification('Video oynatılıyor')
             
     def video_loop(self):
         """Video oynatma döngüsü"""
+        reader = self.frame_reader
         while self.is_playing and self.video_capture and self.video_capture.isOpened():
-            ret, frame = self.video_capture.read()
+            # Frame okuyucunun tamponudur (kopya yok); üzerine doğrudan çizilir
+            ret, frame = reader.read()
             if ret:
-                self.original_frame = frame.copy()
+                # Temiz frame sadece alan çizilirken gerekir
+                if self.drawing_mode:
+                    self.original_frame = frame.copy()
+                self.current_frame_index = reader.frame_index
+                self.current_timestamp_ms = reader.timestamp_ms
                 
                 # Tespit aktifse işle
                 if self.model:
@@ -358,18 +483,35 @@ class MainVideoContainer:
                     # Tespit kapalıysa sadece alanları çiz
                     frame = self.draw_areas_on_frame(frame)
                 
-                self.current_frame = frame
+                # UI current_frame'i oynatma dışında da (yeniden boyutlandırma,
+                # alan çizimi) kullanır; havuz tamponu HOLD_FRAMES sonra yeniden
+                # dolduğundan UI'ye kendi kopyası verilir
+                self.current_frame = frame.copy()
                 
                 # Frame'i video kaydına yaz (alanlar ve tespit işaretleri dahil)
                 if self.video_recorder.recording:
                     self.video_recorder.write_frame(frame)
                 
                 self.update_video_frame(frame)
+                self.parent_frame.after(0, self.filmstrip.set_position, self.current_frame_index)
+
+                if time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL_S:
+                    self._save_checkpoint()
                 time.sleep(0.033)  # ~30 FPS
             else:
                 # Video bitti - otomatik olarak bitir komutunu çalıştır
                 self.parent_frame.after(0, self.finish_video)
                 break
+
+        # Okuyucuyu durdur; capture gösterilmemiş ilk frame'e geri konur
+        reader.stop()
+        if self.frame_reader is reader:
+            self.frame_reader = None
+
+        # Duraklatıldıysa: sayaçlar artık değişmiyor, son işlenen frame'le tutarlı
+        if self._checkpoint_on_stop:
+            self._checkpoint_on_stop = False
+            self._save_checkpoint()
     
     def finish_video(self):
         """
@@ -390,14 +532,18 @@ class MainVideoContainer:
         # Kayıt ve sayım işlemlerini yap
         if self.should_save_on_stop:
             # Video kaydı varsa kaydet
-            self._save_recording()
+            record_id = self._save_recording()
         else:
             # Sadece sayım varsa kaydet
-            self._save_counts_only()
+            record_id = self._save_counts_only()
+
+        # Oturumun geçiş olaylarını kayda bağla (kaydedilmediyse sil)
+        self._close_event_session(record_id)
         
         # Geçiş sayımlarını sıfırla (isteğe bağlı - bir sonraki analiz için)
-        self.transition_counts = {}
-        self.last_area_per_object = {}
+        self.counter.reset()
+        self.occupancy.reset()
+        self.track_id_offset = 0
         self.update_info_panel()
         
         self.show_notification("Video bitirildi ve kaydedildi")
@@ -408,81 +554,69 @@ class MainVideoContainer:
             return frame
 
         # YOLO11 track — ID'ler modelin kendi tracker'ından gelir
-        results = self.model.track(
-            frame,
-            conf=0.3,
-            tracker="bytetrack.yaml",
-            persist=True
-        )
+        observations = []
+        classes = {}
+        for object_id, (x1, y1, x2, y2), confidence, class_name in iter_tracks(
+                self.model, frame, self.allowed_classes):
+            object_id += self.track_id_offset
+            cx = int((x1 + x2) / 2)
+            cy = int((y1 + y2) / 2)
+
+            # Geçmiş konumları güncelle
+            if object_id not in self.track_histories:
+                self.track_histories[object_id] = []
+            history = self.track_histories[object_id]
+            history.append((cx, cy))
+            if len(history) > 20:
+                self.track_histories[object_id] = history[-20:]
+            history = self.track_histories[object_id]
+
+            color = self.colors_detection.get(class_name, (255, 255, 255))
+
+            # Kutu ve ID çiz
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            id_label = f"{class_name} ID:{object_id}"
+            label_size = cv2.getTextSize(id_label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            cv2.rectangle(frame, (x1, y1 - label_size[1] - 10),
+                          (x1 + label_size[0], y1), color, -1)
+            cv2.putText(frame, id_label, (x1, y1 - 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+            # Merkez ve iz çizgisi
+            cv2.circle(frame, (cx, cy), 3, color, -1)
+            if len(history) >= 2:
+                for i in range(1, len(history)):
+                    cv2.line(frame, history[i - 1], history[i], color, 1)
 
-        for result in results:
-            boxes = result.boxes
-            if boxes is None:
-                continue
-
-            for box in boxes:
-                # Track ID yoksa atla
-                if box.id is None:
-                    continue
-
-                object_id = int(box.id[0].cpu().numpy())
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-                confidence = float(box.conf[0].cpu().numpy())
-                class_id = int(box.cls[0].cpu().numpy())
-                class_name = self.model.names[class_id]
-
-                if class_name not in self.allowed_classes:
-                    continue
-                if confidence < 0.5:
-                    continue
-
-                cx = int((x1 + x2) / 2)
-                cy = int((y1 + y2) / 2)
-
-                # Geçmiş konumları güncelle
-                if object_id not in self.track_histories:
-                    self.track_histories[object_id] = []
-                history = self.track_histories[object_id]
-                history.append((cx, cy))
-                if len(history) > 20:
-                    self.track_histories[object_id] = history[-20:]
-                history = self.track_histories[object_id]
-
-                color = self.colors_detection.get(class_name, (255, 255, 255))
-
-                # Kutu ve ID çiz
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                id_label = f"{class_name} ID:{object_id}"
-                label_size = cv2.getTextSize(id_label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-                cv2.rectangle(frame, (x1, y1 - label_size[1] - 10),
-                              (x1 + label_size[0], y1), color, -1)
-                cv2.putText(frame, id_label, (x1, y1 - 5),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-
-                # Merkez ve iz çizgisi
-                cv2.circle(frame, (cx, cy), 3, color, -1)
-                if len(history) >= 2:
-                    for i in range(1, len(history)):
-                        cv2.line(frame, history[i - 1], history[i], color, 1)
-
-                # Hangi alanda?
-                current_area = None
-                for area in self.area_list:
-                    if point_in_polygon((cx, cy), area['points']):
-                        current_area = area['name']
-                        break
-
-                prev_area = self.last_area_per_object.get(object_id)
-                if prev_area is not None and current_area is not None and prev_area != current_area:
-                    # Geçiş oldu
-                    key = (prev_area, current_area)
-                    if key not in self.transition_counts:
-                        self.transition_counts[key] = 0
-                    self.transition_counts[key] += 1
-                    self.update_info_panel()
-
-                if current_area is not None:
-                    self.last_area_per_object[object_id] = current_area
+            observations.append((object_id, (cx, cy), class_name))
+            classes[object_id] = class_name
+
+        # Alan kontrolü ve geçiş sayımı (ortak çekirdek, tüm track'ler birlikte)
+        visited = self.counter.locate_frame(
+            [(object_id, point) for object_id, point, _ in observations]
+        )
+        transitions, crossings = self.counter.count_visits(
+            observations, visited, self.current_timestamp_ms
+        )
+        # Aynı sorgu sonucundan doluluk (içinde bulunulan polygon)
+        self.occupancy.update(
+            [(object_id, area) for (object_id, _, _), (_, area) in zip(observations, visited)],
+            self.current_timestamp_ms
+        )
+        for object_id, (prev_area, current_area) in transitions:
+            # Geçişi olay olarak kaydet (arka planda yazılır)
+            if self.session_id is not None:
+                self.event_writer.add_event(
+                    self.session_id,
+                    self.current_frame_index,
+                    self.current_timestamp_ms,
+                    object_id,
+                    classes[object_id],
+                    prev_area,
+                    current_area
+                )
+        if transitions or crossings:
+            self.update_info_panel()
 
         # Alanları çiz
         frame = self.draw_areas_on_frame(frame)
@@ -493,9 +627,15 @@ class MainVideoContainer:
         """Frame üzerine alanları (polygon'ları) çiz"""
         for area in self.area_list:
             pts = np.array(area['points'], np.int32)
-            cv2.polylines(frame, [pts], True, (0, 200, 0), 2)
+            if is_line(area):
+                cv2.line(frame, tuple(pts[0]), tuple(pts[-1]), (255, 255, 0), 3)
+            else:
+                cv2.polylines(frame, [pts], True, (0, 200, 0), 2)
             if len(pts) > 0:
-                cv2.putText(frame, area['name'], tuple(pts[0]), 
+                # Alandaki anlık araç sayısı ismin yanında
+                occupancy = self.occupancy.occupancy.get(area['name'])
+                label = f"{area['name']} ({occupancy})" if occupancy else area['name']
+                cv2.putText(frame, label, tuple(pts[0]), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
         
         return frame
@@ -564,7 +704,13 @@ class MainVideoContainer:
                 canvas_y = self.image_y + int(py * self.scale_y)
                 points.append((canvas_x, canvas_y))
             
-            if len(points) > 1:
+            if len(points) > 1 and is_line(area):
+                # Sayım çizgisi (açık, kalın)
+                self.video_frame.create_line(
+                    points[0][0], points[0][1], points[-1][0], points[-1][1],
+                    fill='#00ffff', width=3, tags='area'
+                )
+            elif len(points) > 1:
                 # Polygon çiz (kapalı)
                 for i in range(len(points)):
                     start = points[i]
@@ -625,7 +771,11 @@ class MainVideoContainer:
             orig_x = int((canvas_x - self.image_x) / self.scale_x)
             orig_y = int((canvas_y - self.image_y) / self.scale_y)
             
-            self.current_polygon.append((orig_x, orig_y))
+            if self.drawing_line and len(self.current_polygon) >= 2:
+                # Çizginin ikinci ucu taşınır
+                self.current_polygon[-1] = (orig_x, orig_y)
+            else:
+                self.current_polygon.append((orig_x, orig_y))
             self.update_video_frame(self.current_frame if self.current_frame is not None else self.original_frame)
     
     def on_canvas_motion(self, event):
@@ -647,9 +797,22 @@ class MainVideoContainer:
             return
         
         self.drawing_mode = True
+        self.drawing_line = False
         self.current_polygon = []
         self.editing_area_id = None
         self.show_notification("Çizim modu: Sol tık ile nokta ekleyin, sağ tık ile sıfırlayın")
+
+    def add_line(self):
+        """Yeni sayım çizgisi ekleme modunu başlat (iki nokta)"""
+        if self.original_frame is None:
+            messagebox.showwarning("Uyarı", "Önce bir video yükleyin!")
+            return
+
+        self.drawing_mode = True
+        self.drawing_line = True
+        self.current_polygon = []
+        self.editing_area_id = None
+        self.show_notification("Çizgi modu: Sol tık ile iki uç seçin, sağ tık ile sıfırlayın")
     
     def finish_area(self):
         """Alan çizimini bitir"""
@@ -657,7 +820,10 @@ class MainVideoContainer:
             messagebox.showwarning("Uyarı", "Önce çizim modunu başlatın!")
             return
         
-        if len(self.current_polygon) < 3:
+        if self.drawing_line and len(self.current_polygon) != 2:
+            messagebox.showwarning("Uyarı", "Çizgi için 2 nokta gerekli!")
+            return
+        if not self.drawing_line and len(self.current_polygon) < 3:
             messagebox.showwarning("Uyarı", "En az 3 nokta gerekli!")
             return
         
@@ -677,16 +843,20 @@ class MainVideoContainer:
         else:
             # Yeni alan ekle
             new_id = max([a['id'] for a in self.area_list], default=0) + 1
-            self.area_list.append({
+            area = {
                 'id': new_id,
                 'name': name,
                 'points': self.current_polygon.copy()
-            })
-            
-            # Geçiş sayımlarını güncelle
-            self.update_transition_counts()
-        
+            }
+            if self.drawing_line:
+                area['type'] = AREA_LINE
+            self.area_list.append(area)
+
+        # Sayım dizisi yeni alan id'sine göre büyür
+        self._compile_zones()
+        self.update_info_panel()
         self.drawing_mode = False
+        self.drawing_line = False
         self.current_polygon = []
         
         # Frame'i güncelle
@@ -719,6 +889,7 @@ class MainVideoContainer:
                     self.editing_area_id = area_id
                     self.current_polygon = area['points'].copy()
                     self.drawing_mode = True
+                    self.drawing_line = is_line(area)
                     frame_to_show = self.current_frame if self.current_frame is not None else self.original_frame
                     if frame_to_show is not None:
                         self.update_video_frame(frame_to_show)
@@ -746,7 +917,7 @@ class MainVideoContainer:
         try:
             area_id = int(selection)
             self.area_list = [a for a in self.area_list if a['id'] != area_id]
-            self.update_transition_counts()
+            self._compile_zones()
             frame_to_show = self.current_frame if self.current_frame is not None else self.original_frame
             if frame_to_show is not None:
                 self.update_video_frame(frame_to_show)
@@ -755,18 +926,76 @@ class MainVideoContainer:
         except ValueError:
             messagebox.showerror("Hata", "Geçersiz ID!")
     
-    def update_transition_counts(self):
-        """Geçiş sayımları dictionary'sini güncelle"""
-        area_names = [area['name'] for area in self.area_list]
-        new_counts = {}
-        for a in area_names:
-            for b in area_names:
-                if a != b:
-                    key = (a, b)
-                    new_counts[key] = self.transition_counts.get(key, 0)
-        self.transition_counts = new_counts
+    def _compile_zones(self):
+        """Alanları mevcut frame boyutunda etiket maskesine derle"""
+        self.counter.compile(self.frame_width, self.frame_height)
+
+    def _frame_size(self):
+        if self.frame_width > 0 and self.frame_height > 0:
+            return (self.frame_width, self.frame_height)
+        return None
+
+    def save_preset(self):
+        """Mevcut alanları isimli ön ayar olarak kaydet (iş kuyruğu bunları kullanır).
+
+        Ön ayar derlenmiş maskesiyle birlikte yazılır. Kullanıcı onaylarsa açık
+        videonun kamerasına (klasörüne) bağlanır; aynı kameranın videoları
+        açılınca otomatik yüklenir. Paylaşılan klasörlerdeki videolar bağlanmaz.
+        """
+        if not self.area_list:
+            messagebox.showwarning("Uyarı", "Kaydedilecek alan yok!")
+            return
+        camera = camera_key(self.source_spec)
+        name = simpledialog.askstring(
+            "Alan Ön Ayarı", "Ön ayar ismini girin:",
+            initialvalue=os.path.basename(camera) if camera else ''
+        )
+        if not name:
+            return
+        if camera and not messagebox.askyesno(
+            "Kamera",
+            f"Bu ön ayar şu klasördeki videolara otomatik uygulansın mı?\n\n{camera}"
+        ):
+            camera = None
+        preset_id = save_zone_preset(
+            self.video_recorder.db_path, name.strip(), self.area_list,
+            camera=camera, frame_size=self._frame_size()
+        )
+        self.show_notification(f"Ön ayar kaydedildi: {name} (ID {preset_id})")
+
+    def _apply_preset(self, preset):
+        """Ön ayarın alanlarını ve derlenmiş maskesini etkinleştir"""
+        self.area_list = preset['area_list']
+        self.counter.compiled = preset['compiled']
+        self.occupancy.clear_tracks()
+        self.last_area_per_object = {}
+        self.last_point_per_object = {}
         self.update_info_panel()
-    
+        frame_to_show = self.current_frame if self.current_frame is not None else self.original_frame
+        if frame_to_show is not None:
+            self.update_video_frame(frame_to_show)
+
+    def load_preset(self):
+        """Kayıtlı bir ön ayarın alanlarını yükle"""
+        presets = list_zone_presets(self.video_recorder.db_path)
+        if not presets:
+            messagebox.showinfo("Bilgi", "Kayıtlı ön ayar yok")
+            return
+        name = simpledialog.askstring(
+            "Alan Ön Ayarı",
+            "Yüklenecek ön ayar:\n" + "\n".join(f"• {p}" for p in presets),
+            initialvalue=presets[0]
+        )
+        if not name:
+            return
+        preset = get_zone_preset(self.video_recorder.db_path, name=name.strip(),
+                                 frame_size=self._frame_size())
+        if preset is None:
+            messagebox.showerror("Hata", f"Ön ayar bulunamadı: {name}")
+            return
+        self._apply_preset(preset)
+        self.show_notification(f"Ön ayar yüklendi: {name}")
+
     def update_info_panel(self):
         """Bilgi panelini güncelle"""
         # Mevcut label'ları temizle
@@ -774,7 +1003,21 @@ class MainVideoContainer:
             widget.destroy()
         self.info_labels = {}
         
-        if not self.transition_counts:
+        # Tüm polygon alan çiftleri gösterilir (henüz geçiş olmayanlar 0);
+        # sayım çizgileri rota değil, yön başına geçiş olarak gösterilir
+        area_names = [area['name'] for area in self.area_list if not is_line(area)]
+        counts = self.transition_counts
+        routes = {(a, b): counts.get((a, b), 0) for a in area_names for b in area_names if a != b}
+        routes.update(counts)
+        by_class = {}
+        for (from_area, to_area, class_name), count in self.counter.class_counts().items():
+            by_class.setdefault((from_area, to_area), []).append((class_name or '?', count))
+        crossing_totals = self.counter.crossing_totals
+        lines = {(area['name'], direction): crossing_totals.get((area['name'], direction), 0)
+                 for area in self.area_list if is_line(area) for direction in (1, -1)}
+        lines.update(crossing_totals)
+
+        if not routes and not lines:
             no_data = tk.Label(
                 self.info_content,
                 text="Henüz geçiş yok",
@@ -786,8 +1029,11 @@ class MainVideoContainer:
             return
         
         # Geçiş sayımlarını göster
-        for (from_area, to_area), count in sorted(self.transition_counts.items()):
+        for (from_area, to_area), count in sorted(routes.items()):
             text = f"{from_area} → {to_area}: {count}"
+            classes = by_class.get((from_area, to_area))
+            if classes:
+                text += "  (" + ", ".join(f"{c} {n}" for c, n in sorted(classes)) + ")"
             label = tk.Label(
                 self.info_content,
                 text=text,
@@ -800,6 +1046,21 @@ class MainVideoContainer:
             )
             label.pack(fill=tk.X, padx=5, pady=2)
             self.info_labels[(from_area, to_area)] = label
+
+        for (line, direction), count in sorted(lines.items(),
+                                               key=lambda item: (item[0][0], -item[0][1])):
+            label = tk.Label(
+                self.info_content,
+                text=f"{line} ({'+' if direction > 0 else '−'}): {count}",
+                font=('Segoe UI', 9),
+                bg=self.colors['bg_medium'],
+                fg='#00ff00',
+                anchor=tk.W,
+                padx=10,
+                pady=5
+            )
+            label.pack(fill=tk.X, padx=5, pady=2)
+            self.info_labels[(line, direction)] = label
     
     def update_video_record_button_color(self):
         """Video kaydı butonunun rengini açık/kapalı durumuna göre ayarla."""
@@ -831,6 +1092,9 @@ class MainVideoContainer:
     def pause_video(self):
         """Video oynatmayı duraklat"""
         if self.is_playing:
+            # Kontrol noktasını video thread'i döngüden çıkınca yazar; burada
+            # yazılsa o an işlenen frame'in sayaçlarıyla yarışırdı
+            self._checkpoint_on_stop = True
             self.is_playing = False
             self.show_notification('Video duraklatıldı')
             
@@ -858,6 +1122,9 @@ class MainVideoContainer:
         if self.video_capture:
             self.video_capture.release()
             self.video_capture = None
+        self.source_spec = None
+
+        self.filmstrip.clear()
 
         # Frame bilgilerini sıfırla
         self.original_frame = None
@@ -879,9 +1146,11 @@ class MainVideoContainer:
         self.selected_area_id = None
 
         # Geçiş sayımlarını ve takip geçmişini sıfırla
-        self.transition_counts = {}
-        self.last_area_per_object = {}
+        self.counter.reset()
+        self.occupancy.reset()
         self.track_histories = {}
+        self.track_id_offset = 0
+        self._close_event_session(None)
 
         # Bilgi panelini güncelle (boş göster)
         self.update_info_panel()
@@ -901,9 +1170,9 @@ class MainVideoContainer:
         self.show_notification('Video sıfırlandı - Tüm alanlar ve sayımlar temizlendi')
     
     def _save_recording(self):
-        """Video kaydını kaydet"""
+        """Video kaydını kaydet, oluşturulan kayıt ID'sini döndür"""
         if not self.video_recorder.recording:
-            return
+            return None
         
         # Kullanıcıdan isim iste
         root = self.parent_frame.winfo_toplevel()
@@ -914,24 +1183,32 @@ class MainVideoContainer:
         )
         
         # Geçiş sayımlarını al
-        transition_counts = self.transition_counts.copy() if self.transition_counts else None
+        transition_counts = self.transition_counts or None
+        bucket_counts = self.bucket_counts.copy()
+        class_counts = self.counter.class_counts()
+        occupancy = self.occupancy.result()
+        crossing_counts = self.counter.crossing_counts()
         
         try:
             # Kayıt işlemini durdur ve kaydet
-            result = self.video_recorder.stop_recording(name, transition_counts)
+            result = self.video_recorder.stop_recording(
+                name, transition_counts, bucket_counts, class_counts, occupancy, crossing_counts
+            )
             
             if result:
                 self.show_notification(f"Video kaydedildi: {result['name']}")
-            else:
-                self.show_notification("Video kaydı iptal edildi")
+                return result['id']
+            self.show_notification("Video kaydı iptal edildi")
         except Exception as e:
             messagebox.showerror("Hata", f"Video kaydedilirken hata oluştu: {str(e)}")
             self.show_notification("Video kaydı başarısız")
+        return None
     
     def _save_counts_only(self):
-        """Video oluşturmadan sadece geçiş sayımlarını kaydet"""
-        if not self.transition_counts:
-            return
+        """Video oluşturmadan sadece geçiş sayımlarını kaydet, kayıt ID'sini döndür"""
+        crossing_counts = self.counter.crossing_counts()
+        if not self.transition_counts and not crossing_counts:
+            return None
         
         # Kullanıcıdan isim iste
         root = self.parent_frame.winfo_toplevel()
@@ -943,19 +1220,126 @@ class MainVideoContainer:
         
         if not name:
             self.show_notification("Sayım kaydı iptal edildi")
-            return
+            return None
         
-        transition_counts = self.transition_counts.copy()
+        transition_counts = self.transition_counts
+        bucket_counts = self.bucket_counts.copy()
+        class_counts = self.counter.class_counts()
+        occupancy = self.occupancy.result()
         
         try:
-            record_id = self.video_recorder.save_transition_counts_only(name, transition_counts)
+            record_id = self.video_recorder.save_transition_counts_only(
+                name, transition_counts, bucket_counts, class_counts, occupancy, crossing_counts
+            )
             if record_id:
                 self.show_notification(f"Sayım kaydedildi: {name}")
-            else:
-                self.show_notification("Kaydedilecek geçiş bulunamadı")
+                return record_id
+            self.show_notification("Kaydedilecek geçiş bulunamadı")
         except Exception as e:
             messagebox.showerror("Hata", f"Sayım kaydedilirken hata oluştu: {str(e)}")
             self.show_notification("Sayım kaydı başarısız")
+        return None
+
+    def _save_checkpoint(self):
+        """Konum, sayımlar, doluluk durumu, nesnelerin son alanı ve alanları kontrol noktasına yaz.
+
+        Burada sadece sözlüklerin sığ kopyası alınır; JSON'a çevirme ve
+        veritabanı yazımı olay yazıcısının thread'inde yapılır. Son kontrol
+        noktasından beri biriken doluluk örnekleri de birlikte yazılır.
+        """
+        self._last_checkpoint = time.monotonic()
+        if self.session_id is None or self.source_spec is None:
+            return
+        self.event_writer.save_checkpoint(
+            self.session_id,
+            self.source_spec,
+            self.current_frame_index,
+            self.current_timestamp_ms,
+            {**self.counter.snapshot(), 'occupancy': self.occupancy.snapshot(),
+             'frame_size': self._frame_size()},
+            [dict(area) for area in self.area_list],
+            self.occupancy.take_samples(),
+        )
+
+    def resume_from_checkpoint(self):
+        """Son kontrol noktasındaki kaynağı, alanları ve sayımları geri yükle"""
+        if self.is_playing:
+            self.show_notification("Devam etmek için önce videoyu duraklatın")
+            return
+        checkpoint = latest_checkpoint(self.video_recorder.db_path)
+        if checkpoint is None:
+            self.show_notification("Devam edilecek kontrol noktası yok")
+            return
+
+        source = checkpoint['source']
+        if not os.path.exists(source):
+            messagebox.showerror("Hata", f"Kaynak bulunamadı:\n{source}")
+            return
+        seconds = int(checkpoint['timestamp_ms'] // 1000)
+        if not messagebox.askyesno(
+            "Devam Et",
+            f"{os.path.basename(source)}\n"
+            f"Konum: {seconds // 60:02d}:{seconds % 60:02d} (frame {checkpoint['frame_index']})\n"
+            f"Kayıt zamanı: {checkpoint['updated_at']}\n\n"
+            f"Analiz bu noktadan devam etsin mi?"
+        ):
+            return
+
+        # Açık oturum başka bir analize aitse kaydedilmeden kapanır
+        if self.session_id != checkpoint['session_id']:
+            self._close_event_session(None)
+
+        self.load_source(source)
+        if not self.video_capture or not self.video_capture.isOpened():
+            return
+
+        # Kaynak farklı ölçekle açıldıysa (ör. okuma genişliği ayarı) alanlar orantılanır
+        self.area_list = scale_areas(checkpoint['area_list'],
+                                     checkpoint['counter_state']['frame_size'],
+                                     self._frame_size())
+        self._compile_zones()
+        # Zaman kovaları kontrol noktasında değil, oturumun olaylarından
+        self.event_writer.flush()
+        bucket_counts = session_bucket_counts(
+            self.video_recorder.db_path, checkpoint['session_id'],
+            checkpoint['frame_index'], self.counter.bucket_ms
+        )
+        self.counter.restore({**checkpoint['counter_state'], 'bucket_counts': bucket_counts})
+        self.occupancy.restore(checkpoint['counter_state']['occupancy'])
+        self.track_histories = {}
+        # Tracker yeniden başladıysa ID'ler 1'den başlar; eski nesnelerin
+        # son alanıyla eşleşip sahte geçiş sayılmasın
+        self.track_id_offset = max(
+            [*self.last_area_per_object, *self.last_point_per_object], default=-1
+        ) + 1
+
+        # Kontrol noktasından sonra yazılmış olaylar tekrar oluşacak
+        self.session_id = checkpoint['session_id']
+        self.event_writer.rewind_session(self.session_id, checkpoint['frame_index'])
+
+        self.current_frame_index = checkpoint['frame_index']
+        self.current_timestamp_ms = checkpoint['timestamp_ms']
+        next_frame = checkpoint['frame_index'] + 1
+        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, next_frame)
+        ret, frame = self.video_capture.read()
+        if ret:
+            self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, next_frame)
+            self.original_frame = frame.copy()
+            self.current_frame = self.draw_areas_on_frame(frame)
+            self.update_video_frame(self.current_frame)
+            self.filmstrip.set_position(next_frame)
+        self.update_info_panel()
+        self.show_notification("Kontrol noktası yüklendi - devam etmek için Oynat'a basın")
+
+    def _close_event_session(self, record_id):
+        """Aktif analiz oturumunu kapat; olayları kayda bağla veya sil"""
+        if self.session_id is None:
+            return
+        if record_id:
+            self.event_writer.link_session(self.session_id, record_id)
+        else:
+            self.event_writer.discard_session(self.session_id)
+        self.session_id = None
         
     def on_canvas_resize(self, event):
         """Canvas boyutu değiştiğinde"""
@@ -993,7 +1377,11 @@ class MainVideoContainer:
         
     def cleanup(self):
         """Temizlik işlemleri"""
+        # Video thread'i kontrol noktasını yazıp çıksın
+        self._checkpoint_on_stop = True
         self.is_playing = False
+        if self.video_thread is not None and self.video_thread.is_alive():
+            self.video_thread.join(timeout=2.0)
         
         # Uygulama kapanırken popup/isim sormadan sadece kaynakları temizle.
         try:
@@ -1006,5 +1394,14 @@ class MainVideoContainer:
             self.video_capture.release()
             self.video_capture = None
         
+        # Oturum silinmez: son durum kontrol noktasına yazılır, olaylar ve
+        # kontrol noktası sonraki açılışta "Devam Et" için saklanır.
+        # Yazıcı durdurulurken bekleyenler yazılır. Video oynamıyorduysa
+        # kontrol noktası burada yazılır.
+        if self._checkpoint_on_stop:
+            self._checkpoint_on_stop = False
+            self._save_checkpoint()
+        self.event_writer.stop()
+
         # Video kayıt sistemini temizle
         self.video_recorder.cleanup()
\ No newline at end of file
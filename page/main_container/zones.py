@@ -0,0 +1,176 @@
+import hashlib
+import json
+import zlib
+
+import cv2
+import numpy as np
+
+# Etiket maskesi uint8: 0 = alan yok, i + 1 = area_list[i]
+MAX_ZONES = 255
+
+# area_list elemanı türleri: polygon (varsayılan) veya iki noktalı sayım çizgisi
+AREA_POLYGON = 'polygon'
+AREA_LINE = 'line'
+
+
+def is_line(area):
+    return area.get('type') == AREA_LINE
+
+
+def area_to_dict(area):
+    """Alanı JSON'a yazılabilir sözlüğe çevir (polygon'larda 'type' yazılmaz)"""
+    data = {'id': area['id'], 'name': area['name'], 'points': [list(p) for p in area['points']]}
+    if is_line(area):
+        data['type'] = AREA_LINE
+    return data
+
+
+def area_from_dict(data):
+    """area_to_dict'in tersi"""
+    area = {'id': data['id'], 'name': data['name'],
+            'points': [tuple(p) for p in data['points']]}
+    if data.get('type') == AREA_LINE:
+        area['type'] = AREA_LINE
+    return area
+
+
+def scale_areas(area_list, from_size, to_size):
+    """Alan noktalarını from_size (genişlik, yükseklik) koordinatlarından to_size'a orantıla.
+
+    Boyutlardan biri bilinmiyorsa veya aynıysa liste olduğu gibi döner.
+    """
+    if not from_size or not to_size or tuple(from_size) == tuple(to_size):
+        return area_list
+    sx = to_size[0] / from_size[0]
+    sy = to_size[1] / from_size[1]
+    return [
+        {**area, 'points': [(int(round(x * sx)), int(round(y * sy))) for x, y in area['points']]}
+        for area in area_list
+    ]
+
+
+def zones_hash(area_list, width, height):
+    """Alan geometrisi + frame boyutu için kararlı özet (önbellek anahtarı)"""
+    canonical = json.dumps({
+        'size': [int(width), int(height)],
+        'zones': [
+            [a['id'], a['name'], [[int(x), int(y)] for x, y in a['points']]]
+            + ([AREA_LINE] if is_line(a) else [])
+            for a in area_list
+        ],
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def line_segments(area_list):
+    """Sayım çizgileri: (isimler, M x 2 x 2 dizi)"""
+    lines = [a for a in area_list if is_line(a)]
+    segments = np.array([a['points'][:2] for a in lines], np.float64).reshape(-1, 2, 2)
+    return tuple(a['name'] for a in lines), segments
+
+
+def segment_crossings(starts, ends, segments):
+    """Hareket parçaları (starts[i] → ends[i]) ile çizgilerin kesişimleri.
+
+    Tüm track'ler × tüm çizgiler tek seferde (N x M) hesaplanır. Parça
+    başı hariç, sonu dahildir (0 < t <= 1): çizgi üzerinde duran bir nokta
+    bir kez sayılır. Yön, çizginin ilk noktasından ikincisine bakıldığında
+    (görüntü koordinatları, y aşağı) soldan sağa geçişte +1, tersinde -1'dir.
+
+    Returns:
+        (track indeksleri, çizgi indeksleri, t, yönler) — her track için t'ye göre sıralı
+    """
+    starts = np.asarray(starts, np.float64).reshape(-1, 1, 2)
+    moves = np.asarray(ends, np.float64).reshape(-1, 1, 2) - starts
+    if not len(starts) or not len(segments):
+        empty = np.zeros(0, np.int64)
+        return empty, empty, np.zeros(0), empty
+    line_starts = segments[None, :, 0]
+    line_dirs = segments[None, :, 1] - line_starts
+
+    def cross(a, b):
+        return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+    offset = line_starts - starts
+    denom = cross(moves, line_dirs)
+    parallel = denom == 0
+    denom = np.where(parallel, 1.0, denom)
+    t = cross(offset, line_dirs) / denom  # hareket parçası üzerindeki konum
+    u = cross(offset, moves) / denom  # çizgi üzerindeki konum
+    hit = ~parallel & (t > 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    track_index, line_index = np.nonzero(hit)
+    t = t[track_index, line_index]
+    # cross(hareket, çizgi) < 0: hareket çizginin sağına doğru
+    directions = np.where(denom[track_index, line_index] < 0, 1, -1)
+    order = np.lexsort((t, track_index))
+    return track_index[order], line_index[order], t[order], directions[order]
+
+
+class CompiledZones:
+    """Alanların rasterize edilmiş hali: etiket maskesi, sınır kutuları ve özet.
+
+    Nokta sorgusu maskeden tek okuma ile yapılır (polygon testi yok).
+    Alanlar çakışırsa area_of ile aynı şekilde listedeki ilk alan kazanır.
+    Sayım çizgileri maskeye çizilmez; uç noktaları `lines` dizisinde tutulur.
+    """
+
+    def __init__(self, area_list, width, height, mask=None, bboxes=None, digest=None):
+        if len(area_list) > MAX_ZONES:
+            raise ValueError(f"En fazla {MAX_ZONES} alan derlenebilir")
+        self.width = int(width)
+        self.height = int(height)
+        self.ids = tuple(a['id'] for a in area_list)
+        self.names = tuple(a['name'] for a in area_list)
+        self.hash = digest or zones_hash(area_list, width, height)
+        self.line_names, self.lines = line_segments(area_list)
+        if mask is None:
+            mask, bboxes = self._rasterize(area_list)
+        self.mask = mask
+        self.bboxes = [tuple(b) for b in bboxes]
+
+    def _rasterize(self, area_list):
+        mask = np.zeros((self.height, self.width), np.uint8)
+        bboxes = []
+        for area in area_list:
+            points = np.array(area['points'], np.int32)
+            x1, y1 = points.min(axis=0)
+            x2, y2 = points.max(axis=0)
+            bboxes.append((int(x1), int(y1), int(x2), int(y2)))
+        # Tersten çiz: öndeki alanlar arkadakilerin üzerine yazar
+        for label in range(len(area_list), 0, -1):
+            if is_line(area_list[label - 1]):
+                continue
+            points = np.array(area_list[label - 1]['points'], np.int32)
+            cv2.fillPoly(mask, [points], label)
+        return mask, bboxes
+
+    def label_at(self, point):
+        """Noktanın etiket değeri (0 = alan yok)"""
+        x, y = int(point[0]), int(point[1])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.mask[y, x])
+        return 0
+
+    def lookup(self, point):
+        """Noktanın içinde olduğu alanın adı (yoksa None)"""
+        label = self.label_at(point)
+        return self.names[label - 1] if label else None
+
+    def labels_at(self, points):
+        """Çok sayıda nokta için etiketler (N x 2 dizi → N etiket, vektörel)"""
+        points = np.asarray(points, np.int64).reshape(-1, 2)
+        labels = np.zeros(len(points), np.uint8)
+        inside = ((points[:, 0] >= 0) & (points[:, 0] < self.width)
+                  & (points[:, 1] >= 0) & (points[:, 1] < self.height))
+        labels[inside] = self.mask[points[inside, 1], points[inside, 0]]
+        return labels
+
+    def mask_blob(self):
+        """Veritabanında saklanacak sıkıştırılmış maske"""
+        return zlib.compress(self.mask.tobytes(), 6)
+
+    @classmethod
+    def from_blob(cls, area_list, width, height, blob, bboxes, digest):
+        mask = np.frombuffer(zlib.decompress(blob), np.uint8).reshape(int(height), int(width))
+        return cls(area_list, width, height, mask=mask, bboxes=bboxes, digest=digest)
@@ -118,6 +118,7 @@ class SettingsContainer:
         # (key, label) — ileride yeni sekmeler buraya eklenir
         tab_defs = [
             ('model', '🤖  Model Seçimi'),
+            ('decoder', '🎞️  Video Okuma'),
         ]
 
         self.tab_buttons: dict[str, tk.Button] = {}
@@ -144,6 +145,7 @@ class SettingsContainer:
             self.tab_frames[key] = frame
 
         self._build_model_tab(self.tab_frames['model'])
+        self._build_decoder_tab(self.tab_frames['decoder'])
 
     def _show_tab(self, key: str):
         for f in self.tab_frames.values():
@@ -343,6 +345,89 @@ class SettingsContainer:
         self.active_label.configure(text=f"Aktif model: {self._selected_model}")
         self._show_toast(f"✅ Model kaydedildi: {self._selected_model}")
 
+    # ── Video okuma sekmesi ────────────────────────────────────
+
+    def _build_decoder_tab(self, parent: tk.Frame):
+        tk.Label(
+            parent,
+            text="Video Okuma (Analiz)",
+            font=('Segoe UI', 14, 'bold'),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['accent']
+        ).pack(anchor='w', padx=30, pady=(30, 6))
+
+        tk.Label(
+            parent,
+            text="FFmpeg seçilirse video FFmpeg'in thread'lerinde çözülür ve\n"
+                 "doğrudan aşağıdaki genişliğe ölçeklenir (4K / H.265 için daha hızlı).\n"
+                 "Ayar bir sonraki video yüklemesinde geçerli olur.",
+            font=('Segoe UI', 9),
+            bg=self.colors['bg_dark'],
+            fg='#888888',
+            justify=tk.LEFT
+        ).pack(anchor='w', padx=30, pady=(0, 16))
+
+        current = self.get_capture_settings()
+        self.backend_var = tk.StringVar(value=current['backend'])
+        for value, text in (('opencv', 'OpenCV (varsayılan)'), ('ffmpeg', 'FFmpeg')):
+            tk.Radiobutton(
+                parent,
+                text=text,
+                value=value,
+                variable=self.backend_var,
+                font=('Segoe UI', 10),
+                bg=self.colors['bg_dark'],
+                fg=self.colors['text'],
+                selectcolor=self.colors['bg_medium'],
+                activebackground=self.colors['bg_dark'],
+                activeforeground=self.colors['text']
+            ).pack(anchor='w', padx=40)
+
+        form = tk.Frame(parent, bg=self.colors['bg_dark'])
+        form.pack(anchor='w', padx=40, pady=(12, 0))
+
+        self.scale_width_var = tk.StringVar(value=str(current['scale_width'] or ''))
+        self.threads_var = tk.StringVar(value=str(current['threads']))
+        for row, (label, var) in enumerate((
+            ("Ölçekleme genişliği (px, boş = orijinal):", self.scale_width_var),
+            ("Çözücü thread sayısı (0 = otomatik):", self.threads_var),
+        )):
+            tk.Label(
+                form, text=label, font=('Segoe UI', 10),
+                bg=self.colors['bg_dark'], fg=self.colors['text']
+            ).grid(row=row, column=0, sticky='w', pady=4)
+            tk.Entry(form, textvariable=var, width=8).grid(
+                row=row, column=1, sticky='w', padx=(8, 0), pady=4
+            )
+
+        apply_btn = tk.Button(
+            parent,
+            text="✅  Kaydet",
+            font=('Segoe UI', 10, 'bold'),
+            bg=self.colors['accent'],
+            fg='white',
+            relief=tk.FLAT,
+            padx=20, pady=6,
+            cursor='hand2',
+            command=self._apply_decoder
+        )
+        apply_btn.pack(anchor='w', padx=40, pady=20)
+        self._hover(apply_btn, self.colors['accent'], self.colors['accent_hover'])
+
+    def _apply_decoder(self):
+        """Video okuma ayarlarını DB'ye kaydet."""
+        try:
+            width_text = self.scale_width_var.get().strip()
+            scale_width = int(width_text) if width_text else 0
+            threads = int(self.threads_var.get().strip() or 0)
+        except ValueError:
+            self._show_toast("⚠️ Genişlik ve thread sayısı tam sayı olmalı")
+            return
+        db_set('capture_backend', self.backend_var.get())
+        db_set('capture_scale_width', str(max(0, scale_width)))
+        db_set('capture_threads', str(max(0, threads)))
+        self._show_toast("✅ Video okuma ayarları kaydedildi")
+
     # ── Yardımcılar ────────────────────────────────────────────
 
     def _scan_models(self) -> list[str]:
@@ -402,5 +487,20 @@ class SettingsContainer:
         """
         return db_get('active_model')
 
+    @staticmethod
+    def get_capture_settings() -> dict:
+        """Analiz için video okuma ayarları (backend, scale_width, threads)."""
+        def as_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return 0
+
+        return {
+            'backend': db_get('capture_backend') or 'opencv',
+            'scale_width': as_int(db_get('capture_scale_width')) or None,
+            'threads': as_int(db_get('capture_threads')),
+        }
+
     def cleanup(self):
         pass
\ No newline at end of file
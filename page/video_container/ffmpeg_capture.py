@@ -0,0 +1,184 @@
+import shutil
+import subprocess
+
+import cv2
+import numpy as np
+
+
+def ffmpeg_available():
+    """ffmpeg çalıştırılabilir dosyası PATH'te mi?"""
+    return shutil.which("ffmpeg") is not None
+
+
+class FFmpegCapture:
+    """ffmpeg alt süreciyle çözen, cv2.VideoCapture benzeri okuyucu.
+
+    Çözme FFmpeg'in kendi thread'lerinde yapılır ve frame'ler `scale` filtresi
+    ile doğrudan hedef çözünürlüğe indirilir; pipe'tan ham BGR olarak okunur.
+    read(image=buf) verilen tamponu doldurur (ek ayırma/kopya yok).
+
+    Desteklenen API: isOpened, read, grab, retrieve, get, set, release.
+    get(CAP_PROP_FRAME_WIDTH/HEIGHT) ölçeklenmiş boyutu döndürür.
+    """
+
+    def __init__(self, path, scale_width=None, threads=0):
+        self.path = path
+        self.threads = threads
+        self._process = None
+        self._position = 0
+        self._scratch = None
+        self._opened = False
+
+        # Kaynak özellikleri (sadece başlık bilgisi)
+        probe = cv2.VideoCapture(path)
+        try:
+            self._opened = probe.isOpened()
+            src_width = int(probe.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+            src_height = int(probe.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+            self.fps = probe.get(cv2.CAP_PROP_FPS) or 30.0
+            self.frame_count = int(probe.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        finally:
+            probe.release()
+
+        if not self._opened or not src_width or not src_height:
+            self._opened = False
+            return
+
+        if scale_width and src_width > scale_width:
+            self.width = int(scale_width) // 2 * 2
+            self.height = int(round(src_height * self.width / src_width / 2)) * 2
+        else:
+            self.width, self.height = src_width, src_height
+        self._frame_bytes = self.width * self.height * 3
+
+        self._start(0)
+
+    def _start(self, frame_index):
+        """ffmpeg'i verilen frame'den başlat (öncekini kapatır)"""
+        self._stop_process()
+        cmd = ["ffmpeg", "-loglevel", "error", "-nostdin", "-threads", str(self.threads)]
+        if frame_index > 0:
+            # -i'den önce -ss: hızlı (anahtar kare) konumlanma + hassas çözme
+            cmd += ["-ss", f"{frame_index / self.fps:.6f}"]
+        cmd += [
+            "-i", self.path,
+            "-map", "0:v:0", "-an", "-sn",
+            "-vf", f"scale={self.width}:{self.height}:flags=area",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1",
+        ]
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
+            )
+        except OSError as e:
+            print(f"ffmpeg başlatılamadı: {e}")
+            self._process = None
+            self._opened = False
+            return
+        self._position = frame_index
+
+    def _stop_process(self):
+        if self._process is not None:
+            try:
+                self._process.stdout.close()
+                self._process.kill()
+                self._process.wait(timeout=2)
+            except Exception:
+                pass
+            self._process = None
+
+    def _read_into(self, buf):
+        view = memoryview(buf).cast("B")
+        filled = 0
+        while filled < self._frame_bytes:
+            count = self._process.stdout.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+        return True
+
+    def _buffer(self, image):
+        shape = (self.height, self.width, 3)
+        if image is not None and image.shape == shape and image.dtype == np.uint8 \
+                and image.flags["C_CONTIGUOUS"]:
+            return image
+        return np.empty(shape, np.uint8)
+
+    def isOpened(self):
+        return self._opened and self._process is not None
+
+    def read(self, image=None):
+        """Sıradaki frame'i oku: (ret, frame)"""
+        if not self.isOpened():
+            return False, None
+        buf = self._buffer(image)
+        if not self._read_into(buf):
+            return False, None
+        self._position += 1
+        return True, buf
+
+    def grab(self):
+        """Frame'i geç (iç tampona okur; retrieve ile alınabilir)"""
+        if not self.isOpened():
+            return False
+        self._scratch = self._buffer(self._scratch)
+        if not self._read_into(self._scratch):
+            return False
+        self._position += 1
+        return True
+
+    def retrieve(self, image=None):
+        if self._scratch is None:
+            return False, None
+        if image is not None:
+            buf = self._buffer(image)
+            np.copyto(buf, self._scratch)
+            return True, buf
+        return True, self._scratch
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width) if self._opened else 0.0
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height) if self._opened else 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            # Son okunan frame'in zamanı (OpenCV ile aynı anlam)
+            return max(0, self._position - 1) * 1000.0 / self.fps
+        return 0.0
+
+    def set(self, prop, value):
+        if not self._opened:
+            return False
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            frame_index = max(0, int(value))
+        elif prop == cv2.CAP_PROP_POS_MSEC:
+            frame_index = max(0, int(round(value * self.fps / 1000.0)))
+        else:
+            return False
+        if frame_index != self._position:
+            self._start(frame_index)
+        return True
+
+    def release(self):
+        self._stop_process()
+        self._opened = False
+
+
+def open_capture(path, backend="opencv", scale_width=None, threads=0):
+    """Ayarlara göre capture aç (FFmpeg yoksa OpenCV'ye düşer)"""
+    if backend == "ffmpeg":
+        if ffmpeg_available():
+            capture = FFmpegCapture(path, scale_width=scale_width, threads=threads)
+            if capture.isOpened():
+                return capture
+            capture.release()
+            print("FFmpeg ile açılamadı, OpenCV kullanılacak")
+        else:
+            print("ffmpeg bulunamadı, OpenCV kullanılacak")
+    return cv2.VideoCapture(path)
@@ -0,0 +1,231 @@
+import os
+import hashlib
+import queue
+import threading
+import tkinter as tk
+
+import cv2
+from PIL import Image, ImageTk
+
+from .proxy import find_proxy
+from .seek import FrameSeeker, load_keyframe_index
+
+FILMSTRIP_DIR = os.path.join("dosyalar", "cache", "filmstrip")
+# Şerit üzerindeki karo sayısı ve diskte saklanan karo boyutu
+TILE_COUNT = 24
+TILE_SIZE = (128, 72)
+STRIP_HEIGHT = 60
+
+
+def _cache_path(video_path, cache_dir=FILMSTRIP_DIR):
+    stat = os.stat(video_path)
+    key = (f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|"
+           f"{TILE_COUNT}|{TILE_SIZE[0]}x{TILE_SIZE[1]}")
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.jpg")
+
+
+def sample_frames(frame_count, tile_count=TILE_COUNT):
+    """Karoların gösterdiği frame indeksleri (eşit aralıklı)"""
+    if frame_count <= 0:
+        return []
+    count = min(tile_count, frame_count)
+    return [int(i * frame_count / count) for i in range(count)]
+
+
+def generate_filmstrip(video_path, frame_count, tile_callback=None, stop_event=None):
+    """Videodan eşit aralıklı karolar üret.
+
+    Varsa küçük proxy okunur. Her örneğe anahtar kare indeksiyle atlanır
+    (en yakın önceki anahtar kareden kısa grab()); bütün video çözülmez.
+    Her karo hazır olduğunda tile_callback(i, PIL.Image) çağrılır.
+
+    Returns:
+        list[PIL.Image]: Karolar (yarıda kesildiyse None)
+    """
+    samples = sample_frames(frame_count)
+    source_path = find_proxy(video_path) or video_path
+    index = load_keyframe_index(source_path)
+    # Proxy'nin frame sayısı farklıysa örnekleri orantıla
+    scale = 1.0
+    if source_path != video_path and index.get("frame_count"):
+        scale = index["frame_count"] / frame_count
+
+    cap = cv2.VideoCapture(source_path)
+    seeker = FrameSeeker(cap, index, cache_size=1)
+    tiles = []
+    try:
+        for i, target in enumerate(samples):
+            if stop_event is not None and stop_event.is_set():
+                return None
+            frame = seeker.seek(int(target * scale))
+            if frame is None:
+                break
+            image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            image = image.resize(TILE_SIZE, Image.BILINEAR)
+            tiles.append(image)
+            if tile_callback:
+                tile_callback(i, image)
+    finally:
+        cap.release()
+    return tiles
+
+
+def load_filmstrip(video_path, frame_count, tile_callback=None, stop_event=None,
+                   cache_dir=FILMSTRIP_DIR):
+    """Önbellekteki şeridi oku, yoksa üretip tek bir JPEG olarak kaydet"""
+    path = _cache_path(video_path, cache_dir)
+    if os.path.exists(path):
+        with Image.open(path) as sprite:
+            sprite.load()
+            count = sprite.width // TILE_SIZE[0]
+            tiles = [
+                sprite.crop((i * TILE_SIZE[0], 0, (i + 1) * TILE_SIZE[0], TILE_SIZE[1]))
+                for i in range(count)
+            ]
+        if tile_callback:
+            for i, tile in enumerate(tiles):
+                tile_callback(i, tile)
+        return tiles
+
+    tiles = generate_filmstrip(video_path, frame_count, tile_callback, stop_event)
+    if tiles:
+        sprite = Image.new("RGB", (TILE_SIZE[0] * len(tiles), TILE_SIZE[1]))
+        for i, tile in enumerate(tiles):
+            sprite.paste(tile, (i * TILE_SIZE[0], 0))
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        sprite.save(tmp_path, "JPEG", quality=80)
+        os.replace(tmp_path, path)
+    return tiles
+
+
+class Filmstrip:
+    """Canvas altında zaman şeridi; karoya tıklamak o konuma gider.
+
+    Karolar arka plan thread'inde üretilir ve hazır oldukça gösterilir.
+    """
+
+    def __init__(self, parent, colors, on_seek):
+        self.colors = colors
+        self.on_seek = on_seek
+        self.canvas = tk.Canvas(
+            parent, height=STRIP_HEIGHT, bg=colors['bg_dark'],
+            highlightthickness=0, cursor='hand2'
+        )
+        self.canvas.bind('<Configure>', lambda e: self._render())
+        self.canvas.bind('<Button-1>', self._on_click)
+
+        self.samples = []
+        self.frame_count = 0
+        self.tiles = {}  # karo indeksi -> PIL.Image
+        self._photos = []
+        self._position = None
+        self._results = queue.Queue()
+        self._stop_event = None
+        self._generation = 0
+        self._poll()
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_video(self, video_path, frame_count):
+        """Yeni video için şeridi (önbellekten veya arka planda) hazırla"""
+        self.clear()
+        self.frame_count = frame_count
+        self.samples = sample_frames(frame_count)
+        if not self.samples:
+            return
+
+        self._generation += 1
+        generation = self._generation
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+
+        def worker():
+            try:
+                load_filmstrip(
+                    video_path, frame_count,
+                    tile_callback=lambda i, tile: self._results.put((generation, i, tile)),
+                    stop_event=stop_event,
+                )
+            except Exception as e:
+                print(f"Zaman şeridi oluşturulamadı: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
+        self._render()
+
+    def clear(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+        self._generation += 1
+        self.samples = []
+        self.tiles = {}
+        self._position = None
+        self._render()
+
+    def set_position(self, frame_index):
+        """Oynatma konumunu şerit üzerinde işaretle"""
+        self._position = frame_index
+        self._draw_playhead()
+
+    def _tile_width(self):
+        if not self.samples:
+            return 0
+        return max(1, self.canvas.winfo_width() / len(self.samples))
+
+    def _poll(self):
+        changed = False
+        try:
+            while True:
+                generation, i, tile = self._results.get_nowait()
+                if generation == self._generation:
+                    self.tiles[i] = tile
+                    changed = True
+        except queue.Empty:
+            pass
+        if changed:
+            self._render()
+        try:
+            self.canvas.after(100, self._poll)
+        except tk.TclError:
+            pass
+
+    def _render(self):
+        self.canvas.delete('all')
+        self._photos = []
+        tile_width = self._tile_width()
+        if not tile_width:
+            return
+        height = STRIP_HEIGHT
+        width = max(1, int(tile_width) - 2)
+        for i in range(len(self.samples)):
+            x = int(i * tile_width)
+            tile = self.tiles.get(i)
+            if tile is None:
+                self.canvas.create_rectangle(
+                    x + 1, 1, x + width, height - 1,
+                    fill=self.colors['bg_medium'], outline=''
+                )
+                continue
+            photo = ImageTk.PhotoImage(tile.resize((width, height - 2), Image.BILINEAR))
+            self._photos.append(photo)
+            self.canvas.create_image(x + 1, 1, anchor=tk.NW, image=photo)
+        self._draw_playhead()
+
+    def _draw_playhead(self):
+        self.canvas.delete('playhead')
+        if self._position is None or self.frame_count <= 0:
+            return
+        x = int(self._position / self.frame_count * self.canvas.winfo_width())
+        self.canvas.create_line(
+            x, 0, x, STRIP_HEIGHT, fill=self.colors['accent'], width=2, tags='playhead'
+        )
+
+    def _on_click(self, event):
+        tile_width = self._tile_width()
+        if not tile_width:
+            return
+        i = min(len(self.samples) - 1, int(event.x // tile_width))
+        self.on_seek(self.samples[i])
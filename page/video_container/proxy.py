@@ -0,0 +1,160 @@
+import os
+import hashlib
+import queue
+import shutil
+import subprocess
+import threading
+
+import cv2
+
+PROXY_DIR = os.path.join("dosyalar", "cache", "proxy")
+# Proxy yüksekliği (genişlik en-boy oranına göre)
+PROXY_HEIGHT = 360
+# FFmpeg ile üretilen proxy'lerde iki anahtar kare arası en fazla frame
+PROXY_GOP = 10
+
+
+# Proxy uzantıları: FFmpeg ile H.264 (.mp4), yoksa her karesi anahtar kare olan MJPG (.avi)
+PROXY_EXTENSIONS = (".mp4", ".avi")
+
+
+def proxy_path(video_path, proxy_dir=PROXY_DIR):
+    """Videonun proxy dosyasının yolu (video değişirse yol da değişir).
+
+    Diskte hangi uzantıyla üretilmişse o döner; yoksa üretilecek yol
+    (uzantı yalnızca burada, FFmpeg'in o anki varlığına göre seçilir).
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{PROXY_HEIGHT}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    for ext in PROXY_EXTENSIONS:
+        path = os.path.join(proxy_dir, f"{digest}{ext}")
+        if os.path.exists(path):
+            return path
+    ext = ".mp4" if shutil.which("ffmpeg") else ".avi"
+    return os.path.join(proxy_dir, f"{digest}{ext}")
+
+
+def find_proxy(video_path, proxy_dir=PROXY_DIR):
+    """Hazır proxy varsa yolunu, yoksa None döndür"""
+    path = proxy_path(video_path, proxy_dir)
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+def build_proxy(video_path, target_path):
+    """Düşük çözünürlüklü, sık anahtar kareli proxy kopya üret.
+
+    FFmpeg kuruluysa kısa GOP'lu H.264 kullanılır; değilse OpenCV ile MJPG
+    (her kare bağımsız) yazılır. Dosya önce geçici isimle yazılır, bitince
+    yerine taşınır; yarım kalan proxy kullanılmaz.
+    """
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    root, ext = os.path.splitext(target_path)
+    tmp_path = f"{root}.tmp{ext}"
+
+    if ext == ".mp4":
+        cmd = [
+            "ffmpeg", "-y", "-loglevel", "error", "-i", video_path,
+            "-an", "-vf", f"scale=-2:{PROXY_HEIGHT}",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "28",
+            "-g", str(PROXY_GOP), "-keyint_min", str(PROXY_GOP),
+            "-movflags", "+faststart", tmp_path,
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode(errors="ignore").strip())
+    else:
+        _build_proxy_opencv(video_path, tmp_path)
+
+    os.replace(tmp_path, target_path)
+    return target_path
+
+
+def _build_proxy_opencv(video_path, tmp_path):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError("Video açılamadı")
+    writer = None
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            height, width = frame.shape[:2]
+            if height > PROXY_HEIGHT:
+                new_width = int(width * PROXY_HEIGHT / height) // 2 * 2
+                frame = cv2.resize(frame, (new_width, PROXY_HEIGHT), interpolation=cv2.INTER_AREA)
+            if writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*"MJPG")
+                writer = cv2.VideoWriter(tmp_path, fourcc, fps, (frame.shape[1], frame.shape[0]))
+            writer.write(frame)
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+    if writer is None:
+        raise RuntimeError("Video boş")
+
+
+class ProxyBuilder:
+    """Proxy dosyalarını tek bir arka plan thread'inde sırayla üretir.
+
+    `progress` kuyruğuna (video_path, proxy_path veya None, kalan iş sayısı)
+    konur; UI bunu after() ile okur.
+    """
+
+    def __init__(self, proxy_dir=PROXY_DIR):
+        self.proxy_dir = proxy_dir
+        self.progress = queue.Queue()
+        self._jobs = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, video_paths):
+        """Proxy'si olmayan videoları kuyruğa ekle; eklenen sayıyı döndür"""
+        added = 0
+        for video_path in video_paths:
+            with self._lock:
+                if video_path in self._queued or find_proxy(video_path, self.proxy_dir):
+                    continue
+                self._queued.add(video_path)
+            self._jobs.put(video_path)
+            added += 1
+        return added
+
+    def pending(self):
+        with self._lock:
+            return len(self._queued)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                video_path = self._jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            result = None
+            try:
+                target = proxy_path(video_path, self.proxy_dir)
+                if target and not os.path.exists(target):
+                    result = build_proxy(video_path, target)
+                else:
+                    result = target
+            except Exception as e:
+                print(f"Proxy oluşturulamadı ({video_path}): {e}")
+            with self._lock:
+                self._queued.discard(video_path)
+                remaining = len(self._queued)
+            self.progress.put((video_path, result, remaining))
+
+    def stop(self):
+        """Kuyruktaki işleri bırak; çalışan iş bitince thread sonlanır"""
+        self._stop.set()
@@ -0,0 +1,98 @@
+import queue
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Çözülüp kuyrukta bekleyebilecek frame sayısı
+PREFETCH_FRAMES = 3
+# Tüketiciye verilmiş, henüz havuza dönmemiş frame sayısı.
+# read() bir frame'i ancak `hold` okuma sonra geri alır; böylece UI'nin o an
+# çizdiği frame üzerine yazılmaz.
+HOLD_FRAMES = 2
+
+
+class PrefetchReader:
+    """Capture'dan ayrı bir thread'de önceden okuyan, tamponları yeniden kullanan okuyucu.
+
+    Tamponlar başta bir kez ayrılır ve `cap.read(image=buf)` ile doldurulur;
+    her frame için yeni dizi ayrılmaz ve kopya yapılmaz. read() ile verilen
+    frame, sonraki HOLD_FRAMES okumaya kadar geçerlidir; başka bir thread'e
+    (ör. UI) verilecek ya da daha uzun saklanacaksa çağıran kopyalamalıdır.
+
+    Kullanım cv2.VideoCapture.read() ile aynıdır:
+        reader = PrefetchReader(cap)
+        reader.start()
+        ret, frame = reader.read()   # reader.frame_index, reader.timestamp_ms
+        reader.stop()                # capture okunmamış ilk frame'e geri konur
+    """
+
+    def __init__(self, capture, prefetch=PREFETCH_FRAMES, hold=HOLD_FRAMES):
+        self.capture = capture
+        self.hold = hold
+        self.frame_index = -1
+        self.timestamp_ms = 0.0
+
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        self._held = deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._decoded_index = -1
+
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        for _ in range(prefetch + hold + 1):
+            # Boyut bilinmiyorsa ilk okumada decoder ayırır, sonra o tampon dolaşır
+            buf = np.empty((height, width, 3), np.uint8) if width and height else None
+            self._free.put(buf)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                buf = self._free.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if buf is None:
+                ret, frame = self.capture.read()
+            else:
+                ret, frame = self.capture.read(image=buf)
+            if not ret:
+                self._ready.put(None)  # Video sonu
+                return
+            index = int(self.capture.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+            timestamp_ms = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+            self._decoded_index = index
+            self._ready.put((index, timestamp_ms, frame))
+
+    def read(self):
+        """Sıradaki frame: (ret, frame). Video bittiyse (False, None)."""
+        item = self._ready.get()
+        if item is None:
+            self._ready.put(None)  # Sonraki çağrılar da bitişi görsün
+            return False, None
+
+        self.frame_index, self.timestamp_ms, frame = item
+        self._held.append(frame)
+        while len(self._held) > self.hold:
+            self._free.put(self._held.popleft())
+        return True, frame
+
+    def stop(self):
+        """Thread'i durdur ve capture'ı tüketilmemiş ilk frame'e geri konumla.
+
+        Okuyan (tüketici) thread'den çağrılmalıdır.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._decoded_index > self.frame_index:
+            # Önceden çözülüp gösterilmeyen frame'ler kaybolmasın
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, self.frame_index + 1)
@@ -0,0 +1,220 @@
+import os
+import bisect
+import hashlib
+import json
+import shutil
+import subprocess
+from collections import OrderedDict
+
+import cv2
+
+INDEX_DIR = os.path.join("dosyalar", "cache", "keyframes")
+# Oynatma konumu etrafında bellekte tutulacak çözülmüş frame'ler (sayı ve bayt sınırı)
+FRAME_CACHE_SIZE = 32
+FRAME_CACHE_BYTES = 256 * 1024 * 1024
+# Anahtar kare bilinmiyorsa ileri grab() ile gidilecek en fazla frame;
+# daha uzak hedeflerde OpenCV'nin kendi seek'i kullanılır
+MAX_FORWARD_GRAB = 300
+
+
+def _index_path(video_path, index_dir=INDEX_DIR):
+    stat = os.stat(video_path)
+    key = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(index_dir, f"{digest}.json")
+
+
+def _probe_keyframes(video_path, fps):
+    """ffprobe ile paket başlıklarından anahtar kare indekslerini oku (frame çözmeden)"""
+    if not shutil.which("ffprobe") or fps <= 0:
+        return None
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+
+    start = None
+    keyframe_times = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(",")
+        try:
+            pts = float(pts_time)
+        except ValueError:
+            continue
+        start = pts if start is None else min(start, pts)
+        if "K" in flags:
+            keyframe_times.append(pts)
+    if start is None:
+        return None
+    return sorted({int(round((pts - start) * fps)) for pts in keyframe_times})
+
+
+def build_keyframe_index(video_path):
+    """Videonun anahtar kare/zaman indeksini oluştur.
+
+    Dönen sözlük: fps, frame_count ve keyframes. keyframes None ise her frame
+    bağımsızdır (ör. MJPG proxy); boş liste anahtar karelerin bilinmediğini
+    gösterir.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC) or 0)
+    finally:
+        cap.release()
+
+    codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).lower()
+    if codec == "mjpg":
+        keyframes = None
+    else:
+        keyframes = _probe_keyframes(video_path, fps) or []
+    return {"fps": fps, "frame_count": frame_count, "keyframes": keyframes}
+
+
+def load_keyframe_index(video_path, index_dir=INDEX_DIR):
+    """İndeksi diskten oku; yoksa oluşturup kaydet (dosya başına bir kez).
+
+    Anahtar kareleri okunamayan (ffprobe yok/hata) indeks kaydedilmez;
+    sonraki açılışta yeniden denenir.
+    """
+    path = _index_path(video_path, index_dir)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("keyframes") != []:
+                return index
+        except (OSError, ValueError):
+            pass
+
+    index = build_keyframe_index(video_path)
+    if index["keyframes"] == []:
+        return index
+    os.makedirs(index_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+    return index
+
+
+class FrameSeeker:
+    """Anahtar kare indeksi ve frame LRU önbelleği ile hızlı konumlandırma.
+
+    Hedefe en yakın önceki anahtar kareye atlanır, hedefe kadar sadece grab()
+    yapılır (renk dönüşümü/kopya yok) ve yalnızca hedef frame retrieve edilir.
+    Oynatma da `read_next()` ile yapılır; böylece geri adım sonrası devam
+    etmek önbellekten okunur. Çağıran, capture'a başka thread'den aynı anda
+    erişmemelidir (kilit).
+    """
+
+    def __init__(self, capture, index=None, cache_size=FRAME_CACHE_SIZE,
+                 cache_bytes=FRAME_CACHE_BYTES):
+        self.capture = capture
+        self.index = index
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cache = OrderedDict()
+        self._cached_bytes = 0
+        # Önbellekten (adet ya da bayt sınırıyla) çıkarılan son dizi; bir
+        # sonraki decode bu tampona yapılır
+        self._spare = None
+        # Oynatmanın bir sonraki frame'i (mantıksal konum)
+        self.next_frame = 0
+        # Capture'ın bir sonraki read() ile döndüreceği frame (fiziksel konum)
+        self._capture_pos = 0
+
+    def set_index(self, index):
+        self.index = index
+
+    def _remember(self, frame_index, frame):
+        old = self.cache.pop(frame_index, None)
+        if old is not None:
+            self._cached_bytes -= old.nbytes
+        self.cache[frame_index] = frame
+        self._cached_bytes += frame.nbytes
+        while self.cache and (len(self.cache) > self.cache_size
+                              or self._cached_bytes > self.cache_bytes):
+            _, evicted = self.cache.popitem(last=False)
+            self._cached_bytes -= evicted.nbytes
+            self._spare = evicted
+
+    def _take_oldest(self):
+        _, frame = self.cache.popitem(last=False)
+        self._cached_bytes -= frame.nbytes
+        return frame
+
+    def _keyframe_before(self, target):
+        if self.index is None:
+            return None
+        keyframes = self.index.get("keyframes")
+        if keyframes is None:
+            return target  # Her frame anahtar kare
+        pos = bisect.bisect_right(keyframes, target) - 1
+        return keyframes[pos] if pos >= 0 else None
+
+    def _decode(self, target):
+        keyframe = self._keyframe_before(target)
+        pos = self._capture_pos
+        if pos <= target and target - pos <= MAX_FORWARD_GRAB \
+                and (keyframe is None or keyframe <= pos):
+            # Hedef ileride ve yakın (ör. normal oynatma): mevcut konumdan ilerle
+            start = pos
+        elif keyframe is not None:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            start = keyframe
+        else:
+            # Anahtar kareler bilinmiyor: OpenCV'nin kendi seek'i
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, target)
+            start = target
+
+        for _ in range(target - start):
+            if not self.capture.grab():
+                break
+
+        # Önbellekten çıkarılmış dizi varsa o, yoksa önbellek doluysa en eski
+        # frame'in dizisi yeni frame için tekrar kullanılır
+        buf, self._spare = self._spare, None
+        if buf is None and len(self.cache) >= self.cache_size:
+            buf = self._take_oldest()
+        if buf is not None:
+            ret, frame = self.capture.read(image=buf)
+        else:
+            ret, frame = self.capture.read()
+        if not ret:
+            # Konum belirsiz; bir sonraki istekte yeniden konumlan
+            self._capture_pos = -1
+            return None
+        self._capture_pos = target + 1
+        self._remember(target, frame)
+        return frame
+
+    def seek(self, target):
+        """target frame'ini döndür (video sonu/hata ise None)"""
+        target = max(0, int(target))
+
+        frame = self.cache.get(target)
+        if frame is not None:
+            self.cache.move_to_end(target)
+        else:
+            frame = self._decode(target)
+            if frame is None:
+                return None
+        self.next_frame = target + 1
+        return frame
+
+    def read_next(self):
+        """Oynatma için sıradaki frame: (frame_index, frame)"""
+        frame_index = self.next_frame
+        return frame_index, self.seek(frame_index)
+
+    def clear(self):
+        self.cache.clear()
+        self._cached_bytes = 0
+        self._spare = None
+        self.next_frame = 0
+        self._capture_pos = 0
@@ -0,0 +1,264 @@
+import os
+import stat
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from .ffmpeg_capture import open_capture
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+DEFAULT_FPS = 25.0
+# Kare klasörlerinde önceden çözülecek dosya sayısı
+SEQUENCE_PREFETCH = 8
+
+
+def _into(frame, image):
+    """frame'i verilen tampona kopyala (boyut/tip uyuşmazsa frame'in kendisi)"""
+    if image is None or image.shape != frame.shape or image.dtype != frame.dtype:
+        return frame
+    np.copyto(image, frame)
+    return image
+
+
+class FrameSource:
+    """Analizin okuduğu frame kaynağı.
+
+    cv2.VideoCapture ile aynı alt kümeyi sunar (isOpened, read, grab,
+    retrieve, get, set, release); böylece PrefetchReader ve analiz döngüsü
+    kaynağın video dosyası, kare klasörü veya ham pipe olmasını bilmez.
+    Alt sınıflar en az `read` ve `get`'i gerçekler.
+    """
+
+    name = ""
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        raise NotImplementedError
+
+    def grab(self):
+        self._grabbed = self.read()[1]
+        return self._grabbed is not None
+
+    def retrieve(self, image=None):
+        frame = getattr(self, "_grabbed", None)
+        if frame is None:
+            return False, None
+        return True, _into(frame, image)
+
+    def get(self, prop):
+        return 0.0
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        pass
+
+
+class VideoFileSource(FrameSource):
+    """Video dosyası (ayarlara göre OpenCV veya FFmpeg ile okunur)"""
+
+    def __init__(self, path, backend="opencv", scale_width=None, threads=0):
+        self.name = os.path.basename(path)
+        self.path = path
+        self._capture = open_capture(path, backend=backend, scale_width=scale_width,
+                                     threads=threads)
+
+    def isOpened(self):
+        return self._capture.isOpened()
+
+    def read(self, image=None):
+        if image is not None:
+            return self._capture.read(image=image)
+        return self._capture.read()
+
+    def grab(self):
+        return self._capture.grab()
+
+    def retrieve(self, image=None):
+        if image is not None:
+            return self._capture.retrieve(image=image)
+        return self._capture.retrieve()
+
+    def get(self, prop):
+        return self._capture.get(prop)
+
+    def set(self, prop, value):
+        return self._capture.set(prop, value)
+
+    def release(self):
+        self._capture.release()
+
+
+class ImageSequenceSource(FrameSource):
+    """JPEG/PNG kare klasörü; dosyalar isim sırasıyla bir thread havuzunda önden çözülür.
+
+    cv2.imread GIL'i bıraktığı için çözme işi gerçekten paralel yürür.
+    """
+
+    def __init__(self, directory, fps=DEFAULT_FPS, workers=4, prefetch=SEQUENCE_PREFETCH):
+        self.name = os.path.basename(os.path.normpath(directory))
+        self.directory = directory
+        self.fps = fps or DEFAULT_FPS
+        self.files = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.prefetch = prefetch
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()  # (index, future)
+        self._position = 0
+        self._next_submit = 0
+
+        # Boyutlar ilk kareden
+        self.width = self.height = 0
+        if self.files:
+            first = cv2.imread(self.files[0])
+            if first is not None:
+                self.height, self.width = first.shape[:2]
+
+    def isOpened(self):
+        return bool(self.files) and self.width > 0
+
+    def _fill(self):
+        while len(self._pending) < self.prefetch and self._next_submit < len(self.files):
+            index = self._next_submit
+            self._pending.append((index, self._executor.submit(cv2.imread, self.files[index])))
+            self._next_submit += 1
+
+    def read(self, image=None):
+        """Sıradaki okunabilir kare; bozuk/okunamayan dosyalar atlanır"""
+        while True:
+            self._fill()
+            if not self._pending:
+                return False, None
+            index, future = self._pending.popleft()
+            frame = future.result()
+            self._position = index + 1
+            self._fill()
+            if frame is not None:
+                break
+            print(f"Kare okunamadı, atlanıyor: {self.files[index]}")
+
+        shape = (self.height, self.width, 3)
+        if frame.shape[:2] != shape[:2]:
+            if image is not None and image.shape == shape and image.dtype == np.uint8:
+                return True, cv2.resize(frame, (self.width, self.height), dst=image)
+            frame = cv2.resize(frame, (self.width, self.height))
+        return True, _into(frame, image)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.files))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return max(0, self._position - 1) * 1000.0 / self.fps
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            index = int(value)
+        elif prop == cv2.CAP_PROP_POS_MSEC:
+            index = int(round(value * self.fps / 1000.0))
+        else:
+            return False
+        index = min(max(0, index), len(self.files))
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._position = self._next_submit = index
+        return True
+
+    def release(self):
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False)
+
+
+class RawPipeSource(FrameSource):
+    """stdin veya adlandırılmış pipe'tan (FIFO) ham BGR24 frame'ler.
+
+    Her frame width*height*3 bayttır; ileri/geri konumlanma yoktur.
+    """
+
+    def __init__(self, path, width, height, fps=DEFAULT_FPS):
+        if not width or not height:
+            raise ValueError("Ham pipe için genişlik ve yükseklik gerekli")
+        self.name = "stdin" if path in ("-", "pipe:") else os.path.basename(path)
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = fps or DEFAULT_FPS
+        self._frame_bytes = self.width * self.height * 3
+        self._position = 0
+        if path in ("-", "pipe:"):
+            self._stream = sys.stdin.buffer
+            self._owns_stream = False
+        else:
+            self._stream = open(path, "rb", buffering=0)
+            self._owns_stream = True
+
+    def read(self, image=None):
+        shape = (self.height, self.width, 3)
+        if image is None or image.shape != shape or image.dtype != np.uint8:
+            image = np.empty(shape, np.uint8)
+        view = memoryview(image).cast("B")
+        filled = 0
+        while filled < self._frame_bytes:
+            count = self._stream.readinto(view[filled:])
+            if not count:
+                return False, None
+            filled += count
+        self._position += 1
+        return True, image
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return max(0, self._position - 1) * 1000.0 / self.fps
+        return 0.0
+
+    def release(self):
+        if self._owns_stream:
+            self._stream.close()
+
+
+def _is_fifo(path):
+    try:
+        return stat.S_ISFIFO(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def open_source(spec, width=None, height=None, fps=None, backend="opencv",
+                scale_width=None, threads=0):
+    """Tanımdan uygun kaynağı aç.
+
+    - klasör            → ImageSequenceSource
+    - '-' / 'pipe:' / FIFO → RawPipeSource (width/height gerekli)
+    - diğer             → VideoFileSource
+    """
+    if spec in ("-", "pipe:") or _is_fifo(spec):
+        return RawPipeSource(spec, width, height, fps)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, fps=fps or DEFAULT_FPS)
+    return VideoFileSource(spec, backend=backend, scale_width=scale_width, threads=threads)
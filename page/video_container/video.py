@@ -4,6 +4,9 @@ import cv2
 from PIL import Image, ImageTk
 import threading
 import time
+from .proxy import find_proxy
+from .seek import FrameSeeker, load_keyframe_index
+from .filmstrip import Filmstrip
 
 
 class VideoContainer:
@@ -18,6 +21,19 @@ class VideoContainer:
         self.video_thread = None
         self.is_playing = False
         self.current_frame = None
+
+        # Orijinal dosya ve (varsa) önizleme için kullanılan düşük çözünürlüklü proxy
+        self.source_path = None
+        self.proxy_path = None
+
+        # Konumlandırma: anahtar kare indeksi + son frame'lerin önbelleği.
+        # Capture'a oynatma thread'i ve UI aynı anda erişmesin diye kilit.
+        self.capture_lock = threading.Lock()
+        self.seeker = None
+        self.frame_count = 0
+        self.fps = 0.0
+        self._seek_job = None
+        self._slider_updating = False
         
         # UI oluştur
         self.setup_ui()
@@ -27,6 +43,10 @@ class VideoContainer:
         # Video container
         video_container = tk.Frame(self.parent_frame, bg=self.colors['bg_dark'])
         video_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Zaman şeridi (canvas'ın altında, karoya tıklayınca o konuma gider)
+        self.filmstrip = Filmstrip(video_container, self.colors, self.seek_to)
+        self.filmstrip.pack(side=tk.BOTTOM, fill=tk.X, pady=(8, 0))
         
         # Video frame (Canvas kullanarak)
         self.video_frame = tk.Canvas(
@@ -56,6 +76,43 @@ class VideoContainer:
         control_frame = tk.Frame(self.parent_frame, bg=self.colors['bg_medium'])
         control_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
         
+        # Konum çubuğu (seek)
+        seek_frame = tk.Frame(control_frame, bg=self.colors['bg_medium'])
+        seek_frame.pack(fill=tk.X, padx=15, pady=(15, 0))
+
+        for text, step in (('◀', -1), ('▶', 1)):
+            tk.Button(
+                seek_frame,
+                text=text,
+                font=('Segoe UI', 9),
+                bg=self.colors['bg_light'],
+                fg=self.colors['text'],
+                relief=tk.FLAT,
+                padx=6,
+                cursor='hand2',
+                command=lambda s=step: self.step_frame(s)
+            ).pack(side=tk.LEFT if step < 0 else tk.RIGHT)
+
+        self.time_label = tk.Label(
+            seek_frame,
+            text="00:00 / 00:00",
+            font=('Segoe UI', 9),
+            bg=self.colors['bg_medium'],
+            fg=self.colors['text']
+        )
+        self.time_label.pack(side=tk.RIGHT, padx=8)
+
+        self.seek_var = tk.DoubleVar(value=0)
+        self.seek_scale = ttk.Scale(
+            seek_frame,
+            from_=0,
+            to=1,
+            orient=tk.HORIZONTAL,
+            variable=self.seek_var,
+            command=self.on_seek
+        )
+        self.seek_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8)
+
         # Buton container
         btn_container = tk.Frame(control_frame, bg=self.colors['bg_medium'])
         btn_container.pack(pady=15, padx=15)
@@ -84,6 +141,21 @@ class VideoContainer:
             )
             btn.pack(side=tk.LEFT, padx=5)
             self.add_hover_effect(btn, self.colors['accent'], self.colors['accent_hover'])
+
+        # Proxy varsa önizleme proxy'den yapılır; tam çözünürlük için orijinale geç
+        self.full_res_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            btn_container,
+            text='Tam çözünürlük',
+            variable=self.full_res_var,
+            command=self.toggle_full_resolution,
+            font=('Segoe UI', 10),
+            bg=self.colors['bg_medium'],
+            fg=self.colors['text'],
+            selectcolor=self.colors['bg_dark'],
+            activebackground=self.colors['bg_medium'],
+            activeforeground=self.colors['text']
+        ).pack(side=tk.LEFT, padx=(15, 5))
         
         # Durum çubuğu
         self.status_bar = tk.Label(
@@ -122,26 +194,134 @@ class VideoContainer:
             return
 
         self.stop_video()
-        self.video_capture = cv2.VideoCapture(file_path)
+        if self.video_thread and self.video_thread.is_alive():
+            self.video_thread.join(timeout=1.0)
+        with self.capture_lock:
+            if self.video_capture:
+                self.video_capture.release()
+
+        self.source_path = file_path
+        self.proxy_path = find_proxy(file_path)
+        self._open_capture(self._playback_path())
 
         if self.video_capture.isOpened():
             # Placeholder'ı temizle
             if hasattr(self, "placeholder_text"):
                 self.video_frame.delete(self.placeholder_text)
             file_name = file_path.replace("\\", "/").split("/")[-1]
-            self.show_notification(f"Video yüklendi: {file_name}")
+            suffix = " (proxy)" if self._using_proxy() else ""
+            self.show_notification(f"Video yüklendi: {file_name}{suffix}")
             self.display_first_frame()
+            # Proxy varsa şerit ondan (daha hızlı) üretilir; frame indeksleri aynıdır
+            self.filmstrip.set_video(self._playback_path(), self.frame_count)
         else:
             messagebox.showerror("Hata", "Video dosyası açılamadı!")
                 
+    def _open_capture(self, path):
+        """Capture'ı aç, konumlandırıcıyı kur ve anahtar kare indeksini arka planda yükle"""
+        with self.capture_lock:
+            self.video_capture = cv2.VideoCapture(path)
+            self.seeker = FrameSeeker(self.video_capture)
+            self.frame_count = int(self.video_capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+            self.fps = self.video_capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.seek_scale.configure(to=max(1, self.frame_count - 1))
+
+        seeker = self.seeker
+
+        def load_index():
+            try:
+                index = load_keyframe_index(path)
+            except Exception as e:
+                print(f"Anahtar kare indeksi oluşturulamadı: {e}")
+                return
+            # Bu arada başka video açılmış olabilir
+            if self.seeker is seeker:
+                seeker.set_index(index)
+
+        threading.Thread(target=load_index, daemon=True).start()
+
+    def _format_time(self, frame_index):
+        seconds = int(frame_index / self.fps) if self.fps else 0
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes:02d}:{seconds:02d}"
+
+    def _update_position(self, frame_index):
+        """Konum çubuğunu ve zaman etiketini güncelle (UI thread'i)"""
+        self._slider_updating = True
+        self.seek_var.set(frame_index)
+        self._slider_updating = False
+        self.time_label.configure(
+            text=f"{self._format_time(frame_index)} / {self._format_time(self.frame_count)}"
+        )
+        self.filmstrip.set_position(frame_index)
+
+    def on_seek(self, value):
+        """Kullanıcı konum çubuğunu sürükledi; son değere göre (gecikmeli) konumlan"""
+        if self._slider_updating or not self.seeker:
+            return
+        if self._seek_job is not None:
+            self.video_frame.after_cancel(self._seek_job)
+        self._seek_job = self.video_frame.after(40, lambda: self.seek_to(float(value)))
+
+    def seek_to(self, frame_index):
+        """Verilen frame'e git ve göster (oynatma varsa oradan devam eder)"""
+        self._seek_job = None
+        if not self.seeker:
+            return
+        frame_index = int(min(max(0, frame_index), max(0, self.frame_count - 1)))
+        with self.capture_lock:
+            frame = self.seeker.seek(frame_index)
+        if frame is not None:
+            self.current_frame = frame
+            self.update_video_frame(frame)
+            self._update_position(frame_index)
+
+    def step_frame(self, step):
+        """Duraklatılmışken bir frame ileri/geri (önbellekten hızlı)"""
+        if not self.seeker:
+            return
+        if self.is_playing:
+            self.pause_video()
+        self.seek_to(self.seeker.next_frame - 1 + step)
+
+    def _using_proxy(self):
+        return self.proxy_path is not None and not self.full_res_var.get()
+
+    def _playback_path(self):
+        """Oynatılacak dosya: proxy (varsa) veya orijinal"""
+        return self.proxy_path if self._using_proxy() else self.source_path
+
+    def toggle_full_resolution(self):
+        """Proxy ile orijinal arasında geç; oynatma konumu korunur"""
+        if not self.source_path or not self.video_capture or self.proxy_path is None:
+            return
+
+        was_playing = self.is_playing
+        self.is_playing = False
+        if self.video_thread and self.video_thread.is_alive():
+            self.video_thread.join(timeout=1.0)
+
+        # Proxy ve orijinal aynı frame hızına sahip; konum zamana göre taşınır
+        position_s = max(0, self.seeker.next_frame - 1) / self.fps if self.fps else 0
+        with self.capture_lock:
+            self.video_capture.release()
+        self._open_capture(self._playback_path())
+        if not self.video_capture.isOpened():
+            messagebox.showerror("Hata", "Video dosyası açılamadı!")
+            return
+        self.seek_to(position_s * self.fps)
+
+        self.show_notification('Tam çözünürlük' if not self._using_proxy() else 'Proxy önizleme')
+        if was_playing:
+            self.play_video()
+
     def display_first_frame(self):
         """İlk kareyi göster"""
         if self.video_capture and self.video_capture.isOpened():
-            ret, frame = self.video_capture.read()
-            if ret:
-                self.current_frame = frame
-                self.update_video_frame(frame)
-                self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.seek_to(0)
                 
     def play_video(self):
         """Video oynatmayı başlat"""
@@ -154,14 +334,17 @@ class VideoContainer:
     def video_loop(self):
         """Video oynatma döngüsü"""
         while self.is_playing and self.video_capture.isOpened():
-            ret, frame = self.video_capture.read()
-            if ret:
+            with self.capture_lock:
+                frame_index, frame = self.seeker.read_next()
+            if frame is not None:
                 self.current_frame = frame
                 self.update_video_frame(frame)
+                self.video_frame.after(0, self._update_position, frame_index)
                 time.sleep(0.033)  # ~30 FPS
             else:
                 self.is_playing = False
-                self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                # Sonraki oynatma baştan başlasın
+                self.seeker.next_frame = 0
                 break
                 
     def update_video_frame(self, frame):
@@ -256,16 +439,20 @@ class VideoContainer:
         """Video oynatmayı durdur"""
         self.is_playing = False
         if self.video_capture:
-            self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
             self.display_first_frame()
         self.show_notification('Video durduruldu')
         
     def reset_video(self):
         """Video'yu sıfırla"""
         self.is_playing = False
-        if self.video_capture:
-            self.video_capture.release()
-            self.video_capture = None
+        with self.capture_lock:
+            if self.video_capture:
+                self.video_capture.release()
+                self.video_capture = None
+            self.seeker = None
+        self.frame_count = 0
+        self._update_position(0)
+        self.filmstrip.clear()
         
         self.video_frame.delete("all")
         self.placeholder_text = self.video_frame.create_text(